@@ -1,68 +1,128 @@
+import time
+_import_started = time.perf_counter()
+
 import os
+import re
+import sys
+import copy
 import uuid
 import threading
-import json
 from datetime import datetime
-from flask import Flask, request, render_template, redirect, send_file, flash, url_for, session, jsonify
+from flask import Flask, Response, request, render_template, redirect, send_file, send_from_directory, flash, url_for, session, jsonify
 from werkzeug.utils import secure_filename
-import speech_recognition as sr
-from deep_translator import GoogleTranslator
-import requests
-import subprocess
+from jobs import JobManager
+from tts_streaming import StreamTee, prime_stream, finalize_wav_header
+from tts_cache import TTSCache, make_cache_key, is_cache_filename
+from openai_tts_client import OpenAITTSClient
+from provider_router import ProviderRouter, CircuitOpenError, ProviderRequestError
+from voice_catalog import VoiceCatalog
+from tts_segments import LONG_TEXT_CHARS, split_text, synthesize_segments, stitch_audio
+from tts_batch import TTS_BATCH_MAX_ITEMS, TTS_BATCH_SYNC_LIMIT, TTS_BATCH_CHUNK_SIZE, run_batch, write_zip
+from storage import Storage
+from maintenance import MaintenanceSweeper
+from upload_stream import UploadRejected, check_upload_headers, stream_upload
+from translation import TranslationService, create_translator, TRANSLATION_PROVIDER
+from lazy_imports import prewarm, record_import, record_startup, import_report
 try:
     from flask_wtf.csrf import CSRFProtect
     csrf = CSRFProtect()
 except ImportError:
     csrf = None
-try:
-    from elevenlabs import generate, voices, set_api_key
-except ImportError:
-    try:
-        from elevenlabs.client import ElevenLabs
-        from elevenlabs import Voice, VoiceSettings
-        ELEVENLABS_CLIENT = None
-    except ImportError:
-        print("ElevenLabs library not properly installed")
-        ELEVENLABS_CLIENT = None
 
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'm4a', 'flac', 'ogg'}
+VOICE_SAMPLE_PREFIX = 'voice_sample_'
+VOICE_MODELS_FOLDER = 'voice_models'
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 app = Flask(__name__)
-app.secret_key = 'your_secret_key'
+# Every worker must share the key so sessions survive being routed to another process
+app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your_secret_key')
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Hand file delivery to a front-end server that understands X-Sendfile (Apache, lighttpd)
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', '0').lower() in ('1', 'true', 'yes')
+
+# Cache lifetime of content-addressed audio, which never changes under its name
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Content-addressed cache of generated speech, served from the uploads folder
+tts_cache = TTSCache(UPLOAD_FOLDER)
+
 # Initialize CSRF protection if available
 if csrf:
     csrf.init_app(app)
 
 # TTS configuration
-TTS_API_URL = 'http://10.10.1.11:5050/v1/audio/speech'
-TTS_API_KEY = 'your_api_key_here'
+TTS_API_URL = os.getenv('TTS_API_URL', 'http://10.10.1.11:5050/v1/audio/speech')
+TTS_API_KEY = os.getenv('TTS_API_KEY', 'your_api_key_here')
+
+# Pooled keep-alive client for the OpenAI-compatible TTS server
+openai_tts = OpenAITTSClient(TTS_API_URL, TTS_API_KEY)
+
+# Per-provider circuit breakers; failing providers are skipped until a probe
+# or trial request succeeds
+provider_router = ProviderRouter()
+provider_router.register('openai', probe=openai_tts.probe)
+provider_router.register('gtts')
+provider_router.register('local')
 ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY', 'your_elevenlabs_api_key_here')
 
-# Set ElevenLabs API key if available
-try:
-    if ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
-        set_api_key(ELEVENLABS_API_KEY)
-except NameError:
-    # Handle newer ElevenLabs client
-    if ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
-        ELEVENLABS_CLIENT = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-    else:
-        ELEVENLABS_CLIENT = None
+# The ElevenLabs SDK is imported on first use by load_elevenlabs()
+ELEVENLABS_CLIENT = None
+_elevenlabs_loaded = False
+_elevenlabs_lock = threading.Lock()
 
-# User data storage
+def load_elevenlabs():
+    """Import the ElevenLabs SDK once and set the API key
+
+    Defines the legacy module-level functions (generate, voices) when the
+    old SDK is installed, or ELEVENLABS_CLIENT with the newer client.
+    """
+    global generate, voices, set_api_key, Voice, VoiceSettings, ELEVENLABS_CLIENT, _elevenlabs_loaded
+    if _elevenlabs_loaded:
+        return
+    with _elevenlabs_lock:
+        if _elevenlabs_loaded:
+            return
+        
+        started = time.perf_counter()
+        client_class = None
+        try:
+            from elevenlabs import generate, voices, set_api_key
+        except ImportError:
+            try:
+                from elevenlabs.client import ElevenLabs as client_class
+                from elevenlabs import Voice, VoiceSettings
+            except ImportError:
+                print("ElevenLabs library not properly installed")
+        record_import('elevenlabs', time.perf_counter() - started)
+        
+        # Set ElevenLabs API key if available
+        if ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
+            try:
+                set_api_key(ELEVENLABS_API_KEY)
+            except NameError:
+                # Handle newer ElevenLabs client
+                if client_class is not None:
+                    ELEVENLABS_CLIENT = client_class(api_key=ELEVENLABS_API_KEY)
+        _elevenlabs_loaded = True
+
+# User data storage (the JSON files are migrated into the database on first use)
 USER_DATA_FILE = 'user_data.json'
 HISTORY_FILE = 'user_history.json'
+storage = Storage(user_data_file=USER_DATA_FILE, history_file=HISTORY_FILE)
+
+# Job states are written to the database so any worker can report on them
+job_manager = JobManager(store=storage)
+
+# Translations are cached in the same database, keyed on (text hash, source, target)
+translation_service = TranslationService(create_translator(TRANSLATION_PROVIDER), storage)
 
-# Latest outputs
-latest_transcription = None
-latest_translation = None
-latest_audio_filename = None
-latest_speech_filename = None
+# Results are stored per browser session in the database, so any worker can serve them
+SPEECH_RESULT = 'speech'
+TRANSCRIPTION_RESULT = 'transcription'
 
 # User preferences structure
 DEFAULT_USER_PREFS = {
@@ -70,6 +130,7 @@ DEFAULT_USER_PREFS = {
     'preferred_voice': 'alloy',
     'preferred_model': 'tts-1-hd',
     'preferred_language': 'en',
+    'asr_engine': 'google',  # 'google', 'whisper'
     'theme': 'dark',
     'voice_speed': 1.0,
     'voice_stability': 0.5,
@@ -86,50 +147,43 @@ DEFAULT_USER_PREFS = {
     'voice_data_retention_days': 30
 }
 
+# Voice id prefixes of clones served by local_tts_models
+LOCAL_VOICE_PREFIXES = ('tortoise_', 'coqui_', 'xtts_', 'local_')
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def load_user_data():
-    """Load user preferences from JSON file"""
+    """Load user preferences from the database"""
     try:
-        if os.path.exists(USER_DATA_FILE):
-            with open(USER_DATA_FILE, 'r') as f:
-                return json.load(f)
-        return DEFAULT_USER_PREFS.copy()
+        user_data = storage.load_user_data()
+        return user_data if user_data is not None else copy.deepcopy(DEFAULT_USER_PREFS)
     except Exception as e:
         print(f"Error loading user data: {e}")
-        return DEFAULT_USER_PREFS.copy()
+        return copy.deepcopy(DEFAULT_USER_PREFS)
 
-def save_user_data(user_data):
-    """Save user preferences to JSON file"""
+def update_user_data(mutator):
+    """Apply a change to user preferences atomically and return the result"""
     try:
-        with open(USER_DATA_FILE, 'w') as f:
-            json.dump(user_data, f, indent=2)
+        return storage.update_user_data(copy.deepcopy(DEFAULT_USER_PREFS), mutator)
     except Exception as e:
-        print(f"Error saving user data: {e}")
+        print(f"Error updating user data: {e}")
+        return load_user_data()
+
+def add_custom_voice(voice_info):
+    """Register a newly created voice clone in the user's custom voices"""
+    update_user_data(lambda user_data: user_data.setdefault('custom_voices', []).append(voice_info))
 
-def load_history():
-    """Load user history from JSON file"""
+def load_history(limit=None, offset=0):
+    """Load user history from the database, newest first"""
     try:
-        if os.path.exists(HISTORY_FILE):
-            with open(HISTORY_FILE, 'r') as f:
-                return json.load(f)
-        return []
+        return storage.load_history(limit=limit, offset=offset)
     except Exception as e:
         print(f"Error loading history: {e}")
         return []
 
-def save_history(history):
-    """Save user history to JSON file"""
-    try:
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(history, f, indent=2)
-    except Exception as e:
-        print(f"Error saving history: {e}")
-
 def add_to_history(action_type, content, metadata=None):
     """Add an entry to user history"""
-    history = load_history()
     entry = {
         'id': str(uuid.uuid4()),
         'timestamp': datetime.now().isoformat(),
@@ -137,83 +191,109 @@ def add_to_history(action_type, content, metadata=None):
         'content': content,
         'metadata': metadata or {}
     }
-    history.insert(0, entry)  # Add to beginning
-    # Keep only last 100 entries
-    history = history[:100]
-    save_history(history)
-
-def get_elevenlabs_voices():
-    """Get available ElevenLabs voices"""
     try:
-        if ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
-            try:
-                # Try old API first
-                voice_list = voices()
-                return [(voice.voice_id, voice.name) for voice in voice_list]
-            except NameError:
-                # Try new API
-                if ELEVENLABS_CLIENT:
-                    voice_list = ELEVENLABS_CLIENT.voices.get_all()
-                    return [(voice.voice_id, voice.name) for voice in voice_list.voices]
-        return []
+        storage.append_history(entry)
     except Exception as e:
-        print(f"Error getting ElevenLabs voices: {e}")
+        print(f"Error saving history: {e}")
+
+def fetch_elevenlabs_voices():
+    """List ElevenLabs voices from the API; raises on failure"""
+    load_elevenlabs()
+    try:
+        # Try old API first
+        voice_list = voices()
+        return [(voice.voice_id, voice.name) for voice in voice_list]
+    except NameError:
+        # Try new API
+        if not ELEVENLABS_CLIENT:
+            raise Exception("ElevenLabs client not initialized")
+        voice_list = ELEVENLABS_CLIENT.voices.get_all()
+        return [(voice.voice_id, voice.name) for voice in voice_list.voices]
+
+# A voice listing doubles as the recovery probe for the ElevenLabs circuit
+provider_router.register('elevenlabs', probe=fetch_elevenlabs_voices)
+
+# Pages are rendered from this cached catalog and never wait on the API
+elevenlabs_voice_catalog = VoiceCatalog(
+    lambda: provider_router.call('elevenlabs', fetch_elevenlabs_voices), name='elevenlabs'
+)
+
+def warm_voice_catalog(wait=False):
+    """Fill the ElevenLabs voice catalog ahead of the first page view"""
+    if ELEVENLABS_API_KEY == 'your_elevenlabs_api_key_here':
+        return
+    if wait:
+        elevenlabs_voice_catalog.refresh()
+    else:
+        elevenlabs_voice_catalog.refresh_async()
+
+def get_elevenlabs_voices():
+    """Get available ElevenLabs voices from the cached catalog"""
+    if ELEVENLABS_API_KEY == 'your_elevenlabs_api_key_here':
         return []
+    return elevenlabs_voice_catalog.get()
 
-def validate_voice_sample(filepath):
-    """Validate voice sample for cloning"""
+def validate_voice_samples(filepaths):
+    """Validate voice samples for cloning
+
+    Format and sample rate are checked per file; the 10 second minimum
+    applies to the samples together, so several short clips are accepted.
+    """
+    from audio_ingest import probe_audio
+    
     try:
-        # Check file size (minimum 10 seconds, maximum 5 minutes)
-        file_size = os.path.getsize(filepath)
-        if file_size < 100000:  # ~10 seconds of audio
-            return False, "Audio sample too short. Minimum 10 seconds required."
-        if file_size > 50000000:  # ~5 minutes of audio
-            return False, "Audio sample too long. Maximum 5 minutes allowed."
-        
-        # Check audio quality using ffmpeg
-        try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-print_format', 'json', 
-                '-show_format', '-show_streams', filepath
-            ], capture_output=True, text=True, check=True)
-            
-            import json
-            audio_info = json.loads(result.stdout)
+        total_size = 0
+        total_duration = 0.0
+        for filepath in filepaths:
+            # Check file size (maximum 5 minutes)
+            file_size = os.path.getsize(filepath)
+            if file_size > 50000000:  # ~5 minutes of audio
+                return False, "Audio sample too long. Maximum 5 minutes allowed."
+            total_size += file_size
             
-            # Check if it's audio
-            audio_streams = [s for s in audio_info.get('streams', []) if s.get('codec_type') == 'audio']
-            if not audio_streams:
-                return False, "No audio stream found in file."
+            # Check audio quality from the file header; nothing is decoded
+            try:
+                audio_info = probe_audio(filepath)
+            except ValueError as e:
+                return False, str(e)
             
             # Check sample rate (minimum 16kHz recommended)
-            sample_rate = int(audio_streams[0].get('sample_rate', 0))
-            if sample_rate < 16000:
+            if audio_info['sample_rate'] < 16000:
                 return False, "Audio quality too low. Minimum 16kHz sample rate required."
             
-            return True, "Voice sample validated successfully."
-            
-        except (subprocess.CalledProcessError, json.JSONDecodeError):
-            return False, "Unable to validate audio format."
+            duration = audio_info['duration']
+            if duration is not None and duration > 300.0:
+                return False, "Audio sample too long. Maximum 5 minutes allowed."
+            if total_duration is not None:
+                total_duration = total_duration + duration if duration is not None else None
+        
+        # Without a duration in every header, fall back to the size (~10 seconds of audio)
+        too_short = total_size < 100000 if total_duration is None else total_duration < 10.0
+        if too_short:
+            return False, "Audio samples too short. Minimum 10 seconds in total required."
+        
+        return True, "Voice samples validated successfully."
             
     except Exception as e:
         return False, f"Validation error: {str(e)}"
 
 def create_voice_clone_local(name, description, audio_file_path, user_id=None):
-    """Create a voice clone using local TTS models (Tortoise-TTS or Coqui)"""
+    """Create a voice clone using local TTS models (Tortoise-TTS or Coqui)
+
+    Several sample files, or one long recording cut at silences, give the
+    model multiple reference clips.
+    """
     try:
-        from local_tts_models import local_voice_cloner
+        from local_tts_models import local_voice_cloner, create_voice_clone_in_worker
         
         # Check user quota
         user_data = load_user_data()
         if len(user_data.get('custom_voices', [])) >= user_data.get('voice_cloning_quota', 5):
             return None, "Voice cloning quota exceeded. Please remove existing voices or upgrade your plan."
         
-        # Use the local voice cloner
-        voice_id, message = local_voice_cloner.create_voice_clone(
-            name=name,
-            description=description,
-            audio_path=audio_file_path,
-            preferred_backend='auto'
+        # Preprocessing and the torch backends run on the process pool, off the server's threads
+        voice_id, message = job_manager.run_in_process(
+            create_voice_clone_in_worker, name, description, audio_file_path, 'auto'
         )
         
         if voice_id:
@@ -225,8 +305,7 @@ def create_voice_clone_local(name, description, audio_file_path, user_id=None):
                 voice_info['provider'] = 'local'
                 
                 # Add to user's custom voices
-                user_data['custom_voices'].append(voice_info)
-                save_user_data(user_data)
+                add_custom_voice(voice_info)
                 
                 # Add to history
                 add_to_history('voice_clone', f"Created local voice clone: {name}", {
@@ -245,8 +324,13 @@ def create_voice_clone_local(name, description, audio_file_path, user_id=None):
         return None, f"Local voice cloning error: {str(e)}"
 
 def create_voice_clone(name, description, audio_file_path, user_id=None, provider='auto'):
-    """Create a voice clone using specified provider or auto-select"""
+    """Create a voice clone using specified provider or auto-select
+
+    audio_file_path is a single recording or a list of sample files.
+    """
     try:
+        audio_paths = audio_file_path if isinstance(audio_file_path, list) else [audio_file_path]
+        
         user_data = load_user_data()
         preferred_provider = user_data.get('voice_cloning_provider', 'auto')
         
@@ -254,26 +338,42 @@ def create_voice_clone(name, description, audio_file_path, user_id=None, provide
             provider = preferred_provider
         
         # Try ElevenLabs first if API key is available and provider allows
-        if provider in ['auto', 'elevenlabs'] and ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
+        use_elevenlabs = provider in ['auto', 'elevenlabs'] and ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here'
+        
+        if use_elevenlabs:
+            # Validate the audio samples
+            is_valid, message = validate_voice_samples(audio_paths)
+            if not is_valid:
+                return None, message
+            
+            # Check user quota
+            if len(user_data.get('custom_voices', [])) >= user_data.get('voice_cloning_quota', 5):
+                return None, "Voice cloning quota exceeded. Please remove existing voices or upgrade your plan."
+            
+            # Asked only now, so a request that never reaches the API can't hold the half-open trial
+            if not provider_router.allow('elevenlabs'):
+                # Circuit open: fail fast instead of waiting on the API to time out
+                if provider == 'elevenlabs':
+                    return None, "ElevenLabs is currently unavailable. Please try again later."
+                print("ElevenLabs circuit open, using local voice cloning")
+                use_elevenlabs = False
+        
+        if use_elevenlabs:
             try:
-                # Validate the audio sample
-                is_valid, message = validate_voice_sample(audio_file_path)
-                if not is_valid:
-                    return None, message
-                
-                # Check user quota
-                if len(user_data.get('custom_voices', [])) >= user_data.get('voice_cloning_quota', 5):
-                    return None, "Voice cloning quota exceeded. Please remove existing voices or upgrade your plan."
-                
                 # Create voice clone using ElevenLabs
+                load_elevenlabs()
                 if ELEVENLABS_CLIENT:
                     # Use new API
-                    with open(audio_file_path, 'rb') as audio_file:
+                    audio_files = [open(path, 'rb') for path in audio_paths]
+                    try:
                         voice = ELEVENLABS_CLIENT.clone(
                             name=name,
                             description=description,
-                            files=[audio_file]
+                            files=audio_files
                         )
+                    finally:
+                        for audio_file in audio_files:
+                            audio_file.close()
                     voice_id = voice.voice_id
                 else:
                     # Use old API (if available)
@@ -281,9 +381,11 @@ def create_voice_clone(name, description, audio_file_path, user_id=None, provide
                     voice = clone(
                         name=name,
                         description=description,
-                        files=[audio_file_path]
+                        files=audio_paths
                     )
                     voice_id = voice.voice_id
+                provider_router.record_success('elevenlabs')
+                elevenlabs_voice_catalog.invalidate()
                 
                 # Store voice information
                 voice_info = {
@@ -291,14 +393,14 @@ def create_voice_clone(name, description, audio_file_path, user_id=None, provide
                     'name': name,
                     'description': description,
                     'created_at': datetime.now().isoformat(),
-                    'file_path': audio_file_path,
+                    'file_path': audio_paths[0],
+                    'file_paths': audio_paths,
                     'user_id': user_id or 'default',
                     'provider': 'elevenlabs'
                 }
                 
                 # Add to user's custom voices
-                user_data['custom_voices'].append(voice_info)
-                save_user_data(user_data)
+                add_custom_voice(voice_info)
                 
                 # Add to history
                 add_to_history('voice_clone', f"Created voice clone: {name}", {
@@ -311,6 +413,7 @@ def create_voice_clone(name, description, audio_file_path, user_id=None, provide
                 return voice_id, "Voice clone created successfully using ElevenLabs."
                 
             except Exception as e:
+                provider_router.record_failure('elevenlabs', e)
                 if provider == 'elevenlabs':
                     return None, f"ElevenLabs API error: {str(e)}"
                 # If auto mode, fall back to local
@@ -328,30 +431,32 @@ def create_voice_clone(name, description, audio_file_path, user_id=None, provide
 def delete_voice_clone(voice_id):
     """Delete a voice clone"""
     try:
-        user_data = load_user_data()
-        
         # Find and remove voice from user data
-        custom_voices = user_data.get('custom_voices', [])
-        voice_to_remove = None
-        
-        for i, voice in enumerate(custom_voices):
-            if voice['id'] == voice_id:
-                voice_to_remove = custom_voices.pop(i)
-                break
+        removed = []
+        def remove_voice(user_data):
+            custom_voices = user_data.get('custom_voices', [])
+            for i, voice in enumerate(custom_voices):
+                if voice['id'] == voice_id:
+                    removed.append(custom_voices.pop(i))
+                    break
+        update_user_data(remove_voice)
         
-        if not voice_to_remove:
+        if not removed:
             return False, "Voice not found."
+        voice_to_remove = removed[0]
         
         provider = voice_to_remove.get('provider', 'elevenlabs')
         
         # Delete from appropriate provider
         if provider == 'elevenlabs':
             try:
+                load_elevenlabs()
                 if ELEVENLABS_CLIENT:
                     ELEVENLABS_CLIENT.delete(voice_id)
                 else:
                     from elevenlabs import delete
                     delete(voice_id)
+                elevenlabs_voice_catalog.invalidate()
             except Exception as e:
                 print(f"Warning: Could not delete voice from ElevenLabs: {e}")
         
@@ -366,15 +471,9 @@ def delete_voice_clone(voice_id):
             except Exception as e:
                 print(f"Warning: Could not delete local voice clone: {e}")
         
-        # Clean up local file
-        try:
-            if 'file_path' in voice_to_remove and os.path.exists(voice_to_remove['file_path']):
-                os.remove(voice_to_remove['file_path'])
-        except Exception as e:
-            print(f"Warning: Could not delete local file: {e}")
-        
-        # Save updated user data
-        save_user_data(user_data)
+        # Clean up local files
+        remove_files(voice_to_remove.get('file_paths') or
+                     ([voice_to_remove['file_path']] if 'file_path' in voice_to_remove else []))
         
         # Add to history
         add_to_history('voice_delete', f"Deleted voice clone: {voice_to_remove['name']}", {
@@ -393,148 +492,636 @@ def get_user_custom_voices():
     user_data = load_user_data()
     return user_data.get('custom_voices', [])
 
-def text_to_speech_enhanced(text, voice, model, provider='openai', voice_settings=None):
-    """Enhanced TTS function with multiple provider support"""
+def local_voice_ids():
+    """Ids of the registered local voice clones; raises if the database can't be read"""
+    user_data = storage.load_user_data() or DEFAULT_USER_PREFS
+    return {voice['id'] for voice in user_data.get('custom_voices', []) if voice.get('provider') == 'local'}
+
+def voice_sample_retention_days():
+    """Days voice samples are kept; raises if the database can't be read"""
+    user_data = storage.load_user_data() or DEFAULT_USER_PREFS
+    return user_data.get('voice_data_retention_days', 30)
+
+def forget_local_voices(voice_ids):
+    """Drop registered local voices whose model directory no longer exists"""
+    def forget(user_data):
+        user_data['custom_voices'] = [voice for voice in user_data.get('custom_voices', [])
+                                      if voice.get('provider') != 'local' or voice['id'] not in voice_ids]
+    update_user_data(forget)
+
+def expire_stored_records(days):
+    """Drop stored results, job states and cached translations past the upload retention"""
+    return storage.prune_results(days) + storage.prune_jobs(days) + storage.prune_translations(days)
+
+# Retention, disk quota and orphan cleanup for uploads and voice models
+maintenance_sweeper = MaintenanceSweeper(
+    UPLOAD_FOLDER, VOICE_MODELS_FOLDER, cache=tts_cache,
+    known_voices=local_voice_ids,
+    forget_voices=forget_local_voices,
+    sample_retention_days=voice_sample_retention_days,
+    expire_records=expire_stored_records,
+    sample_prefix=VOICE_SAMPLE_PREFIX
+)
+
+@app.before_request
+def start_maintenance():
+    # Started from a request rather than at import so it runs in each worker, not a pre-fork master
+    maintenance_sweeper.ensure_started()
+
+def is_local_voice(voice):
+    """Check whether a voice id refers to a local voice clone"""
+    return bool(voice) and voice.startswith(LOCAL_VOICE_PREFIXES)
+
+def tts_cache_key(text, voice, model, provider, voice_settings=None, skip_local=False):
+    """Cache key covering every input that changes the generated audio
+
+    The provider that serves the request is part of the key, so audio made
+    with the local clone skipped never answers a request for the clone.
+    """
+    voice_settings = voice_settings or {}
+    return make_cache_key(
+        text=text,
+        voice=voice,
+        model=model,
+        provider=provider,
+        source=primary_tts_source(voice, provider, skip_local),
+        speed=voice_settings.get('speed', 1.0),
+        stability=voice_settings.get('stability', 0.5),
+        similarity_boost=voice_settings.get('similarity_boost', 0.75)
+    )
+
+def primary_tts_source(voice, provider, skip_local=False):
+    """The provider text_to_speech_enhanced tries first for a request"""
+    return tts_provider_chain(voice, provider, skip_local)[0]
+
+def text_to_speech_enhanced(text, voice, model, provider='openai', voice_settings=None, skip_local=False):
+    """Enhanced TTS function with multiple provider support and output caching"""
+    if len(text) > LONG_TEXT_CHARS:
+        segments = split_text(text)
+        if len(segments) > 1:
+            filename = _text_to_speech_segmented(segments, text, voice, model, provider, voice_settings, skip_local)
+            if filename:
+                return filename
+            print("Segmented TTS failed, synthesizing the full text in one call")
+    
+    return _text_to_speech_cached(text, voice, model, provider, voice_settings, skip_local)[0]
+
+def _text_to_speech_cached(text, voice, model, provider, voice_settings, skip_local):
+    """Synthesize through the output cache; returns (filename, source provider)"""
+    primary = primary_tts_source(voice, provider, skip_local)
+    cache_key = tts_cache_key(text, voice, model, provider, voice_settings, skip_local)
+    cached = tts_cache.get(cache_key)
+    if cached:
+        return cached, primary
+    
+    filename, source = _text_to_speech_uncached(text, voice, model, provider, voice_settings, skip_local)
+    
+    # Only cache output from the intended provider, never a degraded fallback
+    if filename and source == primary:
+        try:
+            return tts_cache.put(cache_key, filename), source
+        except OSError as e:
+            print(f"Could not cache TTS output: {e}")
+    return filename, source
+
+def _text_to_speech_segmented(segments, text, voice, model, provider, voice_settings, skip_local):
+    """Synthesize sentence segments concurrently and stitch them into one file
+
+    Returns None unless every segment came from the primary provider.
+    """
+    primary = primary_tts_source(voice, provider, skip_local)
+    cache_key = tts_cache_key(text, voice, model, provider, voice_settings, skip_local)
+    cached = tts_cache.get(cache_key)
+    if cached:
+        return cached
+    
+    results = synthesize_segments(
+        segments,
+        lambda segment: _text_to_speech_cached(segment, voice, model, provider, voice_settings, skip_local),
+        primary
+    )
+    if any(filename is None or source != primary for filename, source in results):
+        # Stitching in a fallback segment would change the voice mid-clip;
+        # discard the uncached fallback files and let the caller synthesize
+        # the whole text in one call instead
+        for name, source in results:
+            if name and source != primary:
+                try:
+                    os.remove(os.path.join(app.config['UPLOAD_FOLDER'], name))
+                except OSError:
+                    pass
+        return None
+    
     filename = str(uuid.uuid4().hex) + ".mp3"
     filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    try:
+        stitch_audio([os.path.join(app.config['UPLOAD_FOLDER'], name) for name, _ in results], filepath)
+    except Exception as e:
+        print(f"Error stitching TTS segments: {str(e)}")
+        return None
     
     try:
-        # Check if voice is a local voice clone
-        if voice.startswith(('tortoise_', 'coqui_', 'xtts_', 'local_')):
-            try:
-                from local_tts_models import local_voice_cloner
-                success, message = local_voice_cloner.synthesize_speech(text, voice, filepath)
-                if success:
-                    return filename
-                else:
-                    print(f"Local TTS failed: {message}")
-                    # Fall through to other providers
-            except ImportError:
-                print("Local TTS models not available")
-            except Exception as e:
-                print(f"Local TTS error: {str(e)}")
+        return tts_cache.put(cache_key, filename)
+    except OSError as e:
+        print(f"Could not cache TTS output: {e}")
+    return filename
+
+def _tts_local(text, voice, filepath):
+    from local_tts_models import local_voice_cloner
+    # An unknown voice raises LocalVoiceError, which the breaker doesn't count
+    local_voice_cloner.require_voice(voice)
+    success, message = local_voice_cloner.synthesize_speech(text, voice, filepath)
+    if not success:
+        raise Exception(f"Local TTS failed: {message}")
+
+def _tts_elevenlabs(text, voice, voice_settings, filepath):
+    # Use ElevenLabs for high-quality TTS
+    voice_settings = voice_settings or {}
+    stability = voice_settings.get('stability', 0.5)
+    similarity_boost = voice_settings.get('similarity_boost', 0.75)
+    
+    load_elevenlabs()
+    try:
+        # Try old API first
+        audio = generate(
+            text=text,
+            voice=voice,
+            model="eleven_multilingual_v2",
+            stream=False,
+            api_key=ELEVENLABS_API_KEY
+        )
         
-        if provider == 'elevenlabs' and ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
-            # Use ElevenLabs for high-quality TTS
-            voice_settings = voice_settings or {}
-            stability = voice_settings.get('stability', 0.5)
-            similarity_boost = voice_settings.get('similarity_boost', 0.75)
-            
-            try:
-                # Try old API first
-                audio = generate(
-                    text=text,
-                    voice=voice,
-                    model="eleven_multilingual_v2",
-                    stream=False,
-                    api_key=ELEVENLABS_API_KEY
+        with open(filepath, 'wb') as f:
+            f.write(audio)
+    except NameError:
+        # Try new API
+        if not ELEVENLABS_CLIENT:
+            raise Exception("ElevenLabs client not initialized")
+        audio = ELEVENLABS_CLIENT.generate(
+            text=text,
+            voice=Voice(
+                voice_id=voice,
+                settings=VoiceSettings(
+                    stability=stability,
+                    similarity_boost=similarity_boost
                 )
-                
-                with open(filepath, 'wb') as f:
-                    f.write(audio)
-                
-                return filename
-            except NameError:
-                # Try new API
-                if ELEVENLABS_CLIENT:
-                    audio = ELEVENLABS_CLIENT.generate(
-                        text=text,
-                        voice=Voice(
-                            voice_id=voice,
-                            settings=VoiceSettings(
-                                stability=stability,
-                                similarity_boost=similarity_boost
-                            )
-                        ),
-                        model="eleven_multilingual_v2"
-                    )
-                    
-                    with open(filepath, 'wb') as f:
-                        for chunk in audio:
-                            f.write(chunk)
-                    
-                    return filename
-                else:
-                    raise Exception("ElevenLabs client not initialized")
-            
-        elif provider == 'openai':
-            # Try OpenAI-compatible TTS service first
-            try:
-                requests.head(TTS_API_URL.split('/v1')[0], timeout=1)
-                
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {TTS_API_KEY}"
-                }
-                payload = {
-                    "model": model,
-                    "input": text,
-                    "voice": voice,
-                    "speed": voice_settings.get('speed', 1.0) if voice_settings else 1.0
-                }
-                
-                response = requests.post(TTS_API_URL, json=payload, headers=headers, timeout=10)
-                
-                if response.status_code == 200:
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
-                    return filename
-                else:
-                    print(f"OpenAI TTS API error: {response.status_code}")
-                    raise Exception("OpenAI TTS failed")
-                    
-            except requests.exceptions.ConnectionError:
-                print("OpenAI TTS service not available, falling back to gTTS")
-                raise Exception("OpenAI TTS not available")
-        
-        # Fallback to gTTS
-        from gtts import gTTS
-        tts = gTTS(text=text, lang='en', slow=False)
-        tts.save(filepath)
-        return filename
+            ),
+            model="eleven_multilingual_v2"
+        )
         
-    except Exception as e:
-        print(f"Error in enhanced TTS ({provider}): {str(e)}")
-        # Final fallback to gTTS
+        with open(filepath, 'wb') as f:
+            for chunk in audio:
+                f.write(chunk)
+
+def _tts_openai(text, voice, model, voice_settings, filepath):
+    audio = openai_tts.synthesize(
+        text, voice, model,
+        speed=voice_settings.get('speed', 1.0) if voice_settings else 1.0
+    )
+    with open(filepath, 'wb') as f:
+        f.write(audio)
+
+def _tts_gtts(text, filepath):
+    from gtts import gTTS
+    tts = gTTS(text=text, lang='en', slow=False)
+    tts.save(filepath)
+
+def tts_provider_chain(voice, provider, skip_local=False):
+    """Providers to try for a request, in fallback order"""
+    chain = []
+    if is_local_voice(voice) and not skip_local:
+        chain.append('local')
+    if provider == 'elevenlabs' and ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
+        chain.append('elevenlabs')
+    elif provider == 'openai':
+        chain.append('openai')
+    chain.append('gtts')
+    return chain
+
+def _text_to_speech_uncached(text, voice, model, provider, voice_settings, skip_local):
+    """Run the provider fallback chain; returns (filename, source provider)
+
+    Providers whose circuit is open are skipped without waiting for them to
+    time out. gTTS is still tried as the last resort if every circuit is open.
+    """
+    filename = str(uuid.uuid4().hex) + ".mp3"
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    
+    synthesizers = {
+        'local': lambda: _tts_local(text, voice, filepath),
+        'elevenlabs': lambda: _tts_elevenlabs(text, voice, voice_settings, filepath),
+        'openai': lambda: _tts_openai(text, voice, model, voice_settings, filepath),
+        'gtts': lambda: _tts_gtts(text, filepath)
+    }
+    
+    chain = tts_provider_chain(voice, provider, skip_local)
+    attempted = False
+    for name in chain:
         try:
-            from gtts import gTTS
-            tts = gTTS(text=text, lang='en', slow=False)
-            tts.save(filepath)
-            return filename
-        except Exception as e2:
-            print(f"Error in gTTS fallback: {str(e2)}")
-            return None
-
-def text_to_speech(text, voice, model):
-    """Legacy function for backward compatibility"""
-    user_prefs = load_user_data()
-    provider = user_prefs.get('tts_provider', 'openai')
+            provider_router.call(name, synthesizers[name])
+            return filename, name
+        except CircuitOpenError:
+            print(f"Skipping TTS provider {name}: circuit open")
+        except Exception as e:
+            attempted = True
+            print(f"Error in enhanced TTS ({name}): {str(e)}")
     
-    voice_settings = {
+    if not attempted:
+        # Every circuit is open; make one direct attempt rather than fail outright
+        try:
+            _tts_gtts(text, filepath)
+            return filename, 'gtts'
+        except Exception as e:
+            print(f"Error in gTTS fallback: {str(e)}")
+    return None, None
+
+def get_voice_settings(user_prefs):
+    """Provider voice settings from the user's preferences"""
+    return {
         'speed': user_prefs.get('voice_speed', 1.0),
         'stability': user_prefs.get('voice_stability', 0.5),
         'similarity_boost': user_prefs.get('voice_clarity', 0.75)
     }
+
+def text_to_speech(text, voice, model, skip_local=False):
+    """Legacy function for backward compatibility"""
+    user_prefs = load_user_data()
+    provider = user_prefs.get('tts_provider', 'openai')
+    
+    voice_settings = get_voice_settings(user_prefs)
     
     # Use ElevenLabs voice if specified
     if provider == 'elevenlabs' and user_prefs.get('elevenlabs_voice_id'):
         voice = user_prefs['elevenlabs_voice_id']
     
-    return text_to_speech_enhanced(text, voice, model, provider, voice_settings)
+    return text_to_speech_enhanced(text, voice, model, provider, voice_settings, skip_local=skip_local)
 
-def convert_to_pcm_wav(filepath):
+def local_voice_streams(voice):
+    """Whether a local voice's backend can stream its audio"""
+    if not is_local_voice(voice):
+        return False
     try:
-        output_path = filepath.rsplit('.', 1)[0] + "_converted.wav"
-        command = ['ffmpeg', '-i', filepath, '-ac', '1', '-ar', '16000', '-sample_fmt', 's16', output_path]
-        subprocess.run(command, check=True)
-        return output_path
-    except subprocess.CalledProcessError as e:
-        raise ValueError(f"WAV conversion failed: {e}")
+        from local_tts_models import local_voice_cloner
+    except ImportError:
+        return False
+    voice_info = local_voice_cloner.get_voice_info(voice)
+    return bool(voice_info) and voice_info.get('backend') == 'xtts'
+
+def _local_tts_stream(text, voice):
+    from local_tts_models import local_voice_cloner
+    return local_voice_cloner.synthesize_speech_stream(text, voice)
+
+def _elevenlabs_tts_stream(text, voice, voice_settings):
+    voice_settings = voice_settings or {}
+    load_elevenlabs()
+    try:
+        # Try old API first
+        return generate(
+            text=text,
+            voice=voice,
+            model="eleven_multilingual_v2",
+            stream=True,
+            api_key=ELEVENLABS_API_KEY
+        )
+    except NameError:
+        # Try new API
+        if not ELEVENLABS_CLIENT:
+            raise Exception("ElevenLabs client not initialized")
+        return ELEVENLABS_CLIENT.generate(
+            text=text,
+            voice=Voice(
+                voice_id=voice,
+                settings=VoiceSettings(
+                    stability=voice_settings.get('stability', 0.5),
+                    similarity_boost=voice_settings.get('similarity_boost', 0.75)
+                )
+            ),
+            model="eleven_multilingual_v2",
+            stream=True
+        )
+
+def _openai_tts_stream(text, voice, model, voice_settings):
+    return openai_tts.stream(
+        text, voice, model,
+        speed=voice_settings.get('speed', 1.0) if voice_settings else 1.0
+    )
+
+def _gtts_stream(text):
+    from gtts import gTTS
+    return gTTS(text=text, lang='en', slow=False).stream()
+
+def open_tts_stream(text, voice, model, provider='openai', voice_settings=None):
+    """Open a streaming TTS source using the same fallback order as text_to_speech_enhanced
+
+    Returns (source, chunks, first_chunk_ms, extension) or None if every
+    provider failed before producing audio.
+    """
+    openers = {
+        'local': ('wav', lambda: _local_tts_stream(text, voice)),
+        'elevenlabs': ('mp3', lambda: _elevenlabs_tts_stream(text, voice, voice_settings)),
+        'openai': ('mp3', lambda: _openai_tts_stream(text, voice, model, voice_settings)),
+        'gtts': ('mp3', lambda: _gtts_stream(text))
+    }
+    
+    # Only XTTS clones stream; others go straight to the remote providers
+    for source in tts_provider_chain(voice, provider, skip_local=not local_voice_streams(voice)):
+        # The final gTTS fallback is tried even when its circuit is open
+        if source != 'gtts' and not provider_router.allow(source):
+            print(f"Skipping streaming TTS via {source}: circuit open")
+            continue
+        extension, opener = openers[source]
+        try:
+            chunks, first_chunk_ms = prime_stream(opener())
+        except ProviderRequestError as e:
+            provider_router.release(source)
+            print(f"Streaming TTS via {source} rejected the request: {str(e)}")
+            continue
+        except (Exception, StopIteration) as e:
+            provider_router.record_failure(source, e)
+            print(f"Streaming TTS via {source} failed: {str(e)}")
+            continue
+        provider_router.record_success(source, first_chunk_ms)
+        return source, chunks, first_chunk_ms, extension
+    return None
+
+def generate_speech(text, voice, model, skip_local=False):
+    """Synthesize text with the user's provider and record it in history"""
+    filename = text_to_speech(text, voice, model, skip_local=skip_local)
+    if filename:
+        add_to_history('tts', text, {
+            'voice': voice,
+            'model': model,
+            'provider': load_user_data().get('tts_provider', 'openai'),
+            'filename': filename
+        })
+    return filename
+
+def translate_text(text, target_language):
+    """Translate text and record it in history and recent languages"""
+    translation = translation_service.translate(text, target_language)
+    
+    # Add translation to history
+    add_to_history('translation', translation, {
+        'original_text': text,
+        'target_language': target_language,
+        'source_language': 'auto'
+    })
+    
+    # Update recent languages
+    def remember_language(user_prefs):
+        if target_language not in user_prefs['recent_languages']:
+            user_prefs['recent_languages'].insert(0, target_language)
+            user_prefs['recent_languages'] = user_prefs['recent_languages'][:5]  # Keep only 5 recent
+    update_user_data(remember_language)
+    
+    return translation
+
+def transcribe_file(filepath, original_filename, target_language=None, engine=None):
+    """Transcribe an uploaded audio file and optionally translate the result
+
+    Raises ValueError if the file cannot be decoded, UnintelligibleAudioError
+    if no speech is recognized and TranscriptionError if the engine fails.
+    """
+    from audio_ingest import decode_audio
+    from asr import transcribe
+    
+    engine = engine or load_user_data().get('asr_engine', 'google')
+    
+    # Decode and resample to 16 kHz mono in memory, no converted copy on disk
+    samples = decode_audio(filepath)
+    result = transcribe(samples, engine=engine)
+    transcription = result['text']
+    audio_filename = os.path.basename(filepath)
+    
+    # Add transcription to history
+    add_to_history('transcription', transcription, {
+        'original_filename': original_filename,
+        'engine': engine
+    })
+
+    translation = translate_text(transcription, target_language) if target_language else None
+    
+    return {
+        'transcription': transcription,
+        'translation': translation,
+        'audio_filename': audio_filename,
+        'segments': result['segments'],
+        'engine': engine
+    }
+
+def run_tts_job(text, voice, model):
+    """Background job: synthesize speech, running local clones on the process pool"""
+    if is_local_voice(voice):
+        from local_tts_models import synthesize_in_worker
+        
+        user_prefs = load_user_data()
+        cache_key = tts_cache_key(text, voice, model, user_prefs.get('tts_provider', 'openai'),
+                                  get_voice_settings(user_prefs))
+        filename = tts_cache.get(cache_key)
+        if not filename:
+            filename = str(uuid.uuid4().hex) + ".mp3"
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+            success, message = job_manager.run_in_process(synthesize_in_worker, text, voice, filepath)
+            if success:
+                try:
+                    filename = tts_cache.put(cache_key, filename)
+                except OSError as e:
+                    print(f"Could not cache TTS output: {e}")
+        else:
+            success, message = True, "Cached"
+        if success:
+            add_to_history('tts', text, {
+                'voice': voice,
+                'model': model,
+                'provider': 'local',
+                'filename': filename
+            })
+            return {'filename': filename}
+        print(f"Local TTS failed: {message}")
+    
+    filename = generate_speech(text, voice, model, skip_local=True)
+    if not filename:
+        raise Exception("Failed to generate speech. Please check the TTS service.")
+    return {'filename': filename}
+
+def run_transcription_job(filepath, original_filename, target_language=None):
+    """Background job: transcribe (and translate) an uploaded file"""
+    return transcribe_file(filepath, original_filename, target_language)
+
+def run_translation_job(text, target_language):
+    """Background job: translate text"""
+    return {'translation': translate_text(text, target_language)}
+
+def remove_files(paths):
+    """Delete saved uploads, ignoring ones that are already gone"""
+    for path in paths if isinstance(paths, list) else [paths]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def run_voice_clone_job(name, description, filepath):
+    """Background job: create a voice clone from one or more saved samples"""
+    voice_id, message = create_voice_clone(name, description, filepath)
+    if not voice_id:
+        # Clean up files if creation failed
+        remove_files(filepath)
+        raise Exception(message)
+    return {'voice_id': voice_id, 'message': message}
+
+def _tts_batch_local(voice, model, provider, voice_settings, items):
+    """Synthesize one local voice's batch items on the process pool, in chunks"""
+    from local_tts_models import synthesize_batch_in_worker
+    
+    results = [None] * len(items)
+    pending = []
+    for index, item in enumerate(items):
+        cache_key = tts_cache_key(item['text'], voice, model, provider, voice_settings)
+        cached = tts_cache.get(cache_key)
+        if cached:
+            results[index] = {'status': 'ok', 'filename': cached, 'source': 'local', 'cached': True}
+        else:
+            pending.append((index, cache_key, str(uuid.uuid4().hex) + ".mp3"))
+    
+    # Each chunk borrows the model once; between chunks interactive requests get a turn
+    for start in range(0, len(pending), TTS_BATCH_CHUNK_SIZE):
+        chunk = pending[start:start + TTS_BATCH_CHUNK_SIZE]
+        work = [(items[index]['text'], os.path.join(app.config['UPLOAD_FOLDER'], filename))
+                for index, _, filename in chunk]
+        outcomes = job_manager.run_in_process(synthesize_batch_in_worker, voice, work)
+        for (index, cache_key, filename), (success, message) in zip(chunk, outcomes):
+            if not success:
+                results[index] = {'status': 'error', 'error': message}
+                continue
+            try:
+                filename = tts_cache.put(cache_key, filename)
+            except OSError as e:
+                print(f"Could not cache TTS output: {e}")
+            results[index] = {'status': 'ok', 'filename': filename, 'source': 'local', 'cached': False}
+    return results
+
+def _tts_batch_remote(voice, model, provider, voice_settings, items):
+    """Synthesize one remote voice's batch items through the provider concurrency limits"""
+    primary = primary_tts_source(voice, provider, skip_local=True)
+    
+    def synthesize(text):
+        # Hits still go through the cache; each item is one provider call, never re-segmented
+        return _text_to_speech_cached(text, voice, model, provider, voice_settings, True)
+    
+    results = []
+    for filename, source in synthesize_segments([item['text'] for item in items], synthesize, primary):
+        if filename:
+            results.append({'status': 'ok', 'filename': filename, 'source': source})
+        else:
+            results.append({'status': 'error', 'error': 'Speech generation failed'})
+    return results
+
+def run_tts_batch(items, voice=None, model=None, provider=None, output_format='json'):
+    """Synthesize many texts, grouped by voice and backend, and return a per-item manifest
+
+    Items are dicts with ``text`` and optional ``voice``, ``model``,
+    ``provider`` and ``id``. Each voice/backend group loads its model or
+    connection once and the groups run concurrently. With ``output_format``
+    ``zip`` the audio and manifest are also packaged into one archive.
+    """
+    user_prefs = load_user_data()
+    voice_settings = get_voice_settings(user_prefs)
+    defaults = {
+        'voice': voice or user_prefs['preferred_voice'],
+        'model': model or user_prefs['preferred_model'],
+        'provider': provider or user_prefs.get('tts_provider', 'openai')
+    }
+    items = [{
+        'id': item.get('id'),
+        'text': item['text'],
+        'voice': item.get('voice') or defaults['voice'],
+        'model': item.get('model') or defaults['model'],
+        'provider': item.get('provider') or defaults['provider']
+    } for item in items]
+    
+    def group_key(item):
+        return ('local' if is_local_voice(item['voice']) else 'remote',
+                item['voice'], item['model'], item['provider'])
+    
+    def run_group(key, group_items):
+        backend, group_voice, group_model, group_provider = key
+        if backend == 'local':
+            results = _tts_batch_local(group_voice, group_model, group_provider, voice_settings, group_items)
+            failed = [index for index, result in enumerate(results) if result['status'] != 'ok']
+            if failed:
+                print(f"Local batch TTS failed for {len(failed)} items, using remote providers")
+                retried = _tts_batch_remote(group_voice, group_model, group_provider, voice_settings,
+                                            [group_items[index] for index in failed])
+                for index, result in zip(failed, retried):
+                    results[index] = result
+            return results
+        return _tts_batch_remote(group_voice, group_model, group_provider, voice_settings, group_items)
+    
+    results = run_batch(items, group_key, run_group)
+    succeeded = sum(1 for result in results if result['status'] == 'ok')
+    batch = {'items': results, 'succeeded': succeeded, 'failed': len(results) - succeeded}
+    
+    if output_format == 'zip':
+        filename = f"tts_batch_{uuid.uuid4().hex}.zip"
+        write_zip(results, app.config['UPLOAD_FOLDER'], os.path.join(app.config['UPLOAD_FOLDER'], filename))
+        batch['filename'] = filename
+    
+    add_to_history('tts_batch', f"Batch of {len(results)} texts", {
+        'succeeded': succeeded,
+        'failed': batch['failed'],
+        'filename': batch.get('filename')
+    })
+    return batch
+
+def batch_to_json(batch):
+    """Add download URLs to a batch manifest"""
+    for result in batch.get('items', []):
+        if result.get('filename'):
+            result['url'] = url_for('uploaded_file', filename=result['filename'])
+    if batch.get('filename'):
+        batch['url'] = url_for('uploaded_file', filename=batch['filename'])
+    return batch
+
+def session_id():
+    """Id of the browser session that owns stored results, created on first use"""
+    if 'sid' not in session:
+        session['sid'] = uuid.uuid4().hex
+    return session['sid']
+
+def wants_async():
+    """Check whether the client asked for work to be queued as a background job"""
+    value = request.values.get('async', '')
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+def save_upload(file, prefix=''):
+    """Save an uploaded file under a unique name and return its path"""
+    filename = secure_filename(f"{prefix}{uuid.uuid4().hex}_{file.filename}")
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    file.save(filepath)
+    return filepath
+
+def voice_sample_path(sample_id):
+    """Path of a streamed voice sample by id, or None if there is no such sample"""
+    if not isinstance(sample_id, str) or not re.fullmatch(r'[0-9a-f]{32}', sample_id):
+        return None
+    for extension in ALLOWED_EXTENSIONS:
+        path = os.path.join(app.config['UPLOAD_FOLDER'], f"{VOICE_SAMPLE_PREFIX}{sample_id}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+def job_to_json(job):
+    """Serialize a job, adding a URL for any produced audio file"""
+    result = job.get('result')
+    if isinstance(result, dict) and result.get('filename'):
+        job['result_url'] = url_for('uploaded_file', filename=result['filename'])
+    if isinstance(result, dict) and 'items' in result:
+        batch_to_json(result)
+    job['status_url'] = url_for('api_get_job', job_id=job['id'])
+    return job
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
-    global latest_transcription, latest_translation, latest_audio_filename, latest_speech_filename
-    
     # Load user preferences
     user_prefs = load_user_data()
 
@@ -545,101 +1132,141 @@ def index():
         selected_voice = request.form.get('voice', user_prefs['preferred_voice'])
         selected_model = request.form.get('model', user_prefs['preferred_model'])
 
+        if wants_async():
+            # Queue the work and return job handles immediately
+            queued = {}
+            if text_input:
+                queued['tts'] = job_manager.submit('tts', run_tts_job, text_input, selected_voice, selected_model)
+            if file and allowed_file(file.filename):
+                filepath = save_upload(file)
+                queued['transcription'] = job_manager.submit(
+                    'transcription', run_transcription_job, filepath, file.filename, target_language
+                )
+            if not queued:
+                return jsonify({'error': 'No audio or text provided'}), 400
+            return jsonify({
+                'jobs': {kind: job_to_json(job_manager.get(job_id)) for kind, job_id in queued.items()}
+            }), 202
+
         if text_input:
-            latest_speech_filename = text_to_speech(text_input, selected_voice, selected_model)
-            if latest_speech_filename:
-                # Add to history
-                add_to_history('tts', text_input, {
-                    'voice': selected_voice,
-                    'model': selected_model,
-                    'provider': user_prefs.get('tts_provider', 'openai'),
-                    'filename': latest_speech_filename
-                })
+            speech_filename = generate_speech(text_input, selected_voice, selected_model)
+            if speech_filename:
+                storage.put_result(session_id(), SPEECH_RESULT, {'filename': speech_filename})
             else:
                 flash("Failed to generate speech. Please check the TTS service.", "flash-danger")
 
         if file and allowed_file(file.filename):
-            filename = secure_filename(f"{uuid.uuid4().hex}_{file.filename}")
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
+            filepath = save_upload(file)
 
+            from asr import TranscriptionError, UnintelligibleAudioError
             try:
-                converted_path = convert_to_pcm_wav(filepath)
+                result = transcribe_file(filepath, file.filename, target_language)
+                storage.put_result(session_id(), TRANSCRIPTION_RESULT, {
+                    'transcription': result['transcription'],
+                    'translation': result['translation'],
+                    'audio_filename': result['audio_filename']
+                })
+                user_prefs = load_user_data()
             except ValueError:
-                flash("Invalid WAV file format. Please upload PCM WAV.", "flash-danger")
+                flash("Unable to decode the audio file. Please upload a supported format.", "flash-danger")
                 return redirect(request.url)
-
-            recognizer = sr.Recognizer()
-            with sr.AudioFile(converted_path) as source:
-                audio_data = recognizer.record(source)
-
-            try:
-                transcription = recognizer.recognize_google(audio_data)
-                latest_transcription = transcription
-                latest_audio_filename = os.path.basename(converted_path)
-                
-                # Add transcription to history
-                add_to_history('transcription', transcription, {
-                    'original_filename': file.filename,
-                    'converted_filename': latest_audio_filename
-                })
-
-                if target_language:
-                    latest_translation = GoogleTranslator(source='auto', target=target_language).translate(transcription)
-                    
-                    # Add translation to history
-                    add_to_history('translation', latest_translation, {
-                        'original_text': transcription,
-                        'target_language': target_language,
-                        'source_language': 'auto'
-                    })
-                    
-                    # Update recent languages
-                    if target_language not in user_prefs['recent_languages']:
-                        user_prefs['recent_languages'].insert(0, target_language)
-                        user_prefs['recent_languages'] = user_prefs['recent_languages'][:5]  # Keep only 5 recent
-                        save_user_data(user_prefs)
-                else:
-                    latest_translation = None
-
-            except sr.UnknownValueError:
-                flash("Could not understand the audio.", "flash-danger")
-            except sr.RequestError as e:
-                flash(f"Speech recognition error: {e}", "flash-danger")
+            except UnintelligibleAudioError:
+                flash("No speech could be recognized in the audio.", "flash-info")
+            except TranscriptionError as e:
+                flash(str(e), "flash-danger")
 
         elif not text_input:
             flash("No audio or text provided.", "flash-danger")
 
     # Get ElevenLabs voices for the UI
     elevenlabs_voices = get_elevenlabs_voices()
+    
+    results = storage.latest_results(session_id())
+    speech = results.get(SPEECH_RESULT)
+    transcription = results.get(TRANSCRIPTION_RESULT)
 
     return render_template('enhanced_index.html',
-                           transcription=latest_transcription,
-                           translated_text=latest_translation,
-                           audio_file=latest_audio_filename,
-                           speech_file=latest_speech_filename,
+                           transcription=transcription['data']['transcription'] if transcription else None,
+                           translated_text=transcription['data']['translation'] if transcription else None,
+                           audio_file=transcription['data']['audio_filename'] if transcription else None,
+                           transcription_id=transcription['id'] if transcription else None,
+                           speech_file=speech['data']['filename'] if speech else None,
+                           speech_id=speech['id'] if speech else None,
                            user_prefs=user_prefs,
                            elevenlabs_voices=elevenlabs_voices)
 
+def is_content_addressed(filename):
+    """Whether a file is named after a hash of its inputs or contents"""
+    stem = filename.split('.', 1)[0]
+    return is_cache_filename(filename) or bool(re.fullmatch(rf'{VOICE_SAMPLE_PREFIX}[0-9a-f]{{32}}', stem))
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
-    return send_file(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+    """Serve an upload or generated audio with Range support, a strong ETag and cache headers"""
+    if not is_content_addressed(filename):
+        # Revalidated with If-None-Match; Range and If-Range come with conditional responses
+        return send_from_directory(app.config['UPLOAD_FOLDER'], filename, conditional=True)
+    
+    try:
+        # Relative to the app root, like send_from_directory
+        stat = os.stat(os.path.join(app.root_path, app.config['UPLOAD_FOLDER'], secure_filename(filename)))
+    except OSError:
+        stat = None
+    # Cache hits refresh the mtime, so the default mtime-based ETag would churn;
+    # a regenerated entry is a new file, so the inode tells versions apart
+    etag = f"{filename.split('.', 1)[0]}-{stat.st_size:x}-{stat.st_ino:x}" if stat else True
+    response = send_from_directory(app.config['UPLOAD_FOLDER'], filename, conditional=True,
+                                   etag=etag, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/results/<result_id>/download')
+def download_result(result_id):
+    """Download a stored speech or transcription result by id"""
+    result = storage.get_result(result_id)
+    if result and result['kind'] == SPEECH_RESULT:
+        path = os.path.join(app.config['UPLOAD_FOLDER'], result['data']['filename'])
+        if not os.path.exists(path):
+            flash("This speech file has expired.", "flash-danger")
+            return redirect(url_for('index'))
+        return send_file(path, as_attachment=True)
+    if result and result['kind'] == TRANSCRIPTION_RESULT:
+        return Response(result['data']['transcription'], mimetype='text/plain', headers={
+            'Content-Disposition': f'attachment; filename=transcription_{result_id}.txt'
+        })
+    flash("Result not found.", "flash-danger")
+    return redirect(url_for('index'))
+
+@app.route('/api/results/<result_id>')
+def api_get_result(result_id):
+    """Get a stored result, with URLs for its audio and download"""
+    result = storage.get_result(result_id)
+    if not result:
+        return jsonify({'error': 'Result not found'}), 404
+    # The id is enough to fetch a result; don't hand out the owner's session
+    result.pop('session_id', None)
+    if result['data'].get('filename'):
+        result['url'] = url_for('uploaded_file', filename=result['data']['filename'])
+    if result['data'].get('audio_filename'):
+        result['audio_url'] = url_for('uploaded_file', filename=result['data']['audio_filename'])
+    result['download_url'] = url_for('download_result', result_id=result_id)
+    return jsonify(result)
 
 @app.route('/download_transcription')
 def download_transcription():
-    if latest_transcription:
-        filename = str(uuid.uuid4().hex) + ".txt"
-        path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        with open(path, 'w') as f:
-            f.write(latest_transcription)
-        return send_file(path, as_attachment=True)
+    """Download this session's latest transcription"""
+    result = storage.latest_results(session_id()).get(TRANSCRIPTION_RESULT)
+    if result:
+        return redirect(url_for('download_result', result_id=result['id']))
     flash("No transcription to download.", "flash-danger")
     return redirect(url_for('index'))
 
 @app.route('/download_speech')
 def download_speech():
-    if latest_speech_filename:
-        return send_file(os.path.join(app.config['UPLOAD_FOLDER'], latest_speech_filename), as_attachment=True)
+    """Download this session's latest generated speech"""
+    result = storage.latest_results(session_id()).get(SPEECH_RESULT)
+    if result:
+        return redirect(url_for('download_result', result_id=result['id']))
     flash("No speech available to download.", "flash-danger")
     return redirect(url_for('index'))
 
@@ -647,32 +1274,29 @@ def download_speech():
 def preferences():
     """User preferences page"""
     if request.method == 'POST':
-        user_data = load_user_data()
-        
-        # Update preferences from form
-        user_data['name'] = request.form.get('name', user_data['name'])
-        user_data['preferred_voice'] = request.form.get('preferred_voice', user_data['preferred_voice'])
-        user_data['preferred_model'] = request.form.get('preferred_model', user_data['preferred_model'])
-        user_data['preferred_language'] = request.form.get('preferred_language', user_data['preferred_language'])
-        user_data['theme'] = request.form.get('theme', user_data['theme'])
-        user_data['tts_provider'] = request.form.get('tts_provider', user_data['tts_provider'])
-        user_data['elevenlabs_voice_id'] = request.form.get('elevenlabs_voice_id', user_data['elevenlabs_voice_id'])
+        form = request.form
         
-        # Voice cloning settings
-        user_data['voice_cloning_provider'] = request.form.get('voice_cloning_provider', user_data.get('voice_cloning_provider', 'auto'))
+        # Only fields present in the form change; the rest keep their stored values
+        changes = {key: form[key] for key in (
+            'name', 'preferred_voice', 'preferred_model', 'preferred_language', 'theme',
+            'tts_provider', 'elevenlabs_voice_id', 'voice_cloning_provider'
+        ) if key in form}
+        from asr import ASR_ENGINES
+        if form.get('asr_engine') in ASR_ENGINES:
+            changes['asr_engine'] = form['asr_engine']
         
         # Voice settings
         try:
-            user_data['voice_speed'] = float(request.form.get('voice_speed', user_data['voice_speed']))
-            user_data['voice_stability'] = float(request.form.get('voice_stability', user_data['voice_stability']))
-            user_data['voice_clarity'] = float(request.form.get('voice_clarity', user_data['voice_clarity']))
-            user_data['voice_cloning_quota'] = int(request.form.get('voice_cloning_quota', user_data.get('voice_cloning_quota', 5)))
-            user_data['voice_data_retention_days'] = int(request.form.get('voice_data_retention_days', user_data.get('voice_data_retention_days', 30)))
+            for key, cast in (('voice_speed', float), ('voice_stability', float), ('voice_clarity', float),
+                              ('voice_cloning_quota', int), ('voice_data_retention_days', int)):
+                if key in form:
+                    changes[key] = cast(form[key])
         except ValueError:
             flash("Invalid voice settings values", "flash-danger")
             return redirect(request.url)
         
-        save_user_data(user_data)
+        # Applied atomically so a clone job finishing meanwhile doesn't lose its voice
+        update_user_data(lambda user_data: user_data.update(changes))
         flash("Preferences saved successfully!", "flash-success")
         return redirect(url_for('preferences'))
     
@@ -686,7 +1310,9 @@ def preferences():
 @app.route('/history')
 def history():
     """User history page"""
-    user_history = load_history()
+    limit = request.args.get('limit', 100, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    user_history = load_history(limit=limit, offset=offset)
     return render_template('history.html', history=user_history)
 
 @app.route('/api/favorites', methods=['POST'])
@@ -698,21 +1324,24 @@ def add_favorite():
     if not phrase:
         return jsonify({'error': 'No phrase provided'}), 400
     
-    user_data = load_user_data()
-    if phrase not in user_data['favorite_phrases']:
-        user_data['favorite_phrases'].append(phrase)
-        save_user_data(user_data)
+    def add_phrase(user_data):
+        if phrase not in user_data['favorite_phrases']:
+            user_data['favorite_phrases'].append(phrase)
+    update_user_data(add_phrase)
     
     return jsonify({'success': True})
 
 @app.route('/api/favorites/<int:index>', methods=['DELETE'])
 def remove_favorite(index):
     """Remove phrase from favorites"""
-    user_data = load_user_data()
+    removed = []
+    
+    def remove_phrase(user_data):
+        if 0 <= index < len(user_data['favorite_phrases']):
+            removed.append(user_data['favorite_phrases'].pop(index))
+    update_user_data(remove_phrase)
     
-    if 0 <= index < len(user_data['favorite_phrases']):
-        user_data['favorite_phrases'].pop(index)
-        save_user_data(user_data)
+    if removed:
         return jsonify({'success': True})
     
     return jsonify({'error': 'Invalid index'}), 400
@@ -727,6 +1356,11 @@ def api_elevenlabs_voices():
     """Get ElevenLabs voices via API"""
     return jsonify(get_elevenlabs_voices())
 
+@app.route('/api/elevenlabs-voices/catalog')
+def api_elevenlabs_voice_catalog():
+    """Age, size and refresh state of the cached ElevenLabs voice catalog"""
+    return jsonify(elevenlabs_voice_catalog.stats())
+
 @app.route('/voice-cloning', methods=['GET', 'POST'])
 def voice_cloning():
     """Voice cloning management page"""
@@ -738,9 +1372,9 @@ def voice_cloning():
         if action == 'enable_consent':
             # Handle voice cloning consent
             consent = request.form.get('voice_cloning_consent') == 'on'
-            user_data['voice_cloning_consent'] = consent
-            user_data['voice_cloning_enabled'] = consent
-            save_user_data(user_data)
+            update_user_data(lambda user_data: user_data.update(
+                voice_cloning_consent=consent, voice_cloning_enabled=consent
+            ))
             
             if consent:
                 flash("Voice cloning enabled. You can now create custom voices.", "flash-success")
@@ -753,20 +1387,26 @@ def voice_cloning():
             # Handle voice clone creation
             voice_name = request.form.get('voice_name', '').strip()
             voice_description = request.form.get('voice_description', '').strip()
-            audio_file = request.files.get('voice_sample')
+            audio_files = [f for f in request.files.getlist('voice_sample') if f and f.filename]
             
             if not voice_name:
                 flash("Voice name is required.", "flash-danger")
                 return redirect(request.url)
             
-            if not audio_file or not allowed_file(audio_file.filename):
+            if not audio_files or not all(allowed_file(f.filename) for f in audio_files):
                 flash("Valid audio file is required.", "flash-danger")
                 return redirect(request.url)
             
-            # Save uploaded file
-            filename = secure_filename(f"voice_sample_{uuid.uuid4().hex}_{audio_file.filename}")
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            audio_file.save(filepath)
+            # Save uploaded files; several files become separate reference clips
+            filepaths = [save_upload(f, prefix='voice_sample_') for f in audio_files]
+            filepath = filepaths[0] if len(filepaths) == 1 else filepaths
+            
+            if wants_async():
+                job_id = job_manager.submit('voice_clone', run_voice_clone_job,
+                                            voice_name, voice_description, filepath,
+                                            metadata={'name': voice_name})
+                flash(f"Voice clone '{voice_name}' is being created (job {job_id}).", "flash-info")
+                return redirect(request.url)
             
             # Create voice clone
             voice_id, message = create_voice_clone(voice_name, voice_description, filepath)
@@ -775,11 +1415,8 @@ def voice_cloning():
                 flash(message, "flash-success")
             else:
                 flash(message, "flash-danger")
-                # Clean up file if creation failed
-                try:
-                    os.remove(filepath)
-                except:
-                    pass
+                # Clean up files if creation failed
+                remove_files(filepath)
             
             return redirect(request.url)
     
@@ -802,22 +1439,31 @@ def api_create_voice_clone():
         data = request.get_json()
         voice_name = data.get('name', '').strip()
         voice_description = data.get('description', '').strip()
-        audio_data = data.get('audio_data')  # Base64 encoded audio
+        audio_data = data.get('audio_data')  # Base64 encoded audio, or a list of clips
+        sample_ids = data.get('sample_ids') or data.get('sample_id')  # From /api/voice-samples
         
         if not voice_name:
             return jsonify({'error': 'Voice name is required'}), 400
         
-        if not audio_data:
+        if not audio_data and not sample_ids:
             return jsonify({'error': 'Audio data is required'}), 400
         
-        # Decode and save audio data
-        import base64
-        audio_bytes = base64.b64decode(audio_data)
-        filename = f"voice_sample_{uuid.uuid4().hex}.wav"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        with open(filepath, 'wb') as f:
-            f.write(audio_bytes)
+        filepaths = []
+        if sample_ids:
+            for sample_id in sample_ids if isinstance(sample_ids, list) else [sample_ids]:
+                path = voice_sample_path(sample_id)
+                if not path:
+                    return jsonify({'error': f'Unknown voice sample: {sample_id}'}), 404
+                filepaths.append(path)
+        else:
+            # Decode and save audio data
+            import base64
+            for clip in audio_data if isinstance(audio_data, list) else [audio_data]:
+                filename = f"{VOICE_SAMPLE_PREFIX}{uuid.uuid4().hex}.wav"
+                filepaths.append(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+                with open(filepaths[-1], 'wb') as f:
+                    f.write(base64.b64decode(clip))
+        filepath = filepaths[0] if len(filepaths) == 1 else filepaths
         
         # Create voice clone
         voice_id, message = create_voice_clone(voice_name, voice_description, filepath)
@@ -829,16 +1475,237 @@ def api_create_voice_clone():
                 'message': message
             })
         else:
-            # Clean up file if creation failed
-            try:
-                os.remove(filepath)
-            except:
-                pass
+            # Clean up files if creation failed; streamed samples stay so the client can retry
+            if not sample_ids:
+                remove_files(filepath)
             return jsonify({'error': message}), 400
             
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+@app.route('/api/voice-samples', methods=['POST'])
+def api_upload_voice_sample():
+    """Stream a raw audio body to disk and return a sample id for /api/voice-clone"""
+    if not load_user_data().get('voice_cloning_consent', False):
+        return jsonify({'error': 'Voice cloning consent required'}), 403
+    
+    try:
+        # Headers are checked before any of the body is read
+        check_upload_headers(request.mimetype, request.content_length)
+        upload = stream_upload(request.stream, app.config['UPLOAD_FOLDER'], prefix=VOICE_SAMPLE_PREFIX,
+                               content_length=request.content_length)
+    except UploadRejected as e:
+        return jsonify({'error': str(e)}), e.status
+    
+    return jsonify({
+        'sample_id': upload['sha256'][:32],
+        'sha256': upload['sha256'],
+        'size': upload['size'],
+        'format': upload['format']
+    }), 201
+
+@app.route('/api/translate', methods=['POST'])
+def api_translate():
+    """Translate one or more texts in a single batched, cached call"""
+    data = request.get_json(silent=True) or {}
+    texts = data.get('texts')
+    if texts is None and data.get('text'):
+        texts = [data['text']]
+    target_language = data.get('target_language')
+    
+    if not texts or not isinstance(texts, list) or not target_language:
+        return jsonify({'error': 'Texts and target language are required'}), 400
+    
+    try:
+        translations = translation_service.translate_many(
+            [str(text) for text in texts], target_language, data.get('source_language', 'auto')
+        )
+    except Exception as e:
+        return jsonify({'error': f'Translation error: {str(e)}'}), 502
+    
+    return jsonify({
+        'translations': translations,
+        'stats': translation_service.stats()
+    })
+
+@app.route('/api/tts/stream', methods=['GET', 'POST'])
+def api_tts_stream():
+    """Stream synthesized speech as it is produced, saving it for history as well"""
+    data = request.get_json(silent=True) or request.values
+    text = (data.get('text') or '').strip()
+    if not text:
+        return jsonify({'error': 'Text is required'}), 400
+    
+    user_prefs = load_user_data()
+    provider = data.get('provider') or user_prefs.get('tts_provider', 'openai')
+    voice = data.get('voice') or user_prefs['preferred_voice']
+    model = data.get('model') or user_prefs['preferred_model']
+    
+    # Use ElevenLabs voice if none was given explicitly
+    if provider == 'elevenlabs' and not data.get('voice') and user_prefs.get('elevenlabs_voice_id'):
+        voice = user_prefs['elevenlabs_voice_id']
+    
+    voice_settings = get_voice_settings(user_prefs)
+    
+    # Local clones stream WAV rather than the cached MP3 artifacts
+    cache_key = None
+    if not is_local_voice(voice):
+        cache_key = tts_cache_key(text, voice, model, provider, voice_settings)
+        cached = tts_cache.get(cache_key)
+        if cached:
+            return send_file(os.path.join(app.config['UPLOAD_FOLDER'], cached), mimetype='audio/mpeg')
+    
+    opened = open_tts_stream(text, voice, model, provider, voice_settings)
+    if not opened:
+        return jsonify({'error': 'Failed to generate speech. Please check the TTS service.'}), 502
+    
+    source, chunks, first_chunk_ms, extension = opened
+    cacheable = cache_key is not None and source == primary_tts_source(voice, provider)
+    if cacheable:
+        # Write straight to the cached name so the advertised URL stays valid
+        filename = tts_cache.filename_for(cache_key, extension)
+    else:
+        filename = str(uuid.uuid4().hex) + "." + extension
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    
+    def on_complete(path):
+        if cacheable:
+            tts_cache.put(cache_key, filename)
+        add_to_history('tts', text, {
+            'voice': voice,
+            'model': model,
+            'provider': source,
+            'filename': filename,
+            'streamed': True,
+            'first_chunk_ms': round(first_chunk_ms)
+        })
+    
+    def on_error(error):
+        # Failures after the first chunk count against the provider too
+        provider_router.record_failure(source, error)
+    
+    tee = StreamTee(chunks, filepath, on_complete=on_complete,
+                    finalize=finalize_wav_header if extension == 'wav' else None,
+                    on_error=on_error)
+    
+    # No Content-Length, so the response goes out with chunked transfer encoding
+    response = Response(iter(tee),
+                        mimetype='audio/wav' if extension == 'wav' else 'audio/mpeg',
+                        direct_passthrough=True)
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['X-Audio-Url'] = url_for('uploaded_file', filename=filename)
+    response.headers['X-First-Chunk-Ms'] = str(round(first_chunk_ms))
+    return response
+
+@app.route('/api/tts/cache')
+def api_tts_cache_stats():
+    """TTS output cache hit/miss counters and size"""
+    return jsonify(tts_cache.stats())
+
+@app.route('/api/providers/health')
+def api_provider_health():
+    """Circuit state, success rate and latency of each TTS provider"""
+    return jsonify(provider_router.stats())
+
+@app.route('/api/maintenance', methods=['GET', 'POST'])
+def api_maintenance():
+    """Disk maintenance status; POST runs a sweep now and returns what it reclaimed"""
+    if request.method == 'POST':
+        return jsonify(maintenance_sweeper.sweep())
+    return jsonify(maintenance_sweeper.stats())
+
+@app.route('/api/startup')
+def api_startup_report():
+    """Import and start-up timings, heavy modules loaded, and the local model pool"""
+    report = import_report()
+    # Only report the pool once local TTS is in use; importing it here would defeat FAST_START
+    local_models = sys.modules.get('local_tts_models')
+    if local_models is not None:
+        report['model_pool'] = local_models.model_pool.stats()
+    return jsonify(report)
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def api_jobs():
+    """List recent background jobs or queue a new one"""
+    if request.method == 'GET':
+        limit = request.args.get('limit', 50, type=int)
+        return jsonify([job_to_json(job) for job in job_manager.list(limit)])
+    
+    data = request.get_json(silent=True) or request.form
+    job_type = data.get('type')
+    
+    if job_type == 'tts':
+        text = (data.get('text') or '').strip()
+        if not text:
+            return jsonify({'error': 'Text is required'}), 400
+        user_prefs = load_user_data()
+        job_id = job_manager.submit('tts', run_tts_job, text,
+                                    data.get('voice') or user_prefs['preferred_voice'],
+                                    data.get('model') or user_prefs['preferred_model'])
+    
+    elif job_type == 'translation':
+        text = (data.get('text') or '').strip()
+        target_language = data.get('target_language')
+        if not text or not target_language:
+            return jsonify({'error': 'Text and target language are required'}), 400
+        job_id = job_manager.submit('translation', run_translation_job, text, target_language)
+    
+    elif job_type == 'transcription':
+        file = request.files.get('file')
+        if not file or not allowed_file(file.filename):
+            return jsonify({'error': 'Valid audio file is required'}), 400
+        filepath = save_upload(file)
+        job_id = job_manager.submit('transcription', run_transcription_job,
+                                    filepath, file.filename, data.get('target_language'))
+    
+    else:
+        return jsonify({'error': f'Unsupported job type: {job_type}'}), 400
+    
+    return jsonify(job_to_json(job_manager.get(job_id))), 202
+
+@app.route('/api/jobs/<job_id>')
+def api_get_job(job_id):
+    """Get the status and result of a background job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_to_json(job))
+
+@app.route('/api/tts/batch', methods=['POST'])
+def api_tts_batch():
+    """Synthesize a batch of texts, returning a manifest or a zip of the audio"""
+    data = request.get_json(silent=True) or {}
+    items = data.get('items') or []
+    if not isinstance(items, list):
+        return jsonify({'error': 'items must be a list'}), 400
+    
+    normalized = []
+    for item in items:
+        item = {'text': item} if isinstance(item, str) else item
+        if not isinstance(item, dict) or not str(item.get('text') or '').strip():
+            return jsonify({'error': 'Every item needs non-empty text'}), 400
+        normalized.append(dict(item, text=str(item['text']).strip()))
+    if not normalized:
+        return jsonify({'error': 'At least one item is required'}), 400
+    if len(normalized) > TTS_BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Batches are limited to {TTS_BATCH_MAX_ITEMS} items'}), 400
+    
+    output_format = data.get('format', 'json')
+    if output_format not in ('json', 'zip'):
+        return jsonify({'error': f'Unsupported format: {output_format}'}), 400
+    
+    args = (normalized, data.get('voice'), data.get('model'), data.get('provider'), output_format)
+    if wants_async() or data.get('async') or len(normalized) > TTS_BATCH_SYNC_LIMIT:
+        job_id = job_manager.submit('tts_batch', run_tts_batch, *args)
+        return jsonify(job_to_json(job_manager.get(job_id))), 202
+    
+    batch = run_tts_batch(*args)
+    if output_format == 'zip':
+        return send_file(os.path.join(app.config['UPLOAD_FOLDER'], batch['filename']),
+                         as_attachment=True, download_name='tts_batch.zip')
+    return jsonify(batch_to_json(batch))
+
 @app.route('/api/voice-clone/<voice_id>', methods=['DELETE'])
 def api_delete_voice_clone(voice_id):
     """API endpoint to delete voice clone"""
@@ -862,6 +1729,22 @@ def api_get_custom_voices():
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+@app.route('/api/local-voices')
+def api_local_voices():
+    """Page through local voice clones, newest first"""
+    try:
+        from local_tts_models import local_voice_cloner
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        offset = max(0, request.args.get('offset', 0, type=int))
+        return jsonify({
+            'voices': local_voice_cloner.list_voice_clones(limit=limit, offset=offset),
+            'total': local_voice_cloner.count_voice_clones(),
+            'limit': limit,
+            'offset': offset
+        })
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
 @app.route('/api/voice-clone/preview', methods=['POST'])
 def api_preview_voice_clone():
     """Preview a custom voice with sample text"""
@@ -892,8 +1775,23 @@ def api_preview_voice_clone():
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+def prewarm_backends():
+    """Import heavy backends in the background after start-up, unless in fast-start mode"""
+    modules = ['torch', 'torchaudio', 'local_tts_models', 'speech_recognition']
+    if ELEVENLABS_API_KEY != 'your_elevenlabs_api_key_here':
+        modules.append('elevenlabs')
+    return prewarm(modules)
+
+record_startup('app_import', time.perf_counter() - _import_started)
+
 def run_flask():
+    prewarm_backends()
+    warm_voice_catalog()
     app.run(host='0.0.0.0', port=80, debug=True)
 
 if __name__ == '__main__':
-    run_flask()
+    if sys.argv[1:2] == ['serve']:
+        from serve import serve
+        serve(app)
+    else:
+        run_flask()
@@ -0,0 +1,174 @@
+"""
+Speech Recognition Engines for AudioAlchemy
+Google Web Speech (online) and a locally loaded Whisper model (offline)
+"""
+
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+from audio_ingest import ASR_SAMPLE_RATE, to_audio_data, detect_speech_chunks
+
+logger = logging.getLogger(__name__)
+
+ASR_ENGINES = ('google', 'whisper')
+
+# Whisper checkpoint to load: tiny, base, small, medium, large, or a local path
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')
+WHISPER_DEVICE = os.getenv('WHISPER_DEVICE')  # defaults to cuda when available
+
+# Long recordings are split at silences into chunks of at most this length
+ASR_CHUNK_SECONDS = float(os.getenv('ASR_CHUNK_SECONDS', '30'))
+ASR_MAX_WORKERS = int(os.getenv('ASR_MAX_WORKERS', '4'))
+
+_whisper_model = None
+_whisper_load_lock = threading.Lock()
+_whisper_inference_lock = threading.Lock()
+
+
+class TranscriptionError(Exception):
+    """The recognizer could not be reached or failed"""
+
+
+class UnintelligibleAudioError(TranscriptionError):
+    """The recognizer found no speech it could understand"""
+
+
+def load_whisper_model():
+    """Load the configured Whisper model once per process"""
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_load_lock:
+            if _whisper_model is None:
+                import whisper
+                logger.info(f"Loading Whisper model: {WHISPER_MODEL}")
+                _whisper_model = whisper.load_model(WHISPER_MODEL, device=WHISPER_DEVICE)
+    return _whisper_model
+
+
+def _transcribe_google(samples: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+    import speech_recognition as sr
+
+    recognizer = sr.Recognizer()
+    try:
+        if language:
+            text = recognizer.recognize_google(to_audio_data(samples), language=language)
+        else:
+            text = recognizer.recognize_google(to_audio_data(samples))
+    except sr.UnknownValueError:
+        raise UnintelligibleAudioError("Could not understand the audio.")
+    except sr.RequestError as e:
+        raise TranscriptionError(f"Speech recognition error: {e}")
+
+    # Google returns no timing, so the whole clip is one segment
+    return {
+        'text': text,
+        'segments': [{'start': 0.0, 'end': len(samples) / ASR_SAMPLE_RATE, 'text': text}],
+        'language': language
+    }
+
+
+def _transcribe_whisper(samples: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+    model = load_whisper_model()
+    try:
+        # One inference at a time; torch already spreads each call across cores
+        with _whisper_inference_lock:
+            result = model.transcribe(
+                samples.astype(np.float32),
+                language=language,
+                fp16=model.device.type == 'cuda'
+            )
+    except Exception as e:
+        raise TranscriptionError(f"Whisper transcription error: {e}")
+
+    text = result.get('text', '').strip()
+    if not text:
+        raise UnintelligibleAudioError("Could not understand the audio.")
+
+    return {
+        'text': text,
+        'segments': [
+            {'start': float(seg['start']), 'end': float(seg['end']), 'text': seg['text'].strip()}
+            for seg in result.get('segments', [])
+        ],
+        'language': result.get('language', language)
+    }
+
+
+def _transcribe_clip(samples: np.ndarray, engine: str, language: Optional[str]) -> Dict[str, Any]:
+    if engine == 'whisper':
+        return _transcribe_whisper(samples, language)
+    if engine == 'google':
+        return _transcribe_google(samples, language)
+    raise TranscriptionError(f"Unsupported ASR engine: {engine}")
+
+
+def _transcribe_chunk(samples: np.ndarray, engine: str, language: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Transcribe one chunk; chunks with no recognizable speech yield None"""
+    try:
+        return _transcribe_clip(samples, engine, language)
+    except UnintelligibleAudioError:
+        return None
+
+
+def transcribe(samples: np.ndarray, engine: str = 'google', language: Optional[str] = None,
+               max_workers: int = ASR_MAX_WORKERS) -> Dict[str, Any]:
+    """Transcribe 16 kHz mono float32 samples
+
+    Recordings longer than ASR_CHUNK_SECONDS are split at silences, the
+    chunks are transcribed in parallel and the results stitched back in
+    order with their time offsets.
+
+    Returns a dict with ``text``, ``segments`` (start/end seconds and text),
+    ``language`` and ``engine``. Raises UnintelligibleAudioError when no
+    speech is recognized and TranscriptionError for engine failures.
+    """
+    if engine not in ASR_ENGINES:
+        raise TranscriptionError(f"Unsupported ASR engine: {engine}")
+
+    if len(samples) <= ASR_CHUNK_SECONDS * ASR_SAMPLE_RATE:
+        result = _transcribe_clip(samples, engine, language)
+        result['engine'] = engine
+        return result
+
+    ranges = detect_speech_chunks(samples, ASR_SAMPLE_RATE, max_chunk_seconds=ASR_CHUNK_SECONDS)
+    if not ranges:
+        raise UnintelligibleAudioError("Could not understand the audio.")
+
+    # Google requests are network-bound and run concurrently; Whisper calls
+    # are serialized on the shared model, which already uses every core
+    workers = max(1, min(max_workers, len(ranges)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asr') as executor:
+        results = list(executor.map(
+            lambda r: _transcribe_chunk(samples[r[0]:r[1]], engine, language), ranges
+        ))
+
+    texts = []
+    segments = []
+    detected_language = language
+    for (start, _), result in zip(ranges, results):
+        if result is None:
+            continue
+        offset = start / ASR_SAMPLE_RATE
+        texts.append(result['text'])
+        detected_language = detected_language or result.get('language')
+        for seg in result['segments']:
+            segments.append({
+                'start': seg['start'] + offset,
+                'end': seg['end'] + offset,
+                'text': seg['text']
+            })
+
+    if not texts:
+        raise UnintelligibleAudioError("Could not understand the audio.")
+
+    return {
+        'text': ' '.join(texts),
+        'segments': segments,
+        'language': detected_language,
+        'engine': engine
+    }
@@ -0,0 +1,361 @@
+"""
+Audio Ingest for AudioAlchemy
+Decodes uploads in memory and resamples them for speech recognition and voice cloning
+"""
+
+import json
+import subprocess
+import logging
+from math import gcd
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Speech recognizers expect 16 kHz mono
+ASR_SAMPLE_RATE = 16000
+
+
+def _decode_soundfile(path: str, sample_rate: int, block_seconds: float = 1.0) -> np.ndarray:
+    """Decode block by block, mixing down and resampling each block as it is read
+
+    Only one multi-channel block at the native rate is held at a time; the
+    output goes into a buffer preallocated from the header's frame count.
+    """
+    import soundfile as sf
+    with sf.SoundFile(path) as f:
+        resampler = StreamingResampler(f.samplerate, sample_rate)
+        blocksize = max(1, int(block_seconds * f.samplerate))
+        samples = np.empty(-(-max(f.frames, 0) * sample_rate // f.samplerate), dtype=np.float32)
+        position = 0
+
+        def append(mono):
+            nonlocal samples, position
+            end = position + len(mono)
+            if end > len(samples):
+                # Frame count in the header was short; grow the buffer
+                samples = np.resize(samples, max(end, 2 * len(samples)))
+            samples[position:end] = mono
+            position = end
+
+        for block in f.blocks(blocksize=blocksize, dtype='float32', always_2d=True):
+            append(resampler.process(block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]))
+        append(resampler.flush())
+    return samples[:position]
+
+
+def _decode_ffmpeg(path: str, sample_rate: int) -> np.ndarray:
+    """Decode any format ffmpeg understands straight to a PCM pipe, no temp file"""
+    command = [
+        'ffmpeg', '-nostdin', '-v', 'error', '-i', path,
+        '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate), 'pipe:1'
+    ]
+    result = subprocess.run(command, capture_output=True, check=True)
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def probe_audio(path: str) -> Dict[str, Any]:
+    """Read sample rate, channels and duration from the file header without decoding
+
+    Uses libsndfile's header parser, or ffprobe for formats it can't read;
+    ffprobe also stops at the container and stream headers. ``duration`` is
+    None when the header doesn't state it. Raises ValueError for files
+    without a readable audio stream.
+    """
+    try:
+        import soundfile as sf
+        info = sf.info(path)
+        return {
+            'sample_rate': info.samplerate,
+            'channels': info.channels,
+            'duration': info.duration,
+            'format': info.format
+        }
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.debug(f"soundfile could not read the header of {path}, trying ffprobe: {e}")
+
+    try:
+        result = subprocess.run([
+            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            '-show_format', '-show_streams', path
+        ], capture_output=True, text=True, check=True)
+        probe = json.loads(result.stdout)
+    except (subprocess.CalledProcessError, OSError, ValueError) as e:
+        raise ValueError(f"Unable to validate audio format: {e}")
+
+    streams = [s for s in probe.get('streams', []) if s.get('codec_type') == 'audio']
+    if not streams:
+        raise ValueError("No audio stream found in file.")
+    stream = streams[0]
+    duration = stream.get('duration') or probe.get('format', {}).get('duration')
+    return {
+        'sample_rate': int(stream.get('sample_rate', 0)),
+        'channels': int(stream.get('channels', 0)),
+        'duration': float(duration) if duration else None,
+        'format': probe.get('format', {}).get('format_name')
+    }
+
+
+def read_audio(path: str, block_seconds: float = 1.0) -> Tuple[np.ndarray, int, float]:
+    """Decode a file once to mono float32 at its native rate, measuring it on the way
+
+    Returns ``(samples, sample_rate, rms)``. With libsndfile the file is read
+    block by block into one preallocated buffer, mixing down and summing
+    energy per block, so no full multi-channel copy is ever held. Other
+    formats are decoded by ffmpeg at the header's sample rate.
+    """
+    try:
+        import soundfile as sf
+        with sf.SoundFile(path) as f:
+            sample_rate = f.samplerate
+            blocksize = max(1, int(block_seconds * sample_rate))
+            samples = np.empty(max(f.frames, 0), dtype=np.float32)
+            position = 0
+            sum_squares = 0.0
+            for block in f.blocks(blocksize=blocksize, dtype='float32', always_2d=True):
+                mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+                end = position + len(mono)
+                if end > len(samples):
+                    # Frame count in the header was short; grow the buffer
+                    samples = np.resize(samples, max(end, 2 * len(samples)))
+                samples[position:end] = mono
+                sum_squares += float(np.dot(mono, mono))
+                position = end
+        samples = samples[:position]
+        rms = float(np.sqrt(sum_squares / position)) if position else 0.0
+        return samples, sample_rate, rms
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.debug(f"soundfile could not decode {path}, trying ffmpeg: {e}")
+
+    sample_rate = probe_audio(path)['sample_rate'] or ASR_SAMPLE_RATE
+    try:
+        samples = _decode_ffmpeg(path, sample_rate)
+    except (subprocess.CalledProcessError, OSError) as e:
+        raise ValueError(f"Audio decoding failed: {e}")
+    rms = float(np.sqrt(np.dot(samples, samples) / len(samples))) if len(samples) else 0.0
+    return samples, sample_rate, rms
+
+
+@lru_cache(maxsize=32)
+def resample_kernel(orig_rate: int, target_rate: int) -> Tuple[int, int, np.ndarray]:
+    """Polyphase factors and anti-aliasing FIR for a rate pair, designed once per pair"""
+    from scipy.signal import firwin
+    divisor = gcd(orig_rate, target_rate)
+    up, down = target_rate // divisor, orig_rate // divisor
+    # The filter resample_poly designs by default
+    max_rate = max(up, down)
+    taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    taps.setflags(write=False)
+    return up, down, taps
+
+
+@lru_cache(maxsize=32)
+def highpass_sos(sample_rate: int, cutoff_hz: float, order: int = 2) -> np.ndarray:
+    """Butterworth high-pass as second-order sections, designed once per rate"""
+    from scipy.signal import butter
+    return butter(order, cutoff_hz, btype='highpass', fs=sample_rate, output='sos')
+
+
+def resample(samples: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """Polyphase resampling of a mono float32 signal"""
+    if orig_rate == target_rate:
+        return samples
+    from scipy.signal import resample_poly
+    up, down, taps = resample_kernel(orig_rate, target_rate)
+    return resample_poly(samples, up, down, window=taps).astype(np.float32)
+
+
+class StreamingResampler:
+    """Resamples a signal block by block, matching a single resample_poly call
+
+    Each block is filtered with enough buffered input on both sides to cover
+    the FIR, and block edges stay on multiples of the decimation factor so
+    output samples line up exactly. Memory is bounded by the block size.
+    Equal rates pass blocks through unchanged, as ``resample`` does.
+    """
+
+    def __init__(self, orig_rate: int, target_rate: int):
+        self.passthrough = orig_rate == target_rate
+        if self.passthrough:
+            return
+        self.up, self.down, self.taps = resample_kernel(orig_rate, target_rate)
+        half_len = (len(self.taps) - 1) // 2
+        context = -(-half_len // self.up) + 1
+        # Input context on each side, rounded up to a multiple of down
+        self.context = -(-context // self.down) * self.down
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0  # input index of _buffer[0]
+        self._position = 0      # first input index whose output is not yet emitted
+
+    def _emit(self, end: int, final: bool) -> np.ndarray:
+        from scipy.signal import resample_poly
+
+        segment_start = max(0, self._position - self.context)
+        segment_end = self._buffer_start + len(self._buffer) if final else end + self.context
+        segment = self._buffer[segment_start - self._buffer_start:segment_end - self._buffer_start]
+        output = resample_poly(segment, self.up, self.down, window=self.taps)
+
+        skip = (self._position - segment_start) * self.up // self.down
+        if final:
+            count = -(-(end - self._position) * self.up // self.down)
+        else:
+            count = (end - self._position) * self.up // self.down
+        return output[skip:skip + count].astype(np.float32)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Feed input samples; returns the output that is now fully determined"""
+        if self.passthrough:
+            return block.astype(np.float32, copy=False)
+        self._buffer = np.concatenate([self._buffer, block.astype(np.float32, copy=False)])
+        buffer_end = self._buffer_start + len(self._buffer)
+        end = (buffer_end - self.context) // self.down * self.down
+        if end <= self._position:
+            return np.zeros(0, dtype=np.float32)
+
+        output = self._emit(end, final=False)
+        self._position = end
+
+        # Keep only the context the next block needs
+        keep_from = max(0, self._position - self.context)
+        self._buffer = self._buffer[keep_from - self._buffer_start:]
+        self._buffer_start = keep_from
+        return output
+
+    def flush(self) -> np.ndarray:
+        """Return the remaining output once all input has been fed"""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        buffer_end = self._buffer_start + len(self._buffer)
+        if buffer_end <= self._position:
+            return np.zeros(0, dtype=np.float32)
+        output = self._emit(buffer_end, final=True)
+        self._position = buffer_end
+        return output
+
+
+def decode_audio(path: str, sample_rate: int = ASR_SAMPLE_RATE) -> np.ndarray:
+    """Decode an audio file to mono float32 samples at ``sample_rate``
+
+    Formats libsndfile reads (WAV, FLAC, OGG, MP3 on newer builds) are
+    decoded and resampled in-process block by block; anything else is piped
+    through ffmpeg. Raises ValueError if the file can't be decoded.
+    """
+    try:
+        return _decode_soundfile(path, sample_rate)
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.debug(f"soundfile could not decode {path}, trying ffmpeg: {e}")
+
+    try:
+        return _decode_ffmpeg(path, sample_rate)
+    except (subprocess.CalledProcessError, OSError) as e:
+        raise ValueError(f"Audio decoding failed: {e}")
+
+
+def to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float samples in [-1, 1] to 16-bit little-endian PCM"""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+
+def to_audio_data(samples: np.ndarray, sample_rate: int = ASR_SAMPLE_RATE):
+    """Wrap decoded samples as a speech_recognition AudioData"""
+    import speech_recognition as sr
+    return sr.AudioData(to_pcm16(samples), sample_rate, 2)
+
+
+def detect_speech_chunks(samples: np.ndarray, sample_rate: int = ASR_SAMPLE_RATE,
+                         max_chunk_seconds: float = 30.0, min_silence_seconds: float = 0.3,
+                         frame_seconds: float = 0.03, padding_seconds: float = 0.2):
+    """Energy-based voice activity detection that splits audio at silences
+
+    Returns ``(start, end)`` sample ranges covering the speech, each no
+    longer than ``max_chunk_seconds`` plus padding at silent ends. Cuts fall
+    in silent gaps where possible; unbroken speech longer than the limit is
+    split hard, without padding, so ranges never overlap.
+    """
+    frame = max(1, int(frame_seconds * sample_rate))
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return [(0, len(samples))] if len(samples) else []
+
+    frames = samples[:n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+
+    # Adaptive threshold between the noise floor and typical speech level
+    floor = np.percentile(rms, 10)
+    loud = np.percentile(rms, 90)
+    voiced = rms > max(floor + (loud - floor) * 0.15, 1e-4)
+    if not voiced.any():
+        return []
+
+    # Collect voiced regions, bridging pauses shorter than min_silence_seconds
+    min_gap = int(min_silence_seconds / frame_seconds)
+    regions = []
+    start = None
+    last_voiced = None
+    for i, is_voiced in enumerate(voiced):
+        if not is_voiced:
+            continue
+        if start is None:
+            start = i
+        elif i - last_voiced > min_gap:
+            regions.append((start, last_voiced + 1))
+            start = i
+        last_voiced = i
+    regions.append((start, last_voiced + 1))
+
+    # Pack regions into chunks that end in silence and respect the length limit
+    max_frames = max(1, int(max_chunk_seconds / frame_seconds))
+    pad = int(padding_seconds / frame_seconds)
+    chunks = []
+    chunk_start, chunk_end = regions[0]
+    for region_start, region_end in regions[1:]:
+        if region_end - chunk_start <= max_frames:
+            chunk_end = region_end
+        else:
+            chunks.append((chunk_start, chunk_end))
+            chunk_start, chunk_end = region_start, region_end
+    chunks.append((chunk_start, chunk_end))
+
+    # (start, end, start_is_silence, end_is_silence) in frames
+    pieces = []
+    for chunk_start, chunk_end in chunks:
+        for piece_start in range(chunk_start, chunk_end, max_frames):
+            piece_end = min(piece_start + max_frames, chunk_end)
+            pieces.append((piece_start, piece_end, piece_start == chunk_start, piece_end == chunk_end))
+
+    # Pad only at silences, and never past the middle of the gap to the next
+    # piece; hard splits stay exact so no audio is transcribed twice
+    ranges = []
+    for i, (piece_start, piece_end, start_is_silence, end_is_silence) in enumerate(pieces):
+        if start_is_silence:
+            limit = (pieces[i - 1][1] + piece_start) // 2 if i > 0 else 0
+            piece_start = max(limit, piece_start - pad)
+        if end_is_silence:
+            limit = (piece_end + pieces[i + 1][0]) // 2 if i + 1 < len(pieces) else n_frames + pad
+            piece_end = min(limit, piece_end + pad)
+        ranges.append((piece_start * frame, min(len(samples), piece_end * frame)))
+    return ranges
+
+
+def split_clips(samples: np.ndarray, sample_rate: int, min_seconds: float = 6.0,
+                max_seconds: float = 12.0):
+    """Cut a recording into clips of ``min_seconds`` to ``max_seconds`` at silences
+
+    Returns ``(start, end)`` sample ranges. Speech found by
+    detect_speech_chunks is packed into pieces no longer than the maximum;
+    pieces shorter than the minimum are dropped unless nothing else is left.
+    """
+    # Leave room for the padding detect_speech_chunks adds on both ends
+    ranges = detect_speech_chunks(samples, sample_rate, max_chunk_seconds=max_seconds - 0.4)
+    clips = [(start, end) for start, end in ranges if end - start >= min_seconds * sample_rate]
+    if not clips and ranges:
+        clips = [max(ranges, key=lambda r: r[1] - r[0])]
+    return clips
@@ -0,0 +1,177 @@
+"""
+Background Job Queue for AudioAlchemy
+Runs synthesis, transcription, translation and voice cloning off the request thread
+"""
+
+import os
+import uuid
+import threading
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+# Worker pool sizes: threads for I/O-bound providers, processes for torch backends
+JOB_THREAD_WORKERS = int(os.getenv('JOB_THREAD_WORKERS', '4'))
+JOB_PROCESS_WORKERS = int(os.getenv('JOB_PROCESS_WORKERS', '1'))
+
+# Number of finished jobs kept around for status queries
+JOB_HISTORY_LIMIT = int(os.getenv('JOB_HISTORY_LIMIT', '500'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class Job:
+    """A unit of background work and its outcome"""
+
+    def __init__(self, kind: str, metadata: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.metadata = metadata or {}
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'metadata': self.metadata,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """Bounded worker pools plus a registry of job states
+
+    Job functions always run on the thread pool. Work that needs its own
+    interpreter (torch inference) is handed to the process pool from inside
+    the job with ``run_in_process`` so both pools stay bounded. With a
+    ``store`` (``put_job``/``get_job``/``list_jobs``, e.g. ``storage.Storage``)
+    every state change is written through to it, so any worker process can
+    answer status queries; otherwise states live only in this process.
+    """
+
+    def __init__(self, max_threads: int = JOB_THREAD_WORKERS,
+                 max_processes: int = JOB_PROCESS_WORKERS,
+                 history_limit: int = JOB_HISTORY_LIMIT,
+                 store: Optional[Any] = None):
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.history_limit = history_limit
+        self.store = store
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = None
+        self._processes = None
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        # Pools are created lazily so importing this module never starts workers
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.max_threads,
+                                                   thread_name_prefix='job')
+            return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                # Spawn so children never inherit torch or thread state from the server
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.max_processes,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._processes
+
+    def submit(self, kind: str, func: Callable, *args,
+               metadata: Optional[Dict[str, Any]] = None, **kwargs) -> str:
+        """Queue ``func(*args, **kwargs)`` and return the new job id"""
+        job = Job(kind, metadata)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_locked()
+        self._save(job)
+
+        self._thread_pool().submit(self._run, job, func, args, kwargs)
+        return job.id
+
+    def run_in_process(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a picklable top-level function on the process pool and wait for it"""
+        return self._process_pool().submit(func, *args, **kwargs).result()
+
+    def _save(self, job: Job):
+        if self.store is None:
+            return
+        try:
+            self.store.put_job(job.to_dict())
+        except Exception as e:
+            # The job itself carries on; only other processes lose sight of it
+            logger.error(f"Could not store state of job {job.id}: {str(e)}")
+
+    def _run(self, job: Job, func: Callable, args, kwargs):
+        job.status = RUNNING
+        job.started_at = datetime.now().isoformat()
+        self._save(job)
+        try:
+            job.result = func(*args, **kwargs)
+            job.status = SUCCEEDED
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            self._save(job)
+
+    def _trim_locked(self):
+        """Forget the oldest finished jobs once the registry is over its limit"""
+        excess = len(self._jobs) - self.history_limit
+        if excess <= 0:
+            return
+        for job_id in list(self._jobs.keys()):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].status in (SUCCEEDED, FAILED):
+                del self._jobs[job_id]
+                excess -= 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the state of a job, which may have been submitted in another process"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return job.to_dict()
+        return self.store.get_job(job_id) if self.store is not None else None
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """List the most recent jobs, newest first"""
+        if self.store is not None:
+            return self.store.list_jobs(limit)
+        with self._lock:
+            jobs = list(self._jobs.values())[-limit:]
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            threads, processes = self._threads, self._processes
+            self._threads = self._processes = None
+        if threads:
+            threads.shutdown(wait=wait)
+        if processes:
+            processes.shutdown(wait=wait)
+
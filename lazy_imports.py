@@ -0,0 +1,107 @@
+"""
+Lazy Imports for AudioAlchemy
+Import-spec backend detection, timed on-demand imports and a startup import report
+"""
+
+import os
+import sys
+import time
+import threading
+import importlib
+import importlib.util
+import logging
+from typing import Dict, Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Skip the background warm-up of heavy modules; everything is imported on first use
+FAST_START = os.getenv('AUDIOALCHEMY_FAST_START', '0').lower() in ('1', 'true', 'yes')
+
+# Modules that dominate start-up time when imported eagerly
+HEAVY_MODULES = ('torch', 'torchaudio', 'TTS', 'tortoise', 'whisper', 'speech_recognition', 'elevenlabs')
+
+_import_seconds: Dict[str, float] = {}
+_startup_seconds: Dict[str, float] = {}
+_available: Dict[str, bool] = {}
+_lock = threading.Lock()
+
+
+def module_available(name: str) -> bool:
+    """Whether a package is installed, found from its import spec without importing it
+
+    Only the top-level package is looked up: resolving the spec of a
+    submodule would import its parent package.
+    """
+    top_level = name.split('.', 1)[0]
+    if top_level not in _available:
+        try:
+            _available[top_level] = importlib.util.find_spec(top_level) is not None
+        except (ImportError, ValueError):
+            _available[top_level] = False
+    return _available[top_level]
+
+
+def timed_import(name: str):
+    """Import a module, recording how long its first import took"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    record_import(name, time.perf_counter() - started)
+    return module
+
+
+def record_import(name: str, seconds: float):
+    """Record the duration of a first import done outside ``timed_import``"""
+    with _lock:
+        _import_seconds.setdefault(name, seconds)
+    logger.info(f"Imported {name} in {seconds * 1000:.0f} ms")
+
+
+def record_startup(phase: str, seconds: float):
+    """Record the duration of a start-up phase, such as importing the app module"""
+    with _lock:
+        _startup_seconds[phase] = seconds
+    logger.info(f"Startup phase {phase} took {seconds * 1000:.0f} ms")
+
+
+def prewarm(names: Iterable[str], delay: float = 0.0) -> Optional[threading.Thread]:
+    """Import installed modules in a background thread so first requests don't pay for them
+
+    Does nothing in fast-start mode.
+    """
+    if FAST_START:
+        return None
+
+    names = [name for name in names if module_available(name)]
+
+    def run():
+        if delay:
+            time.sleep(delay)
+        for name in names:
+            try:
+                timed_import(name)
+            except Exception as e:
+                logger.warning(f"Background import of {name} failed: {e}")
+
+    thread = threading.Thread(target=run, name='import-prewarm', daemon=True)
+    thread.start()
+    return thread
+
+
+def import_report() -> Dict[str, Any]:
+    """Start-up timings, lazy import timings and which heavy modules are loaded"""
+    with _lock:
+        imports = dict(_import_seconds)
+        startup = dict(_startup_seconds)
+    return {
+        'fast_start': FAST_START,
+        'startup_ms': {phase: round(seconds * 1000) for phase, seconds in startup.items()},
+        'imports_ms': {name: round(seconds * 1000) for name, seconds in imports.items()},
+        'heavy_modules': {
+            name: 'loaded' if name in sys.modules else ('available' if module_available(name) else 'missing')
+            for name in HEAVY_MODULES
+        }
+    }
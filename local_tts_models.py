@@ -6,130 +6,509 @@ Provides local voice cloning capabilities using Tortoise-TTS and Coqui TTS
 import os
 import json
 import uuid
-import torch
-import torchaudio
 import numpy as np
 from datetime import datetime
 from pathlib import Path
 import subprocess
 import logging
-from typing import Optional, Tuple, Dict, Any
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Any, Callable, Iterator, List, Union
+
+from lazy_imports import module_available, timed_import
+from provider_router import ProviderRequestError
+from audio_ingest import probe_audio, read_audio, resample, highpass_sos, split_clips, StreamingResampler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pretrained model names used by the Coqui backends
+COQUI_MODEL_NAME = "tts_models/multilingual/multi-dataset/your_tts"
+XTTS_MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+
+# Decoder tokens per streamed XTTS chunk; smaller values lower time-to-first-audio
+XTTS_STREAM_CHUNK_SIZE = int(os.getenv('XTTS_STREAM_CHUNK_SIZE', '20'))
+
+# Upper bound for the resident size of all pooled models (0 disables eviction)
+MODEL_MEMORY_BUDGET_MB = float(os.getenv('LOCAL_TTS_MODEL_BUDGET_MB', '8192'))
+
+# Voice samples are resampled to 22kHz (standard for most TTS models) and
+# high-passed as basic noise reduction
+PREPROCESS_SAMPLE_RATE = 22050
+PREPROCESS_HIGHPASS_HZ = 80
+
+# Block length for streaming preprocessing; bounds peak memory per file
+PREPROCESS_BLOCK_SECONDS = float(os.getenv('PREPROCESS_BLOCK_SECONDS', '10'))
+
+# Worker processes used by preprocess_batch
+PREPROCESS_WORKERS = int(os.getenv('PREPROCESS_WORKERS', str(os.cpu_count() or 1)))
+
+# Reference clips for conditioning: long recordings are cut at silences into
+# clips of this length, and at most CLONE_MAX_CLIPS are kept per voice
+CLONE_CLIP_MIN_SECONDS = float(os.getenv('CLONE_CLIP_MIN_SECONDS', '6'))
+CLONE_CLIP_MAX_SECONDS = float(os.getenv('CLONE_CLIP_MAX_SECONDS', '12'))
+CLONE_MAX_CLIPS = int(os.getenv('CLONE_MAX_CLIPS', '8'))
+
+
+def _estimate_model_bytes(model: Any) -> int:
+    """Estimate the memory held by a model from its parameters and buffers"""
+    import torch
+
+    modules = []
+    if isinstance(model, torch.nn.Module):
+        modules.append(model)
+    else:
+        # Tortoise's TextToSpeech is a plain object holding several nn.Modules
+        modules.extend(v for v in vars(model).values() if isinstance(v, torch.nn.Module))
+
+    total = 0
+    seen = set()
+    for module in modules:
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            if id(tensor) in seen:
+                continue
+            seen.add(id(tensor))
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class LocalVoiceError(ProviderRequestError):
+    """The voice doesn't exist or its backend can't serve the request"""
+
+
+class _PooledModel:
+    """A loaded model together with its bookkeeping"""
+
+    def __init__(self, model: Any, size_bytes: int):
+        self.model = model
+        self.size_bytes = size_bytes
+        self.lock = threading.RLock()
+        self.in_use = 0
+
+
+class ModelPool:
+    """Process-wide registry that loads each TTS model once and shares it
+
+    Models are kept in least-recently-used order and evicted once the
+    estimated total size exceeds the memory budget. Inference on a single
+    model is serialized because the TTS backends are not thread-safe, while
+    different models can run concurrently.
+    """
+
+    def __init__(self, memory_budget_mb: float = MODEL_MEMORY_BUDGET_MB):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._models: "OrderedDict[str, _PooledModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def _get_entry(self, key: str, loader: Callable[[], Any]) -> _PooledModel:
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                entry.in_use += 1
+                return entry
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available;
+        # the per-key lock makes concurrent callers wait for a single load
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    entry.in_use += 1
+                    return entry
+
+            logger.info(f"Loading TTS model: {key}")
+            model = loader()
+            entry = _PooledModel(model, _estimate_model_bytes(model))
+
+            with self._lock:
+                self._models[key] = entry
+                entry.in_use += 1
+                self._evict_locked()
+
+            logger.info(f"TTS model loaded: {key} ({entry.size_bytes / 1024 / 1024:.0f} MB)")
+            return entry
+
+    def _release(self, entry: _PooledModel):
+        with self._lock:
+            entry.in_use -= 1
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """Evict idle models in LRU order until the pool fits the budget"""
+        if self.memory_budget <= 0:
+            return
+
+        total = sum(e.size_bytes for e in self._models.values())
+        evicted = False
+        for key in list(self._models.keys()):
+            if total <= self.memory_budget:
+                break
+            entry = self._models[key]
+            if entry.in_use > 0:
+                continue
+            del self._models[key]
+            total -= entry.size_bytes
+            evicted = True
+            logger.info(f"Evicted TTS model from pool: {key}")
+
+        if evicted:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    @contextmanager
+    def acquire(self, key: str, loader: Callable[[], Any]):
+        """Yield the model for ``key``, loading it with ``loader`` on first use"""
+        entry = self._get_entry(key, loader)
+        try:
+            with entry.lock:
+                yield entry.model
+        finally:
+            self._release(entry)
+
+    def warm(self, key: str, loader: Callable[[], Any]) -> None:
+        """Make sure a model is loaded without running anything on it"""
+        self._release(self._get_entry(key, loader))
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize the models currently held by the pool"""
+        with self._lock:
+            return {
+                'memory_budget_bytes': self.memory_budget,
+                'resident_bytes': sum(e.size_bytes for e in self._models.values()),
+                'models': [
+                    {'key': key, 'size_bytes': e.size_bytes, 'in_use': e.in_use}
+                    for key, e in self._models.items()
+                ]
+            }
+
+
+def _load_coqui_model(model_name: str):
+    CoquiTTS = timed_import('TTS.api').TTS
+    return CoquiTTS(model_name=model_name, progress_bar=False)
+
+
+def _load_tortoise_model():
+    TextToSpeech = timed_import('tortoise.api').TextToSpeech
+    return TextToSpeech()
+
+
+# Shared by every LocalVoiceCloner in the process
+model_pool = ModelPool()
+
+
+class VoiceIndex:
+    """In-memory index of the voice_info.json files under the models directory
+
+    Lookups are dictionary hits. The models directory's mtime acts as the
+    change marker: it moves whenever a voice directory is added or removed,
+    and ``put`` bumps it after writing metadata, so other processes pick up
+    changes on their next lookup. A change only costs a directory listing
+    plus parsing the voices that are new.
+    """
+
+    def __init__(self, models_dir: Path):
+        self.models_dir = models_dir
+        self._voices: Dict[str, Dict] = {}
+        self._order: Optional[List[str]] = None
+        self._mtime_ns = None
+        self._lock = threading.Lock()
+
+    def _read(self, voice_id: str) -> Optional[Dict]:
+        try:
+            with open(self.models_dir / voice_id / "voice_info.json", 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Directory created but metadata not written yet
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load voice info for {voice_id}: {e}")
+            return None
+
+    def _sync(self):
+        """Bring the index up to date if the directory changed since the last sync"""
+        try:
+            mtime_ns = self.models_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if mtime_ns == self._mtime_ns:
+            return
+
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return
+            names = set()
+            if mtime_ns is not None:
+                with os.scandir(self.models_dir) as entries:
+                    names = {e.name for e in entries if e.is_dir() and not e.name.startswith('.')}
+            for voice_id in list(self._voices):
+                if voice_id not in names:
+                    del self._voices[voice_id]
+            for voice_id in names - self._voices.keys():
+                voice_info = self._read(voice_id)
+                if voice_info is not None:
+                    self._voices[voice_id] = voice_info
+            self._mtime_ns = mtime_ns
+            self._order = None
+
+    def get(self, voice_id: str) -> Optional[Dict]:
+        self._sync()
+        voice_info = self._voices.get(voice_id)
+        return dict(voice_info) if voice_info is not None else None
+
+    def put(self, voice_info: Dict):
+        """Write a voice's metadata and add it to the index"""
+        voice_dir = self.models_dir / voice_info['id']
+        temp_path = voice_dir / f".voice_info.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(voice_info, f, indent=2)
+        os.replace(temp_path, voice_dir / "voice_info.json")
+
+        with self._lock:
+            self._voices[voice_info['id']] = dict(voice_info)
+            self._order = None
+        # Tell other processes' indexes to look again
+        os.utime(self.models_dir)
+
+    def remove(self, voice_id: str):
+        with self._lock:
+            if self._voices.pop(voice_id, None) is not None:
+                self._order = None
+
+    def count(self) -> int:
+        self._sync()
+        return len(self._voices)
+
+    def list(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Voices newest first"""
+        self._sync()
+        with self._lock:
+            if self._order is None:
+                self._order = sorted(
+                    self._voices,
+                    key=lambda voice_id: (self._voices[voice_id].get('created_at', ''), voice_id),
+                    reverse=True
+                )
+            page = self._order[offset:offset + limit] if limit is not None else self._order[offset:]
+            return [dict(self._voices[voice_id]) for voice_id in page]
+
 class LocalVoiceCloner:
     """Local voice cloning implementation using multiple TTS backends"""
     
-    def __init__(self, models_dir: str = "voice_models", cache_dir: str = "tts_cache"):
+    def __init__(self, models_dir: str = "voice_models", cache_dir: str = "tts_cache",
+                 pool: Optional[ModelPool] = None):
         self.models_dir = Path(models_dir)
         self.cache_dir = Path(cache_dir)
         self.models_dir.mkdir(exist_ok=True)
         self.cache_dir.mkdir(exist_ok=True)
+        self.model_pool = pool or model_pool
+        self.voice_index = VoiceIndex(self.models_dir)
         
         # Initialize available backends
         self.backends = self._detect_available_backends()
         logger.info(f"Available TTS backends: {list(self.backends.keys())}")
         
     def _detect_available_backends(self) -> Dict[str, bool]:
-        """Detect which TTS backends are available"""
+        """Detect which TTS backends are installed without importing them"""
         backends = {}
+        torch_available = module_available('torch') and module_available('torchaudio')
+        if not torch_available:
+            logger.warning("PyTorch not available - local TTS backends disabled")
         
         # Check for Tortoise-TTS
-        try:
-            import tortoise
-            backends['tortoise'] = True
+        backends['tortoise'] = torch_available and module_available('tortoise')
+        if backends['tortoise']:
             logger.info("Tortoise-TTS backend available")
-        except ImportError:
-            backends['tortoise'] = False
+        else:
             logger.warning("Tortoise-TTS not available - install with: pip install tortoise-tts")
         
-        # Check for Coqui TTS
-        try:
-            import TTS
-            backends['coqui'] = True
-            logger.info("Coqui TTS backend available")
-        except ImportError:
-            backends['coqui'] = False
+        # Check for Coqui TTS; XTTS ships in the same package
+        backends['coqui'] = torch_available and module_available('TTS')
+        backends['xtts'] = backends['coqui']
+        if backends['coqui']:
+            logger.info("Coqui TTS and XTTS backends available")
+        else:
             logger.warning("Coqui TTS not available - install with: pip install TTS")
         
-        # Check for XTTS (part of Coqui)
-        try:
-            from TTS.api import TTS as CoquiTTS
-            # Try to load XTTS model
-            backends['xtts'] = True
-            logger.info("XTTS backend available")
-        except (ImportError, Exception):
-            backends['xtts'] = False
-            logger.warning("XTTS not available")
-        
         return backends
     
-    def validate_audio_sample(self, audio_path: str) -> Tuple[bool, str, Dict[str, Any]]:
-        """Validate audio sample for voice cloning"""
+    def _model(self, backend: str):
+        """Borrow the pooled model for a backend"""
+        if backend == 'xtts':
+            return self.model_pool.acquire('xtts', lambda: _load_coqui_model(XTTS_MODEL_NAME))
+        if backend == 'coqui':
+            return self.model_pool.acquire('coqui', lambda: _load_coqui_model(COQUI_MODEL_NAME))
+        if backend == 'tortoise':
+            return self.model_pool.acquire('tortoise', _load_tortoise_model)
+        raise ValueError(f"Unsupported backend: {backend}")
+    
+    def warm_backend(self, backend: str) -> None:
+        """Load a backend's model into the pool ahead of the first request"""
+        with self._model(backend):
+            pass
+    
+    def _save_conditioning(self, voice_dir: Path, tensors: Dict[str, Any]) -> Dict[str, str]:
+        """Store conditioning tensors as .npy files next to voice_info.json"""
+        import torch
+        
+        conditioning_dir = voice_dir / "conditioning"
+        conditioning_dir.mkdir(exist_ok=True)
+        
+        paths = {}
+        for name, tensor in tensors.items():
+            if isinstance(tensor, torch.Tensor):
+                array = tensor.detach().cpu().float().numpy()
+            else:
+                array = np.asarray(tensor, dtype=np.float32)
+            path = conditioning_dir / f"{name}.npy"
+            np.save(path, array)
+            paths[name] = str(path)
+        return paths
+    
+    def _load_conditioning(self, voice_info: Dict, device: Any = None) -> Optional[Dict[str, Any]]:
+        """Load precomputed conditioning tensors, or None if any are missing"""
+        import torch
+        
+        paths = voice_info.get('conditioning')
+        if not paths:
+            return None
+        
+        tensors = {}
+        for name, path in paths.items():
+            if not os.path.exists(path):
+                return None
+            # Memory-map the file; torch.tensor copies it into a writable buffer
+            tensor = torch.tensor(np.load(path, mmap_mode='r'))
+            tensors[name] = tensor.to(device) if device is not None else tensor
+        return tensors
+    
+    def _compute_xtts_conditioning(self, audio_paths: list) -> Dict[str, Any]:
+        """Compute XTTS GPT conditioning latents and speaker embedding"""
+        with self._model('xtts') as tts:
+            gpt_cond_latent, speaker_embedding = tts.synthesizer.tts_model.get_conditioning_latents(
+                audio_path=audio_paths
+            )
+        return {'gpt_cond_latent': gpt_cond_latent, 'speaker_embedding': speaker_embedding}
+    
+    def _compute_coqui_conditioning(self, audio_paths: list) -> Dict[str, Any]:
+        """Compute the YourTTS speaker embedding (d-vector), averaged over the clips"""
+        with self._model('coqui') as tts:
+            speaker_manager = tts.synthesizer.tts_model.speaker_manager
+            speaker_embedding = speaker_manager.compute_embedding_from_clip(audio_paths)
+        return {'speaker_embedding': speaker_embedding}
+    
+    def _compute_tortoise_conditioning(self, audio_paths: list) -> Dict[str, Any]:
+        """Compute Tortoise autoregressive and diffusion conditioning latents"""
+        load_audio = timed_import('tortoise.utils.audio').load_audio
+        voice_samples = [load_audio(path, 22050) for path in audio_paths]
+        with self._model('tortoise') as tts:
+            auto_conditioning, diffusion_conditioning = tts.get_conditioning_latents(voice_samples)
+        return {'auto_conditioning': auto_conditioning, 'diffusion_conditioning': diffusion_conditioning}
+    
+    @staticmethod
+    def _clip_paths(voice_info: Dict) -> List[str]:
+        """Reference clips of a voice; voices created before multi-clip support have one"""
+        return voice_info.get('clip_paths') or [voice_info['audio_path']]
+    
+    def ingest_audio_sample(self, audio_path: str,
+                            min_seconds: float = 10.0) -> Tuple[bool, str, Dict[str, Any], Optional[np.ndarray]]:
+        """Validate a voice sample and decode it once for preprocessing
+        
+        Header checks reject bad files before anything is decoded. The
+        sample is then decoded in a single pass that also measures its
+        level, and the mono buffer is returned for preprocess_audio.
+        """
         try:
-            # Load audio file
-            waveform, sample_rate = torchaudio.load(audio_path)
+            # Header-only checks
+            header = probe_audio(audio_path)
+            if header['duration'] is not None:
+                if header['duration'] < min_seconds:
+                    return False, f"Audio too short: {header['duration']:.1f}s (minimum {min_seconds:.0f}s required)", {}, None
+                if header['duration'] > 300.0:  # 5 minutes
+                    return False, f"Audio too long: {header['duration']:.1f}s (maximum 300s allowed)", {}, None
+            if header['sample_rate'] < 16000:
+                return False, f"Sample rate too low: {header['sample_rate']}Hz (minimum 16kHz required)", {}, None
             
-            # Get audio info
-            duration = waveform.shape[1] / sample_rate
-            channels = waveform.shape[0]
+            # Decode once, measuring level on the way
+            samples, sample_rate, rms = read_audio(audio_path)
+            duration = len(samples) / sample_rate
             
-            # Validation checks
-            if duration < 10.0:
-                return False, f"Audio too short: {duration:.1f}s (minimum 10s required)", {}
+            # Validation checks for headers that don't state a duration
+            if duration < min_seconds:
+                return False, f"Audio too short: {duration:.1f}s (minimum {min_seconds:.0f}s required)", {}, None
             
             if duration > 300.0:  # 5 minutes
-                return False, f"Audio too long: {duration:.1f}s (maximum 300s allowed)", {}
-            
-            if sample_rate < 16000:
-                return False, f"Sample rate too low: {sample_rate}Hz (minimum 16kHz required)", {}
+                return False, f"Audio too long: {duration:.1f}s (maximum 300s allowed)", {}, None
             
             # Check for silence
-            rms = torch.sqrt(torch.mean(waveform**2))
             if rms < 0.01:
-                return False, "Audio appears to be mostly silent", {}
+                return False, "Audio appears to be mostly silent", {}, None
             
             # Audio quality metrics
             audio_info = {
                 'duration': duration,
                 'sample_rate': sample_rate,
-                'channels': channels,
-                'rms_level': float(rms),
+                'channels': header['channels'],
+                'rms_level': rms,
                 'file_size': os.path.getsize(audio_path)
             }
             
-            return True, "Audio sample validated successfully", audio_info
+            return True, "Audio sample validated successfully", audio_info, samples
             
         except Exception as e:
-            return False, f"Audio validation error: {str(e)}", {}
+            return False, f"Audio validation error: {str(e)}", {}, None
     
-    def preprocess_audio(self, input_path: str, output_path: str) -> bool:
-        """Preprocess audio for voice cloning"""
+    def validate_audio_sample(self, audio_path: str) -> Tuple[bool, str, Dict[str, Any]]:
+        """Validate audio sample for voice cloning"""
+        is_valid, message, audio_info, _ = self.ingest_audio_sample(audio_path)
+        return is_valid, message, audio_info
+    
+    def preprocess_audio(self, input_path: str, output_path: str,
+                         decoded: Optional[Tuple[np.ndarray, int]] = None,
+                         streaming: bool = False) -> bool:
+        """Preprocess audio for voice cloning
+        
+        ``decoded`` is an already decoded ``(mono samples, sample_rate)``
+        buffer from ingest_audio_sample; without it the file is loaded, or
+        with ``streaming`` processed block by block in bounded memory.
+        """
         try:
-            # Load audio
-            waveform, sample_rate = torchaudio.load(input_path)
+            if decoded is None and streaming:
+                try:
+                    return self._preprocess_streaming(input_path, output_path)
+                except (ImportError, RuntimeError) as e:
+                    # libsndfile can't read this format; decode it whole instead
+                    logger.debug(f"Streaming preprocessing unavailable for {input_path}: {e}")
             
-            # Convert to mono if stereo
-            if waveform.shape[0] > 1:
-                waveform = torch.mean(waveform, dim=0, keepdim=True)
+            from scipy.signal import sosfilt
+            import soundfile as sf
             
-            # Resample to 22kHz (standard for most TTS models)
-            if sample_rate != 22050:
-                resampler = torchaudio.transforms.Resample(sample_rate, 22050)
-                waveform = resampler(waveform)
-                sample_rate = 22050
+            if decoded is not None:
+                samples, sample_rate = decoded
+            else:
+                # Load audio (mixed down to mono)
+                samples, sample_rate, _ = read_audio(input_path)
+            
+            # Resample to 22kHz with a cached polyphase kernel
+            waveform = resample(np.asarray(samples, dtype=np.float32), sample_rate, PREPROCESS_SAMPLE_RATE)
             
             # Normalize audio
-            waveform = waveform / torch.max(torch.abs(waveform))
+            peak = float(np.max(np.abs(waveform))) if len(waveform) else 0.0
+            if peak > 0:
+                waveform = waveform / peak
             
             # Apply basic noise reduction (simple high-pass filter)
-            highpass = torchaudio.transforms.HighpassBiquad(sample_rate, cutoff_freq=80)
-            waveform = highpass(waveform)
+            waveform = sosfilt(highpass_sos(PREPROCESS_SAMPLE_RATE, PREPROCESS_HIGHPASS_HZ), waveform)
             
             # Save preprocessed audio
-            torchaudio.save(output_path, waveform, sample_rate)
+            sf.write(output_path, waveform.astype(np.float32), PREPROCESS_SAMPLE_RATE, subtype='FLOAT')
             
             logger.info(f"Audio preprocessed: {input_path} -> {output_path}")
             return True
@@ -138,31 +517,135 @@ class LocalVoiceCloner:
             logger.error(f"Audio preprocessing failed: {str(e)}")
             return False
     
-    def create_voice_clone_tortoise(self, name: str, description: str, audio_path: str) -> Tuple[Optional[str], str]:
+    def _preprocess_streaming(self, input_path: str, output_path: str) -> bool:
+        """Resample and filter block by block, then normalize the written file in place
+        
+        Filtering is linear, so scaling the filtered output by the resampled
+        signal's peak gives the same result as normalizing before the filter.
+        """
+        from scipy.signal import sosfilt
+        import soundfile as sf
+        
+        sos = highpass_sos(PREPROCESS_SAMPLE_RATE, PREPROCESS_HIGHPASS_HZ)
+        state = np.zeros((sos.shape[0], 2))
+        peak = 0.0
+        
+        with sf.SoundFile(input_path) as source:
+            resampler = StreamingResampler(source.samplerate, PREPROCESS_SAMPLE_RATE)
+            blocksize = max(1, int(PREPROCESS_BLOCK_SECONDS * source.samplerate))
+            with sf.SoundFile(output_path, 'w', samplerate=PREPROCESS_SAMPLE_RATE, channels=1,
+                              format='WAV', subtype='FLOAT') as sink:
+                def write(block):
+                    nonlocal peak, state
+                    if not len(block):
+                        return
+                    peak = max(peak, float(np.max(np.abs(block))))
+                    filtered, state = sosfilt(sos, block, zi=state)
+                    sink.write(filtered.astype(np.float32))
+                
+                for block in source.blocks(blocksize=blocksize, dtype='float32', always_2d=True):
+                    write(resampler.process(block.mean(axis=1)))
+                write(resampler.flush())
+        
+        # Second pass over the output: normalize
+        if peak > 0:
+            blocksize = max(1, int(PREPROCESS_BLOCK_SECONDS * PREPROCESS_SAMPLE_RATE))
+            with sf.SoundFile(output_path, 'r+') as sink:
+                position = 0
+                while True:
+                    sink.seek(position)
+                    block = sink.read(blocksize, dtype='float32')
+                    if not len(block):
+                        break
+                    sink.seek(position)
+                    sink.write(block / peak)
+                    position += len(block)
+        
+        logger.info(f"Audio preprocessed (streaming): {input_path} -> {output_path}")
+        return True
+    
+    def preprocess_batch(self, items: List[Tuple[str, str]], max_workers: Optional[int] = None,
+                         streaming: bool = True) -> List[bool]:
+        """Preprocess many ``(input_path, output_path)`` pairs across worker processes"""
+        workers = max(1, min(len(items), max_workers or PREPROCESS_WORKERS))
+        if workers == 1:
+            return [self.preprocess_audio(src, dst, streaming=streaming) for src, dst in items]
+        
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(
+                preprocess_in_worker,
+                [src for src, _ in items],
+                [dst for _, dst in items],
+                [streaming] * len(items)
+            ))
+    
+    def _select_clips(self, decoded: List[Tuple[np.ndarray, int]]) -> List[Tuple[np.ndarray, int]]:
+        """Cut decoded uploads into a bounded set of reference clips"""
+        clips = []
+        for samples, sample_rate in decoded:
+            if len(samples) <= CLONE_CLIP_MAX_SECONDS * sample_rate:
+                clips.append((samples, sample_rate))
+                continue
+            for start, end in split_clips(samples, sample_rate, CLONE_CLIP_MIN_SECONDS, CLONE_CLIP_MAX_SECONDS):
+                clips.append((samples[start:end], sample_rate))
+        
+        if len(clips) > CLONE_MAX_CLIPS:
+            # Keep the longest clips, in recording order
+            longest = sorted(range(len(clips)), key=lambda i: len(clips[i][0]) / clips[i][1], reverse=True)
+            clips = [clips[i] for i in sorted(longest[:CLONE_MAX_CLIPS])]
+        return clips
+    
+    def _write_clips(self, voice_dir: Path, audio_path: str,
+                     clips: Optional[List[Tuple[np.ndarray, int]]]) -> List[str]:
+        """Preprocess reference clips in parallel into the voice's samples directory
+
+        Without decoded clips the recording is streamed from disk in blocks.
+        """
+        samples_dir = voice_dir / "samples"
+        samples_dir.mkdir(exist_ok=True)
+        if clips is None:
+            path = str(samples_dir / "sample_0.wav")
+            return [path] if self.preprocess_audio(audio_path, path, streaming=True) else []
+        
+        paths = [str(samples_dir / f"sample_{i}.wav") for i in range(len(clips))]
+        
+        # scipy's resampling and filtering release the GIL, so threads scale here
+        workers = max(1, min(len(clips), PREPROCESS_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='clip-preprocess') as executor:
+            results = list(executor.map(
+                lambda item: self.preprocess_audio(audio_path, item[0], item[1]),
+                zip(paths, clips)
+            ))
+        return [path for path, ok in zip(paths, results) if ok]
+    
+    def create_voice_clone_tortoise(self, name: str, description: str, audio_path: str,
+                                    clips: Optional[List[Tuple[np.ndarray, int]]] = None) -> Tuple[Optional[str], str]:
         """Create voice clone using Tortoise-TTS"""
         if not self.backends.get('tortoise', False):
             return None, "Tortoise-TTS backend not available"
         
         try:
-            from tortoise.api import TextToSpeech
-            from tortoise.utils.audio import load_voices
-            
             voice_id = f"tortoise_{uuid.uuid4().hex[:12]}"
             voice_dir = self.models_dir / voice_id
             voice_dir.mkdir(exist_ok=True)
             
-            # Preprocess audio
-            processed_audio = voice_dir / "voice_sample.wav"
-            if not self.preprocess_audio(audio_path, str(processed_audio)):
+            # Preprocess reference clips into the samples directory
+            clip_paths = self._write_clips(voice_dir, audio_path, clips)
+            if not clip_paths:
                 return None, "Audio preprocessing failed"
             
-            # Create voice directory structure for Tortoise
-            voice_samples_dir = voice_dir / "samples"
-            voice_samples_dir.mkdir(exist_ok=True)
-            
-            # Copy processed audio to samples directory
-            import shutil
-            shutil.copy(str(processed_audio), str(voice_samples_dir / "sample_0.wav"))
+            # Compute conditioning latents once so synthesis skips the clips
+            try:
+                conditioning = self._save_conditioning(
+                    voice_dir, self._compute_tortoise_conditioning(clip_paths)
+                )
+            except Exception as e:
+                logger.warning(f"Could not precompute Tortoise conditioning latents: {e}")
+                conditioning = None
             
             # Create voice metadata
             voice_info = {
@@ -171,41 +654,47 @@ class LocalVoiceCloner:
                 'description': description,
                 'backend': 'tortoise',
                 'created_at': datetime.now().isoformat(),
-                'audio_path': str(processed_audio),
-                'samples_dir': str(voice_samples_dir),
+                'audio_path': clip_paths[0],
+                'clip_paths': clip_paths,
+                'samples_dir': str(voice_dir / "samples"),
+                'conditioning': conditioning,
                 'status': 'ready'
             }
             
             # Save voice metadata
-            with open(voice_dir / "voice_info.json", 'w') as f:
-                json.dump(voice_info, f, indent=2)
+            self.voice_index.put(voice_info)
             
-            logger.info(f"Tortoise voice clone created: {voice_id}")
+            logger.info(f"Tortoise voice clone created: {voice_id} ({len(clip_paths)} clips)")
             return voice_id, "Voice clone created successfully with Tortoise-TTS"
             
         except Exception as e:
             logger.error(f"Tortoise voice cloning failed: {str(e)}")
             return None, f"Tortoise voice cloning error: {str(e)}"
     
-    def create_voice_clone_coqui(self, name: str, description: str, audio_path: str) -> Tuple[Optional[str], str]:
+    def create_voice_clone_coqui(self, name: str, description: str, audio_path: str,
+                                 clips: Optional[List[Tuple[np.ndarray, int]]] = None) -> Tuple[Optional[str], str]:
         """Create voice clone using Coqui TTS"""
         if not self.backends.get('coqui', False):
             return None, "Coqui TTS backend not available"
         
         try:
-            from TTS.api import TTS as CoquiTTS
-            
             voice_id = f"coqui_{uuid.uuid4().hex[:12]}"
             voice_dir = self.models_dir / voice_id
             voice_dir.mkdir(exist_ok=True)
             
-            # Preprocess audio
-            processed_audio = voice_dir / "voice_sample.wav"
-            if not self.preprocess_audio(audio_path, str(processed_audio)):
+            # Preprocess reference clips
+            clip_paths = self._write_clips(voice_dir, audio_path, clips)
+            if not clip_paths:
                 return None, "Audio preprocessing failed"
             
-            # Initialize Coqui TTS with a voice cloning model
-            tts = CoquiTTS(model_name="tts_models/multilingual/multi-dataset/your_tts", progress_bar=False)
+            # Compute the speaker embedding once so synthesis can skip the WAVs
+            try:
+                conditioning = self._save_conditioning(
+                    voice_dir, self._compute_coqui_conditioning(clip_paths)
+                )
+            except Exception as e:
+                logger.warning(f"Could not precompute Coqui speaker embedding: {e}")
+                conditioning = None
             
             # Create voice metadata
             voice_info = {
@@ -214,41 +703,47 @@ class LocalVoiceCloner:
                 'description': description,
                 'backend': 'coqui',
                 'created_at': datetime.now().isoformat(),
-                'audio_path': str(processed_audio),
+                'audio_path': clip_paths[0],
+                'clip_paths': clip_paths,
                 'model_path': str(voice_dir),
+                'conditioning': conditioning,
                 'status': 'ready'
             }
             
             # Save voice metadata
-            with open(voice_dir / "voice_info.json", 'w') as f:
-                json.dump(voice_info, f, indent=2)
+            self.voice_index.put(voice_info)
             
-            logger.info(f"Coqui voice clone created: {voice_id}")
+            logger.info(f"Coqui voice clone created: {voice_id} ({len(clip_paths)} clips)")
             return voice_id, "Voice clone created successfully with Coqui TTS"
             
         except Exception as e:
             logger.error(f"Coqui voice cloning failed: {str(e)}")
             return None, f"Coqui voice cloning error: {str(e)}"
     
-    def create_voice_clone_xtts(self, name: str, description: str, audio_path: str) -> Tuple[Optional[str], str]:
+    def create_voice_clone_xtts(self, name: str, description: str, audio_path: str,
+                                clips: Optional[List[Tuple[np.ndarray, int]]] = None) -> Tuple[Optional[str], str]:
         """Create voice clone using XTTS (Coqui's advanced model)"""
         if not self.backends.get('xtts', False):
             return None, "XTTS backend not available"
         
         try:
-            from TTS.api import TTS as CoquiTTS
-            
             voice_id = f"xtts_{uuid.uuid4().hex[:12]}"
             voice_dir = self.models_dir / voice_id
             voice_dir.mkdir(exist_ok=True)
             
-            # Preprocess audio
-            processed_audio = voice_dir / "voice_sample.wav"
-            if not self.preprocess_audio(audio_path, str(processed_audio)):
+            # Preprocess reference clips
+            clip_paths = self._write_clips(voice_dir, audio_path, clips)
+            if not clip_paths:
                 return None, "Audio preprocessing failed"
             
-            # Initialize XTTS model
-            tts = CoquiTTS("tts_models/multilingual/multi-dataset/xtts_v2", progress_bar=False)
+            # Compute speaker conditioning once so synthesis can skip the WAVs
+            try:
+                conditioning = self._save_conditioning(
+                    voice_dir, self._compute_xtts_conditioning(clip_paths)
+                )
+            except Exception as e:
+                logger.warning(f"Could not precompute XTTS conditioning latents: {e}")
+                conditioning = None
             
             # Create voice metadata
             voice_info = {
@@ -257,30 +752,53 @@ class LocalVoiceCloner:
                 'description': description,
                 'backend': 'xtts',
                 'created_at': datetime.now().isoformat(),
-                'audio_path': str(processed_audio),
+                'audio_path': clip_paths[0],
+                'clip_paths': clip_paths,
                 'model_path': str(voice_dir),
+                'conditioning': conditioning,
                 'status': 'ready'
             }
             
             # Save voice metadata
-            with open(voice_dir / "voice_info.json", 'w') as f:
-                json.dump(voice_info, f, indent=2)
+            self.voice_index.put(voice_info)
             
-            logger.info(f"XTTS voice clone created: {voice_id}")
+            logger.info(f"XTTS voice clone created: {voice_id} ({len(clip_paths)} clips)")
             return voice_id, "Voice clone created successfully with XTTS"
             
         except Exception as e:
             logger.error(f"XTTS voice cloning failed: {str(e)}")
             return None, f"XTTS voice cloning error: {str(e)}"
     
-    def create_voice_clone(self, name: str, description: str, audio_path: str, 
+    def create_voice_clone(self, name: str, description: str, audio_path: Union[str, List[str]],
                           preferred_backend: str = 'auto') -> Tuple[Optional[str], str]:
-        """Create voice clone using the best available backend"""
+        """Create voice clone using the best available backend
         
-        # Validate audio first
-        is_valid, message, audio_info = self.validate_audio_sample(audio_path)
-        if not is_valid:
-            return None, message
+        ``audio_path`` is one recording or a list of uploads. Recordings
+        longer than CLONE_CLIP_MAX_SECONDS are cut into clips at silences.
+        """
+        audio_paths = [audio_path] if isinstance(audio_path, str) else list(audio_path)
+        if not audio_paths:
+            return None, "No audio sample provided"
+        
+        # Validate and decode every upload once, in parallel; with several
+        # uploads the 10 second minimum applies to their total
+        min_seconds = 10.0 if len(audio_paths) == 1 else 3.0
+        with ThreadPoolExecutor(max_workers=min(len(audio_paths), PREPROCESS_WORKERS) or 1) as executor:
+            ingested = list(executor.map(lambda path: self.ingest_audio_sample(path, min_seconds), audio_paths))
+        
+        decoded = []
+        for path, (is_valid, message, audio_info, samples) in zip(audio_paths, ingested):
+            if not is_valid:
+                return None, message if len(audio_paths) == 1 else f"{os.path.basename(path)}: {message}"
+            decoded.append((samples, audio_info['sample_rate']))
+        
+        total_seconds = sum(len(samples) / sample_rate for samples, sample_rate in decoded)
+        if total_seconds < 10.0:
+            return None, f"Audio too short: {total_seconds:.1f}s in total (minimum 10s required)"
+        
+        clips = self._select_clips(decoded)
+        if not clips:
+            return None, "No speech found in the audio sample"
         
         # Determine backend to use
         if preferred_backend == 'auto':
@@ -296,11 +814,11 @@ class LocalVoiceCloner:
         
         # Create voice clone with selected backend
         if preferred_backend == 'xtts':
-            return self.create_voice_clone_xtts(name, description, audio_path)
+            return self.create_voice_clone_xtts(name, description, audio_paths[0], clips)
         elif preferred_backend == 'coqui':
-            return self.create_voice_clone_coqui(name, description, audio_path)
+            return self.create_voice_clone_coqui(name, description, audio_paths[0], clips)
         elif preferred_backend == 'tortoise':
-            return self.create_voice_clone_tortoise(name, description, audio_path)
+            return self.create_voice_clone_tortoise(name, description, audio_paths[0], clips)
         else:
             return None, f"Unsupported backend: {preferred_backend}"
     
@@ -308,15 +826,10 @@ class LocalVoiceCloner:
         """Synthesize speech using a cloned voice"""
         try:
             # Load voice metadata
-            voice_dir = self.models_dir / voice_id
-            voice_info_path = voice_dir / "voice_info.json"
-            
-            if not voice_info_path.exists():
+            voice_info = self.voice_index.get(voice_id)
+            if not voice_info:
                 return False, f"Voice {voice_id} not found"
             
-            with open(voice_info_path, 'r') as f:
-                voice_info = json.load(f)
-            
             backend = voice_info['backend']
             
             if backend == 'tortoise':
@@ -332,26 +845,124 @@ class LocalVoiceCloner:
             logger.error(f"Speech synthesis failed: {str(e)}")
             return False, f"Speech synthesis error: {str(e)}"
     
-    def _synthesize_tortoise(self, text: str, voice_info: Dict, output_path: str) -> Tuple[bool, str]:
-        """Synthesize speech using Tortoise-TTS"""
+    def synthesize_speech_batch(self, voice_id: str, items: List[Tuple[str, str]]) -> List[Tuple[bool, str]]:
+        """Synthesize ``(text, output_path)`` items with one voice
+        
+        The voice metadata, pooled model and speaker conditioning are loaded
+        once for the whole batch. The model stays borrowed until the batch
+        finishes, so callers should keep batches modest.
+        """
+        voice_info = self.get_voice_info(voice_id)
+        if not voice_info:
+            return [(False, f"Voice {voice_id} not found")] * len(items)
+        
+        backend = voice_info['backend']
+        synthesizers = {
+            'tortoise': self._synthesize_tortoise,
+            'coqui': self._synthesize_coqui,
+            'xtts': self._synthesize_xtts
+        }
+        if backend not in synthesizers:
+            return [(False, f"Unsupported backend: {backend}")] * len(items)
+        
         try:
-            from tortoise.api import TextToSpeech
-            
-            tts = TextToSpeech()
+            with self._model(backend) as tts:
+                device = tts.synthesizer.tts_model.device if backend == 'xtts' else None
+                try:
+                    # An empty dict makes the backends use the reference clips
+                    conditioning = self._load_conditioning(voice_info, device=device) or {}
+                except Exception as e:
+                    logger.warning(f"Ignoring stored conditioning for {voice_id}: {e}")
+                    conditioning = {}
+                
+                return [
+                    synthesizers[backend](text, voice_info, output_path, conditioning)
+                    for text, output_path in items
+                ]
+        except Exception as e:
+            logger.error(f"Batch synthesis failed: {str(e)}")
+            return [(False, f"Speech synthesis error: {str(e)}")] * len(items)
+    
+    def require_voice(self, voice_id: str, streaming: bool = False) -> Dict:
+        """Voice metadata, raising LocalVoiceError if the voice can't be synthesized"""
+        voice_info = self.get_voice_info(voice_id)
+        if not voice_info:
+            raise LocalVoiceError(f"Voice {voice_id} not found")
+        backend = voice_info['backend']
+        if backend not in ('tortoise', 'coqui', 'xtts'):
+            raise LocalVoiceError(f"Unsupported backend: {backend}")
+        if streaming and backend != 'xtts':
+            raise LocalVoiceError(f"Streaming not supported for backend: {backend}")
+        return voice_info
+    
+    def synthesize_speech_stream(self, text: str, voice_id: str) -> Iterator[bytes]:
+        """Stream a cloned voice as 16-bit WAV bytes, chunk by chunk as XTTS produces them"""
+        voice_info = self.require_voice(voice_id, streaming=True)
+        
+        import torch
+        from tts_streaming import wav_stream_header
+        
+        with self._model('xtts') as tts:
+            model = tts.synthesizer.tts_model
+            conditioning = self._load_conditioning(voice_info, device=model.device)
+            if conditioning:
+                gpt_cond_latent = conditioning['gpt_cond_latent']
+                speaker_embedding = conditioning['speaker_embedding']
+            else:
+                gpt_cond_latent, speaker_embedding = model.get_conditioning_latents(
+                    audio_path=self._clip_paths(voice_info)
+                )
             
-            # Load voice samples
-            voice_samples = []
-            samples_dir = Path(voice_info['samples_dir'])
-            for sample_file in samples_dir.glob("*.wav"):
-                voice_samples.append(str(sample_file))
+            # Sent together with the first audio so the first chunk is real sound
+            header = wav_stream_header(model.config.audio.output_sample_rate)
             
-            if not voice_samples:
-                return False, "No voice samples found"
+            # XTTS splits the text into sentences and yields audio as it decodes
+            for chunk in model.inference_stream(
+                text,
+                "en",
+                gpt_cond_latent,
+                speaker_embedding,
+                stream_chunk_size=XTTS_STREAM_CHUNK_SIZE,
+                enable_text_splitting=True
+            ):
+                pcm = torch.clamp(chunk.float().cpu().reshape(-1), -1.0, 1.0)
+                data = (pcm * 32767).to(torch.int16).numpy().tobytes()
+                if header:
+                    data, header = header + data, None
+                yield data
+    
+    def _synthesize_tortoise(self, text: str, voice_info: Dict, output_path: str,
+                        conditioning: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
+        """Synthesize speech using Tortoise-TTS; ``conditioning`` is preloaded by batch callers"""
+        try:
+            if conditioning is None:
+                try:
+                    conditioning = self._load_conditioning(voice_info)
+                except Exception as e:
+                    logger.warning(f"Ignoring stored conditioning latents for {voice_info['id']}: {e}")
             
-            # Generate speech
-            gen = tts.tts_with_preset(text, voice_samples=voice_samples, preset='fast')
+            with self._model('tortoise') as tts:
+                if conditioning:
+                    # Reuse the stored latents instead of re-encoding the clips
+                    gen = tts.tts_with_preset(
+                        text,
+                        conditioning_latents=(conditioning['auto_conditioning'],
+                                              conditioning['diffusion_conditioning']),
+                        preset='fast'
+                    )
+                else:
+                    # Load a bounded set of voice samples
+                    load_audio = timed_import('tortoise.utils.audio').load_audio
+                    sample_files = sorted(Path(voice_info['samples_dir']).glob("*.wav"))[:CLONE_MAX_CLIPS]
+                    if not sample_files:
+                        return False, "No voice samples found"
+                    voice_samples = [load_audio(str(path), 22050) for path in sample_files]
+                    
+                    # Generate speech
+                    gen = tts.tts_with_preset(text, voice_samples=voice_samples, preset='fast')
             
             # Save output
+            import torchaudio
             torchaudio.save(output_path, gen.squeeze(0).cpu(), 24000)
             
             return True, "Speech synthesized successfully with Tortoise-TTS"
@@ -359,61 +970,90 @@ class LocalVoiceCloner:
         except Exception as e:
             return False, f"Tortoise synthesis error: {str(e)}"
     
-    def _synthesize_coqui(self, text: str, voice_info: Dict, output_path: str) -> Tuple[bool, str]:
-        """Synthesize speech using Coqui TTS"""
+    def _synthesize_coqui(self, text: str, voice_info: Dict, output_path: str,
+                        conditioning: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
+        """Synthesize speech using Coqui TTS; ``conditioning`` is preloaded by batch callers"""
         try:
-            from TTS.api import TTS as CoquiTTS
-            
-            tts = CoquiTTS(model_name="tts_models/multilingual/multi-dataset/your_tts", progress_bar=False)
-            
-            # Generate speech
-            tts.tts_to_file(
-                text=text,
-                speaker_wav=voice_info['audio_path'],
-                file_path=output_path
-            )
+            with self._model('coqui') as tts:
+                synthesizer = tts.synthesizer
+                if conditioning is None:
+                    try:
+                        conditioning = self._load_conditioning(voice_info)
+                    except Exception as e:
+                        logger.warning(f"Ignoring stored speaker embedding for {voice_info['id']}: {e}")
+                
+                if conditioning:
+                    # Skip the reference WAV and feed the stored d-vector directly
+                    from TTS.tts.utils.synthesis import synthesis
+                    
+                    model = synthesizer.tts_model
+                    outputs = synthesis(
+                        model=model,
+                        text=text,
+                        CONFIG=synthesizer.tts_config,
+                        use_cuda=synthesizer.use_cuda,
+                        d_vector=conditioning['speaker_embedding'].numpy(),
+                        language_id=model.language_manager.name_to_id.get('en')
+                    )
+                    synthesizer.save_wav(outputs['wav'], output_path)
+                else:
+                    # Generate speech
+                    tts.tts_to_file(
+                        text=text,
+                        speaker_wav=self._clip_paths(voice_info),
+                        file_path=output_path
+                    )
             
             return True, "Speech synthesized successfully with Coqui TTS"
             
         except Exception as e:
             return False, f"Coqui synthesis error: {str(e)}"
     
-    def _synthesize_xtts(self, text: str, voice_info: Dict, output_path: str) -> Tuple[bool, str]:
-        """Synthesize speech using XTTS"""
+    def _synthesize_xtts(self, text: str, voice_info: Dict, output_path: str,
+                        conditioning: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
+        """Synthesize speech using XTTS; ``conditioning`` is preloaded by batch callers"""
         try:
-            from TTS.api import TTS as CoquiTTS
-            
-            tts = CoquiTTS("tts_models/multilingual/multi-dataset/xtts_v2", progress_bar=False)
-            
-            # Generate speech
-            tts.tts_to_file(
-                text=text,
-                speaker_wav=voice_info['audio_path'],
-                language="en",
-                file_path=output_path
-            )
+            with self._model('xtts') as tts:
+                model = tts.synthesizer.tts_model
+                if conditioning is None:
+                    try:
+                        conditioning = self._load_conditioning(voice_info, device=model.device)
+                    except Exception as e:
+                        logger.warning(f"Ignoring stored conditioning for {voice_info['id']}: {e}")
+                
+                if conditioning:
+                    import torch
+                    import torchaudio
+                    
+                    # Skip the reference WAV and reuse the stored latents
+                    out = model.inference(
+                        text,
+                        "en",
+                        conditioning['gpt_cond_latent'],
+                        conditioning['speaker_embedding']
+                    )
+                    wav = torch.as_tensor(out['wav']).float().cpu().reshape(1, -1)
+                    torchaudio.save(output_path, wav, model.config.audio.output_sample_rate)
+                else:
+                    # Generate speech
+                    tts.tts_to_file(
+                        text=text,
+                        speaker_wav=self._clip_paths(voice_info),
+                        language="en",
+                        file_path=output_path
+                    )
             
             return True, "Speech synthesized successfully with XTTS"
             
         except Exception as e:
             return False, f"XTTS synthesis error: {str(e)}"
     
-    def list_voice_clones(self) -> list:
-        """List all available voice clones"""
-        voices = []
-        
-        for voice_dir in self.models_dir.iterdir():
-            if voice_dir.is_dir():
-                voice_info_path = voice_dir / "voice_info.json"
-                if voice_info_path.exists():
-                    try:
-                        with open(voice_info_path, 'r') as f:
-                            voice_info = json.load(f)
-                        voices.append(voice_info)
-                    except Exception as e:
-                        logger.warning(f"Failed to load voice info for {voice_dir.name}: {e}")
-        
-        return voices
+    def list_voice_clones(self, limit: Optional[int] = None, offset: int = 0) -> list:
+        """List available voice clones, newest first, optionally one page at a time"""
+        return self.voice_index.list(limit, offset)
+    
+    def count_voice_clones(self) -> int:
+        return self.voice_index.count()
     
     def delete_voice_clone(self, voice_id: str) -> Tuple[bool, str]:
         """Delete a voice clone"""
@@ -426,6 +1066,7 @@ class LocalVoiceCloner:
             # Remove voice directory and all contents
             import shutil
             shutil.rmtree(voice_dir)
+            self.voice_index.remove(voice_id)
             
             logger.info(f"Voice clone deleted: {voice_id}")
             return True, "Voice clone deleted successfully"
@@ -437,18 +1078,31 @@ class LocalVoiceCloner:
     def get_voice_info(self, voice_id: str) -> Optional[Dict]:
         """Get information about a voice clone"""
         try:
-            voice_dir = self.models_dir / voice_id
-            voice_info_path = voice_dir / "voice_info.json"
-            
-            if not voice_info_path.exists():
-                return None
-            
-            with open(voice_info_path, 'r') as f:
-                return json.load(f)
-                
+            return self.voice_index.get(voice_id)
         except Exception as e:
             logger.error(f"Failed to get voice info for {voice_id}: {str(e)}")
             return None
 
 # Global instance
 local_voice_cloner = LocalVoiceCloner()
+
+
+def synthesize_in_worker(text: str, voice_id: str, output_path: str) -> Tuple[bool, str]:
+    """Process-pool entry point; each worker process keeps its own warm model pool"""
+    return local_voice_cloner.synthesize_speech(text, voice_id, output_path)
+
+
+def create_voice_clone_in_worker(name: str, description: str, audio_path: Union[str, List[str]],
+                                 preferred_backend: str = 'auto') -> Tuple[Optional[str], str]:
+    """Process-pool entry point for clone creation; the voice index picks the new voice up from disk"""
+    return local_voice_cloner.create_voice_clone(name, description, audio_path, preferred_backend)
+
+
+def synthesize_batch_in_worker(voice_id: str, items: List[Tuple[str, str]]) -> List[Tuple[bool, str]]:
+    """Process-pool entry point for batch synthesis with one voice"""
+    return local_voice_cloner.synthesize_speech_batch(voice_id, items)
+
+
+def preprocess_in_worker(input_path: str, output_path: str, streaming: bool = True) -> bool:
+    """Process-pool entry point for preprocess_batch"""
+    return local_voice_cloner.preprocess_audio(input_path, output_path, streaming=streaming)
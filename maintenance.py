@@ -0,0 +1,263 @@
+"""
+Disk Maintenance for AudioAlchemy
+Background sweeper enforcing upload retention and a disk quota, and removing orphaned voice data
+"""
+
+import os
+import time
+import shutil
+import threading
+import logging
+from typing import Callable, Optional, Dict, Any, Set, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process, nothing to coordinate with
+    fcntl = None
+
+from tts_cache import TTSCache, is_cache_filename
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background sweeps
+MAINTENANCE_INTERVAL = float(os.getenv('MAINTENANCE_INTERVAL_SECONDS', '3600'))
+
+# Days generated audio, uploads and downloads are kept
+UPLOAD_RETENTION_DAYS = float(os.getenv('UPLOAD_RETENTION_DAYS', '30'))
+
+# Total size of the uploads folder; the least recently used files go first
+UPLOADS_MAX_MB = float(os.getenv('UPLOADS_MAX_MB', '10240'))
+
+# Files and voice directories younger than this are never touched: they may
+# still be in the middle of being written or registered
+MAINTENANCE_GRACE_SECONDS = float(os.getenv('MAINTENANCE_GRACE_SECONDS', '3600'))
+
+# Remove voice model directories the app has no record of (e.g. failed or abandoned clones)
+MAINTENANCE_PRUNE_VOICES = os.getenv('MAINTENANCE_PRUNE_VOICES', '1').lower() in ('1', 'true', 'yes')
+
+TEMP_SUFFIXES = ('.part', '.tmp')
+LOCK_FILENAME = '.maintenance.lock'
+
+
+class MaintenanceSweeper:
+    """Keeps the uploads and voice model folders inside their retention and size limits
+
+    Each sweep makes one pass over the uploads folder. Files past their
+    retention period are removed, then the least recently used files (by
+    mtime, which TTS cache hits refresh) until the folder fits the quota.
+    Cached TTS files are removed through the cache so its index stays
+    accurate. Voice directories unknown to the app (if ``prune_voices``),
+    voices whose directory is gone, abandoned ``.part``/``.tmp`` files and,
+    through ``expire_records``, stored records past retention are cleaned
+    up as well. ``known_voices`` and ``sample_retention_days`` should raise
+    rather than guess when they can't read the app's records; the sweep
+    then leaves voices and samples alone. A lock file lets only one process
+    sweep at a time.
+    """
+
+    def __init__(self, uploads_dir: str, models_dir: str, cache: Optional[TTSCache] = None,
+                 known_voices: Optional[Callable[[], Set[str]]] = None,
+                 forget_voices: Optional[Callable[[Set[str]], None]] = None,
+                 sample_retention_days: Optional[Callable[[], float]] = None,
+                 expire_records: Optional[Callable[[float], int]] = None,
+                 sample_prefix: str = 'voice_sample_',
+                 retention_days: float = UPLOAD_RETENTION_DAYS,
+                 quota_bytes: int = int(UPLOADS_MAX_MB * 1024 * 1024),
+                 interval: float = MAINTENANCE_INTERVAL,
+                 grace_seconds: float = MAINTENANCE_GRACE_SECONDS,
+                 prune_voices: bool = MAINTENANCE_PRUNE_VOICES):
+        self.uploads_dir = uploads_dir
+        self.models_dir = models_dir
+        self.cache = cache
+        self.known_voices = known_voices
+        self.forget_voices = forget_voices
+        self.sample_retention_days = sample_retention_days
+        self.expire_records = expire_records
+        self.sample_prefix = sample_prefix
+        self.retention_days = retention_days
+        self.quota_bytes = quota_bytes
+        self.interval = interval
+        self.grace_seconds = grace_seconds
+        self.prune_voices = prune_voices
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.reclaimed_total = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+
+    def ensure_started(self):
+        """Start the background sweep thread in this process if it isn't running"""
+        if self.interval <= 0 or (self._thread_pid == os.getpid() and self._thread.is_alive()):
+            return
+        with self._lock:
+            # Threads don't survive a fork, so each worker starts its own
+            if self._thread is not None and self._thread_pid == os.getpid() and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='maintenance-sweeper', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Maintenance sweep failed: {str(e)}")
+
+    def _remove_file(self, path: str, name: str) -> bool:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {e}")
+            return False
+        if self.cache is not None and is_cache_filename(name):
+            self.cache.discard(name)
+        return True
+
+    def _sweep_uploads(self, now: float, report: Dict[str, Any]):
+        retention = self.retention_days * 86400
+        sample_retention = retention
+        if self.sample_retention_days:
+            try:
+                sample_retention = self.sample_retention_days() * 86400
+            except Exception as e:
+                # Unknown retention: keep every sample until the next sweep
+                logger.error(f"Could not read voice sample retention, not expiring samples: {e}")
+                sample_retention = 0
+
+        kept: List[Tuple[float, str, str, int]] = []
+        for entry in os.scandir(self.uploads_dir):
+            if not entry.is_file() or entry.name == LOCK_FILENAME:
+                continue
+            stat = entry.stat()
+            age = now - stat.st_mtime
+            if entry.name.endswith(TEMP_SUFFIXES):
+                if age > self.grace_seconds and self._remove_file(entry.path, entry.name):
+                    report['temp_files'] += 1
+                    report['reclaimed_bytes'] += stat.st_size
+                continue
+            limit = sample_retention if entry.name.startswith(self.sample_prefix) else retention
+            if limit > 0 and age > max(limit, self.grace_seconds):
+                if self._remove_file(entry.path, entry.name):
+                    report['expired_files'] += 1
+                    report['reclaimed_bytes'] += stat.st_size
+                continue
+            kept.append((stat.st_mtime, entry.path, entry.name, stat.st_size))
+
+        total = sum(size for _, _, _, size in kept)
+        report['uploads_bytes'] = total
+        if self.quota_bytes <= 0 or total <= self.quota_bytes:
+            return
+        for mtime, path, name, size in sorted(kept):
+            if total <= self.quota_bytes:
+                break
+            if now - mtime <= self.grace_seconds:
+                break
+            if self._remove_file(path, name):
+                total -= size
+                report['evicted_files'] += 1
+                report['reclaimed_bytes'] += size
+        report['uploads_bytes'] = total
+
+    def _sweep_voice_models(self, now: float, report: Dict[str, Any]):
+        if not os.path.isdir(self.models_dir):
+            return
+        known = None
+        if self.known_voices:
+            try:
+                known = self.known_voices()
+            except Exception as e:
+                # Without the registry every voice would look orphaned
+                logger.error(f"Could not read registered voices, not pruning or forgetting any: {e}")
+        on_disk = set()
+        for entry in os.scandir(self.models_dir):
+            if not entry.is_dir():
+                continue
+            on_disk.add(entry.name)
+            age = now - entry.stat().st_mtime
+            if self.prune_voices and known is not None and entry.name not in known and age > self.grace_seconds:
+                size = _tree_size(entry.path)
+                shutil.rmtree(entry.path, ignore_errors=True)
+                on_disk.discard(entry.name)
+                report['orphaned_voices'] += 1
+                report['reclaimed_bytes'] += size
+                logger.info(f"Removed orphaned voice directory {entry.name}")
+                continue
+            for child in os.scandir(entry.path):
+                if child.is_file() and child.name.endswith(TEMP_SUFFIXES) \
+                        and now - child.stat().st_mtime > self.grace_seconds:
+                    size = child.stat().st_size
+                    if self._remove_file(child.path, child.name):
+                        report['temp_files'] += 1
+                        report['reclaimed_bytes'] += size
+
+        if known is not None and self.forget_voices:
+            missing = known - on_disk
+            if missing:
+                self.forget_voices(missing)
+                report['missing_voices'] = len(missing)
+                logger.info(f"Forgot {len(missing)} voices whose model directory is gone")
+
+    def sweep(self) -> Dict[str, Any]:
+        """Run one sweep now and return what it reclaimed"""
+        started = time.monotonic()
+        report = {
+            'expired_files': 0,
+            'evicted_files': 0,
+            'temp_files': 0,
+            'orphaned_voices': 0,
+            'missing_voices': 0,
+            'expired_records': 0,
+            'reclaimed_bytes': 0,
+            'uploads_bytes': None,
+            'skipped': False
+        }
+        lock_file = open(os.path.join(self.uploads_dir, LOCK_FILENAME), 'a')
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    # Another worker is sweeping right now
+                    report['skipped'] = True
+                    return report
+            now = time.time()
+            self._sweep_uploads(now, report)
+            self._sweep_voice_models(now, report)
+            if self.expire_records and self.retention_days > 0:
+                try:
+                    report['expired_records'] = self.expire_records(self.retention_days)
+                except Exception as e:
+                    logger.error(f"Could not expire stored records: {str(e)}")
+        finally:
+            lock_file.close()
+
+        report['duration_ms'] = round((time.monotonic() - started) * 1000)
+        report['finished_at'] = time.time()
+        with self._lock:
+            self.last_report = report
+            self.reclaimed_total += report['reclaimed_bytes']
+        logger.info(f"Maintenance sweep reclaimed {report['reclaimed_bytes'] / 1024 / 1024:.1f} MB")
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'interval_seconds': self.interval,
+                'retention_days': self.retention_days,
+                'quota_bytes': self.quota_bytes,
+                'reclaimed_total_bytes': self.reclaimed_total,
+                'last_sweep': self.last_report
+            }
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
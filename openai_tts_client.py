@@ -0,0 +1,137 @@
+"""
+OpenAI-Compatible TTS Client for AudioAlchemy
+Keep-alive connection pooling and cached health state for the TTS server
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Iterator, Dict, Any
+
+from lazy_imports import timed_import
+from provider_router import ProviderRequestError
+
+logger = logging.getLogger(__name__)
+
+TTS_HTTP_POOL_SIZE = int(os.getenv('TTS_HTTP_POOL_SIZE', '16'))
+TTS_HTTP_CONNECT_TIMEOUT = float(os.getenv('TTS_HTTP_CONNECT_TIMEOUT', '2'))
+TTS_HTTP_READ_TIMEOUT = float(os.getenv('TTS_HTTP_READ_TIMEOUT', '10'))
+
+# How long a connection failure marks the server as down before retrying it
+TTS_HEALTH_TTL = float(os.getenv('TTS_HEALTH_TTL', '30'))
+
+
+class TTSServiceUnavailable(Exception):
+    """The TTS server is unreachable, or was recently found to be"""
+
+
+class OpenAITTSClient:
+    """Shared client for an OpenAI-compatible ``/v1/audio/speech`` endpoint
+
+    One keep-alive session per process is reused for every utterance. Health
+    is learned from real requests: a connection failure marks the server
+    down for ``health_ttl`` seconds, during which calls fail fast instead of
+    waiting for another timeout.
+    """
+
+    def __init__(self, api_url: str, api_key: str, pool_size: int = TTS_HTTP_POOL_SIZE,
+                 connect_timeout: float = TTS_HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = TTS_HTTP_READ_TIMEOUT,
+                 health_ttl: float = TTS_HEALTH_TTL):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.health_ttl = health_ttl
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self._last_error = None
+
+    @property
+    def session(self):
+        # Sockets must not be shared across a fork, so each process builds its own
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    # requests is imported on first use to keep start-up fast
+                    requests = timed_import('requests')
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    session.headers.update({
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {self.api_key}"
+                    })
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def is_healthy(self) -> bool:
+        """Cached health: False only while a recent connection failure is in effect"""
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception):
+        self._down_until = time.monotonic() + self.health_ttl
+        self._last_error = str(error)
+        logger.warning(f"OpenAI TTS server marked unavailable for {self.health_ttl:.0f}s: {error}")
+
+    def _mark_up(self):
+        self._down_until = 0.0
+        self._last_error = None
+
+    def _post(self, payload: Dict[str, Any], stream: bool = False):
+        if not self.is_healthy():
+            raise TTSServiceUnavailable(f"OpenAI TTS server unavailable: {self._last_error}")
+        session = self.session
+        requests = timed_import('requests')
+        try:
+            response = session.post(self.api_url, json=payload, timeout=self.timeout, stream=stream)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self._mark_down(e)
+            raise TTSServiceUnavailable(f"OpenAI TTS server unavailable: {e}")
+        self._mark_up()
+
+        if response.status_code != 200:
+            response.close()
+            if 400 <= response.status_code < 500 and response.status_code not in (408, 429):
+                # The server rejected this request (e.g. an unknown voice); it is still up
+                raise ProviderRequestError(f"OpenAI TTS API rejected the request: {response.status_code}")
+            raise Exception(f"OpenAI TTS API error: {response.status_code}")
+        return response
+
+    @staticmethod
+    def _payload(text: str, voice: str, model: str, speed: float) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "input": text,
+            "voice": voice,
+            "speed": speed
+        }
+
+    def synthesize(self, text: str, voice: str, model: str, speed: float = 1.0) -> bytes:
+        """Synthesize speech and return the complete audio body"""
+        return self._post(self._payload(text, voice, model, speed)).content
+
+    def stream(self, text: str, voice: str, model: str, speed: float = 1.0,
+               chunk_size: int = 4096) -> Iterator[bytes]:
+        """Synthesize speech, yielding the body as it arrives"""
+        response = self._post(self._payload(text, voice, model, speed), stream=True)
+        try:
+            yield from response.iter_content(chunk_size=chunk_size)
+        finally:
+            # Returns the connection to the pool
+            response.close()
+
+    def probe(self):
+        """Cheap reachability check for the provider router; raises if the server is down"""
+        session = self.session
+        requests = timed_import('requests')
+        try:
+            session.head(self.api_url, timeout=self.timeout[0])
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise TTSServiceUnavailable(f"OpenAI TTS server unavailable: {e}")
+        self._mark_up()
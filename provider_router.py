@@ -0,0 +1,197 @@
+"""
+Provider Router for AudioAlchemy
+Per-provider health tracking with circuit breakers and background recovery probes
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import deque
+from typing import Callable, Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures that open a provider's circuit
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))
+# Seconds an open circuit waits before letting a trial request through
+CIRCUIT_RECOVERY_SECONDS = float(os.getenv('CIRCUIT_RECOVERY_SECONDS', '30'))
+# Seconds between background probes of open circuits
+CIRCUIT_PROBE_INTERVAL = float(os.getenv('CIRCUIT_PROBE_INTERVAL', '10'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """The provider's circuit is open and requests are not being sent to it"""
+
+
+class ProviderRequestError(ValueError):
+    """The request itself can't be served (unknown voice, unsupported option); says nothing about the provider's health"""
+
+
+class CircuitBreaker:
+    """Health of one provider: success rate, latency and circuit state"""
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 recovery_seconds: float = CIRCUIT_RECOVERY_SECONDS, window: int = 50):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.last_error = None
+        self.latency_ms = None  # exponentially weighted moving average
+        self._outcomes = deque(maxlen=window)
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent; after the recovery delay one trial goes through"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_seconds:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency_ms: Optional[float] = None):
+        with self._lock:
+            self._outcomes.append(True)
+            self.consecutive_failures = 0
+            if latency_ms is not None:
+                self.latency_ms = latency_ms if self.latency_ms is None else 0.8 * self.latency_ms + 0.2 * latency_ms
+            if self.state != CLOSED:
+                logger.info(f"Provider {self.name} recovered, closing circuit")
+            self.state = CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Any = None) -> bool:
+        """Record a failure; returns True if this opened the circuit"""
+        with self._lock:
+            self._outcomes.append(False)
+            self.consecutive_failures += 1
+            self.last_error = str(error) if error is not None else None
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                logger.warning(f"Provider {self.name} circuit opened: {self.last_error}")
+                return True
+            return False
+
+    def release(self):
+        """Hand back a request that was allowed but never judged the provider's health"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            outcomes = list(self._outcomes)
+            return {
+                'state': self.state,
+                'success_rate': sum(outcomes) / len(outcomes) if outcomes else None,
+                'latency_ms': round(self.latency_ms) if self.latency_ms is not None else None,
+                'consecutive_failures': self.consecutive_failures,
+                'last_error': self.last_error
+            }
+
+
+class ProviderRouter:
+    """Routes calls to the first healthy provider and probes failed ones in the background"""
+
+    def __init__(self, probe_interval: float = CIRCUIT_PROBE_INTERVAL):
+        self.probe_interval = probe_interval
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._probes: Dict[str, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+        self._prober = None
+        self._prober_pid = None
+
+    def register(self, name: str, probe: Optional[Callable[[], Any]] = None, **breaker_options):
+        """Register a provider with an optional cheap health probe that raises on failure"""
+        with self._lock:
+            self._breakers[name] = CircuitBreaker(name, **breaker_options)
+            if probe:
+                self._probes[name] = probe
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name)
+            return self._breakers[name]
+
+    def allow(self, name: str) -> bool:
+        return self.breaker(name).allow_request()
+
+    def record_success(self, name: str, latency_ms: Optional[float] = None):
+        self.breaker(name).record_success(latency_ms)
+
+    def record_failure(self, name: str, error: Any = None):
+        if self.breaker(name).record_failure(error):
+            self._ensure_prober()
+
+    def release(self, name: str):
+        self.breaker(name).release()
+
+    def call(self, name: str, func: Callable, *args, **kwargs):
+        """Call ``func`` for a provider, recording its outcome and latency
+
+        A ProviderRequestError is passed on without counting as a failure.
+        """
+        if not self.allow(name):
+            raise CircuitOpenError(f"Provider {name} is unavailable")
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except ProviderRequestError:
+            self.release(name)
+            raise
+        except Exception as e:
+            self.record_failure(name, e)
+            raise
+        self.record_success(name, (time.monotonic() - started) * 1000)
+        return result
+
+    def _ensure_prober(self):
+        # Started on demand, and again in a forked worker that lacks the thread
+        with self._lock:
+            if self._prober is not None and self._prober.is_alive() and self._prober_pid == os.getpid():
+                return
+            self._prober = threading.Thread(target=self._probe_loop, name='provider-prober', daemon=True)
+            self._prober_pid = os.getpid()
+            self._prober.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.probe_interval)
+            with self._lock:
+                targets = [(name, breaker, self._probes.get(name))
+                           for name, breaker in self._breakers.items() if breaker.state != CLOSED]
+            if not targets:
+                continue
+            for name, breaker, probe in targets:
+                if probe is None:
+                    # No probe: the next real request after the recovery delay is the trial
+                    continue
+                started = time.monotonic()
+                try:
+                    probe()
+                except Exception as e:
+                    logger.debug(f"Probe for provider {name} failed: {e}")
+                    continue
+                breaker.record_success((time.monotonic() - started) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
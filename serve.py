@@ -0,0 +1,159 @@
+"""
+Production Server for AudioAlchemy
+Preforking Gunicorn server that loads shared models once in the master before forking workers
+"""
+
+import os
+import gc
+import sys
+import logging
+import multiprocessing
+from typing import List
+
+from lazy_imports import FAST_START, HEAVY_MODULES, module_available, timed_import
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SERVE_BIND = os.getenv('AUDIOALCHEMY_BIND', '0.0.0.0:80')
+SERVE_WORKERS = int(os.getenv('AUDIOALCHEMY_WORKERS', str(min(multiprocessing.cpu_count(), 8))))
+SERVE_THREADS = int(os.getenv('AUDIOALCHEMY_THREADS', '4'))
+
+# Seconds a request may run before its worker is restarted; local synthesis is slow
+SERVE_TIMEOUT = int(os.getenv('AUDIOALCHEMY_TIMEOUT', '300'))
+
+# Models loaded in the master: 'auto' (preferred local backend plus Whisper),
+# 'none', or a comma-separated list such as 'xtts,whisper'
+SERVE_PRELOAD = os.getenv('AUDIOALCHEMY_PRELOAD', 'auto')
+
+LOCAL_BACKENDS = ('xtts', 'coqui', 'tortoise')
+
+# Loaders that put their weights on the GPU when one is present
+GPU_MODELS = ('tortoise', 'whisper')
+
+
+def preload_targets(spec: str = SERVE_PRELOAD) -> List[str]:
+    """Models named by an AUDIOALCHEMY_PRELOAD value"""
+    spec = spec.strip().lower()
+    if spec in ('', 'none'):
+        return []
+    if spec != 'auto':
+        return [name.strip() for name in spec.split(',') if name.strip()]
+
+    from local_tts_models import local_voice_cloner
+    targets = [backend for backend in LOCAL_BACKENDS if local_voice_cloner.backends.get(backend)][:1]
+    if module_available('whisper'):
+        targets.append('whisper')
+    return targets
+
+
+def _loads_onto_gpu(name: str) -> bool:
+    if name not in GPU_MODELS or not module_available('torch'):
+        return False
+    if name == 'whisper':
+        from asr import WHISPER_DEVICE
+        if WHISPER_DEVICE == 'cpu':
+            return False
+    return timed_import('torch').cuda.is_available()
+
+
+def preload_models(names: List[str]) -> List[str]:
+    """Load models into this process so forked workers share the weights copy-on-write"""
+    loaded = []
+    for name in names:
+        if _loads_onto_gpu(name):
+            # A CUDA context cannot be inherited across fork
+            logger.warning(f"Not preloading {name}: it would load onto the GPU; each worker loads it on first use")
+            continue
+        try:
+            if name == 'whisper':
+                from asr import load_whisper_model
+                load_whisper_model()
+            elif name in LOCAL_BACKENDS:
+                from local_tts_models import local_voice_cloner
+                local_voice_cloner.warm_backend(name)
+            else:
+                logger.warning(f"Unknown model to preload: {name}")
+                continue
+        except Exception as e:
+            logger.error(f"Preloading {name} failed: {str(e)}")
+            continue
+        loaded.append(name)
+    return loaded
+
+
+def preload():
+    """Master-side warm-up: heavy imports and models, then freeze the heap"""
+    if not FAST_START:
+        for name in HEAVY_MODULES:
+            if module_available(name):
+                try:
+                    timed_import(name)
+                except Exception as e:
+                    logger.warning(f"Preloading module {name} failed: {e}")
+
+    loaded = preload_models(preload_targets())
+    logger.info(f"Preloaded models before forking workers: {loaded or 'none'}")
+
+    # Without this the first garbage collection in each worker writes to
+    # every tracked object and so copies the pages holding the shared models
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Split the CPU between workers so torch thread pools don't oversubscribe it"""
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        workers = max(1, server.cfg.workers)
+        torch.set_num_threads(max(1, multiprocessing.cpu_count() // workers))
+
+
+class AudioAlchemyServer(BaseApplication):
+    """Gunicorn application that imports the app and preloads models in the master"""
+
+    def __init__(self, app=None, options=None):
+        self.application = app
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # With preload_app this runs once, in the master, before any fork
+        if self.application is None:
+            from app import app
+            self.application = app
+        # Fetched once here so every forked worker starts with a filled catalog
+        from app import warm_voice_catalog
+        warm_voice_catalog(wait=True)
+        preload()
+        return self.application
+
+
+def serve(app=None, bind: str = SERVE_BIND, workers: int = SERVE_WORKERS, threads: int = SERVE_THREADS):
+    """Run the app under Gunicorn with preforked, threaded workers"""
+    if not GUNICORN_AVAILABLE:
+        raise SystemExit("Production serving needs Gunicorn - install with: pip install gunicorn")
+
+    AudioAlchemyServer(app, {
+        'bind': bind,
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'preload_app': True,
+        'timeout': SERVE_TIMEOUT,
+        'post_fork': post_fork,
+        'accesslog': '-'
+    }).run()
+
+
+if __name__ == '__main__':
+    serve()
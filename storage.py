@@ -0,0 +1,303 @@
+"""
+Embedded Storage for AudioAlchemy
+SQLite (WAL mode) store for user preferences, history, per-session results and job states
+"""
+
+import os
+import json
+import uuid
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable
+
+logger = logging.getLogger(__name__)
+
+DATABASE_FILE = os.getenv('AUDIOALCHEMY_DB', 'audioalchemy.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS preferences (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    content TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_history_type ON history (type, seq);
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    translated TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    session_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_results_session ON results (session_id, kind, seq);
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL DEFAULT '{}',
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+USER_DATA_KEY = 'user_data'
+
+
+class Storage:
+    """Thread-safe SQLite store behind the app's preference and history helpers
+
+    Each thread gets its own connection. WAL mode lets readers proceed while
+    a writer commits, and appends touch a single indexed row, so write cost
+    does not grow with the size of the history.
+    """
+
+    def __init__(self, path: str = DATABASE_FILE, user_data_file: Optional[str] = None,
+                 history_file: Optional[str] = None):
+        self.path = path
+        self.user_data_file = user_data_file
+        self.history_file = history_file
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork; reopen in the child process
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        if not self._initialized:
+            self._initialize(conn)
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection):
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn.executescript(SCHEMA)
+            self._migrate_json(conn)
+            self._initialized = True
+
+    @contextmanager
+    def transaction(self):
+        """Run statements in one write transaction, taking the write lock up front"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def _migrate_json(self, conn: sqlite3.Connection):
+        """Import the legacy JSON files once"""
+        row = conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if row:
+            return
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have migrated while we waited for the lock
+            row = conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if not row:
+                imported = 0
+                if self.user_data_file and os.path.exists(self.user_data_file):
+                    with open(self.user_data_file, 'r') as f:
+                        conn.execute(
+                            'INSERT OR REPLACE INTO preferences (key, value) VALUES (?, ?)',
+                            (USER_DATA_KEY, json.dumps(json.load(f)))
+                        )
+                if self.history_file and os.path.exists(self.history_file):
+                    with open(self.history_file, 'r') as f:
+                        history = json.load(f)
+                    # The JSON file is newest first; store oldest first
+                    for entry in reversed(history):
+                        self._insert_history(conn, entry)
+                        imported += 1
+                conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+                logger.info(f"Migrated JSON user data and {imported} history entries to {self.path}")
+            conn.execute('COMMIT')
+        except Exception as e:
+            conn.execute('ROLLBACK')
+            logger.error(f"JSON migration failed: {str(e)}")
+            raise
+
+    def load_user_data(self) -> Optional[Dict[str, Any]]:
+        """Load stored preferences, or None if nothing has been saved"""
+        row = self._connection().execute(
+            'SELECT value FROM preferences WHERE key = ?', (USER_DATA_KEY,)
+        ).fetchone()
+        return json.loads(row['value']) if row else None
+
+    def save_user_data(self, user_data: Dict[str, Any]):
+        with self.transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO preferences (key, value) VALUES (?, ?)',
+                         (USER_DATA_KEY, json.dumps(user_data)))
+
+    def update_user_data(self, default: Dict[str, Any],
+                         mutator: Callable[[Dict[str, Any]], Any]) -> Dict[str, Any]:
+        """Read-modify-write preferences atomically so concurrent updates aren't lost"""
+        with self.transaction() as conn:
+            row = conn.execute('SELECT value FROM preferences WHERE key = ?',
+                               (USER_DATA_KEY,)).fetchone()
+            user_data = json.loads(row['value']) if row else default
+            mutator(user_data)
+            conn.execute('INSERT OR REPLACE INTO preferences (key, value) VALUES (?, ?)',
+                         (USER_DATA_KEY, json.dumps(user_data)))
+        return user_data
+
+    @staticmethod
+    def _insert_history(conn: sqlite3.Connection, entry: Dict[str, Any]):
+        conn.execute(
+            'INSERT OR IGNORE INTO history (id, timestamp, type, content, metadata) VALUES (?, ?, ?, ?, ?)',
+            (entry['id'], entry['timestamp'], entry['type'], entry.get('content'),
+             json.dumps(entry.get('metadata') or {}))
+        )
+
+    def append_history(self, entry: Dict[str, Any]):
+        with self.transaction() as conn:
+            self._insert_history(conn, entry)
+
+    def load_history(self, limit: Optional[int] = None, offset: int = 0,
+                     action_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load history entries, newest first"""
+        query = 'SELECT id, timestamp, type, content, metadata FROM history'
+        params: list = []
+        if action_type:
+            query += ' WHERE type = ?'
+            params.append(action_type)
+        query += ' ORDER BY seq DESC LIMIT ? OFFSET ?'
+        params.extend([limit if limit is not None else -1, offset])
+
+        rows = self._connection().execute(query, params).fetchall()
+        return [
+            {
+                'id': row['id'],
+                'timestamp': row['timestamp'],
+                'type': row['type'],
+                'content': row['content'],
+                'metadata': json.loads(row['metadata'])
+            }
+            for row in rows
+        ]
+
+    def get_translations(self, keys: List[str]) -> Dict[str, str]:
+        """Look up cached translations by key"""
+        found: Dict[str, str] = {}
+        conn = self._connection()
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = conn.execute(
+                f'SELECT key, translated FROM translations WHERE key IN ({placeholders})', batch
+            ).fetchall()
+            found.update((row['key'], row['translated']) for row in rows)
+        return found
+
+    def put_translations(self, items: List[tuple]):
+        """Store ``(key, source, target, translated)`` tuples"""
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO translations (key, source, target, translated) VALUES (?, ?, ?, ?)',
+                items
+            )
+
+    @staticmethod
+    def _result_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'id': row['id'],
+            'session_id': row['session_id'],
+            'kind': row['kind'],
+            'created_at': row['created_at'],
+            'data': json.loads(row['data'])
+        }
+
+    def put_result(self, session_id: str, kind: str, data: Dict[str, Any]) -> str:
+        """Store a result (e.g. generated speech) for a session and return its id"""
+        result_id = uuid.uuid4().hex
+        with self.transaction() as conn:
+            conn.execute('INSERT INTO results (id, session_id, kind, data) VALUES (?, ?, ?, ?)',
+                         (result_id, session_id, kind, json.dumps(data)))
+        return result_id
+
+    def get_result(self, result_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            'SELECT id, session_id, kind, data, created_at FROM results WHERE id = ?', (result_id,)
+        ).fetchone()
+        return self._result_from_row(row) if row else None
+
+    def latest_results(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """The newest result of each kind for a session, keyed by kind"""
+        rows = self._connection().execute(
+            'SELECT r.id, r.session_id, r.kind, r.data, r.created_at FROM results r '
+            'JOIN (SELECT MAX(seq) AS seq FROM results WHERE session_id = ? GROUP BY kind) latest '
+            'ON r.seq = latest.seq',
+            (session_id,)
+        ).fetchall()
+        return {row['kind']: self._result_from_row(row) for row in rows}
+
+    def prune_translations(self, older_than_days: float) -> int:
+        """Delete cached translations older than the given age and return how many were removed"""
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM translations WHERE created_at < datetime('now', ?)",
+                                (f'-{older_than_days} days',)).rowcount
+
+    def prune_results(self, older_than_days: float) -> int:
+        """Delete results older than the given age and return how many were removed"""
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM results WHERE created_at < datetime('now', ?)",
+                                (f'-{older_than_days} days',)).rowcount
+
+    def put_job(self, job: Dict[str, Any]):
+        """Insert or update a job's state, keeping its original position in the listing"""
+        with self.transaction() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, kind, status, data) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (id) DO UPDATE SET status = excluded.status, data = excluded.data, '
+                'updated_at = CURRENT_TIMESTAMP',
+                (job['id'], job['kind'], job['status'], json.dumps(job))
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute('SELECT data FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """The most recent jobs, newest first"""
+        rows = self._connection().execute('SELECT data FROM jobs ORDER BY seq DESC LIMIT ?',
+                                          (limit,)).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def prune_jobs(self, older_than_days: float) -> int:
+        """Delete jobs not updated within the given age and return how many were removed"""
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM jobs WHERE updated_at < datetime('now', ?)",
+                                (f'-{older_than_days} days',)).rowcount
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep translation offline; set before collection imports the translation module
+os.environ.setdefault('TRANSLATION_PROVIDER', 'passthrough')
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The Flask app module, imported with its uploads folder and database in a temp directory"""
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('app'))
+    try:
+        import app
+        yield app
+    finally:
+        os.chdir(previous)
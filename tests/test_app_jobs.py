@@ -0,0 +1,32 @@
+import os
+
+
+def test_tts_job_survives_cache_write_failure(app_module, monkeypatch):
+    def fake_run_in_process(func, text, voice, filepath):
+        with open(filepath, 'wb') as f:
+            f.write(b'local')
+        return True, 'ok'
+
+    def broken_put(key, filename):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(app_module.job_manager, 'run_in_process', fake_run_in_process)
+    monkeypatch.setattr(app_module.tts_cache, 'put', broken_put)
+
+    result = app_module.run_tts_job('Hello there.', 'local_voice', 'tts-1')
+    path = os.path.join(app_module.app.config['UPLOAD_FOLDER'], result['filename'])
+    assert open(path, 'rb').read() == b'local'
+
+
+def test_local_voice_clone_runs_on_the_process_pool(app_module, monkeypatch):
+    import local_tts_models
+    calls = []
+
+    def fake_run_in_process(func, *args):
+        calls.append((func, args))
+        return None, 'No speech found in the audio sample'
+
+    monkeypatch.setattr(app_module.job_manager, 'run_in_process', fake_run_in_process)
+    result = app_module.create_voice_clone_local('Voice', '', ['sample.wav'])
+    assert result == (None, 'No speech found in the audio sample')
+    assert calls == [(local_tts_models.create_voice_clone_in_worker, ('Voice', '', ['sample.wav'], 'auto'))]
@@ -0,0 +1,19 @@
+def test_result_response_omits_session(app_module):
+    result_id = app_module.storage.put_result('owner-session', app_module.SPEECH_RESULT,
+                                              {'filename': 'speech.mp3'})
+    response = app_module.app.test_client().get(f"/api/results/{result_id}")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'session_id' not in body
+    assert body['data'] == {'filename': 'speech.mp3'}
+    assert body['url'].endswith('/speech.mp3')
+
+
+def test_job_status_is_read_from_the_database(app_module):
+    app_module.storage.put_job({'id': 'elsewhere', 'kind': 'tts', 'status': 'succeeded',
+                                'result': {'filename': 'speech.mp3'}})
+    response = app_module.app.test_client().get('/api/jobs/elsewhere')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'succeeded'
+    assert body['result_url'].endswith('/speech.mp3')
@@ -0,0 +1,138 @@
+import os
+
+
+def make_file(app_module, name):
+    with open(os.path.join(app_module.app.config['UPLOAD_FOLDER'], name), 'wb') as f:
+        f.write(b'audio')
+    return name
+
+
+def test_segmented_tts_rejects_fallback_segments(app_module, monkeypatch):
+    primary = app_module.primary_tts_source('alloy', 'openai')
+
+    def fake_cached(segment, *args):
+        source = 'gtts' if segment == 'Second part.' else primary
+        return make_file(app_module, f"segment_{abs(hash(segment))}.mp3"), source
+
+    stitched = []
+    monkeypatch.setattr(app_module, '_text_to_speech_cached', fake_cached)
+    monkeypatch.setattr(app_module, 'stitch_audio', lambda paths, output: stitched.append(paths))
+
+    result = app_module._text_to_speech_segmented(
+        ['First part.', 'Second part.', 'Third part.'], 'First part. Second part. Third part.',
+        'alloy', 'tts-1', 'openai', {}, False)
+
+    assert result is None
+    assert stitched == []
+    # The fallback segment's uncached file is cleaned up
+    fallback = f"segment_{abs(hash('Second part.'))}.mp3"
+    assert not os.path.exists(os.path.join(app_module.app.config['UPLOAD_FOLDER'], fallback))
+
+
+def test_segmented_tts_stitches_primary_segments(app_module, monkeypatch):
+    primary = app_module.primary_tts_source('alloy', 'openai')
+
+    def fake_cached(segment, *args):
+        return make_file(app_module, f"segment_{abs(hash(segment))}.mp3"), primary
+
+    def fake_stitch(paths, output):
+        with open(output, 'wb') as f:
+            f.write(b''.join(open(path, 'rb').read() for path in paths))
+
+    monkeypatch.setattr(app_module, '_text_to_speech_cached', fake_cached)
+    monkeypatch.setattr(app_module, 'stitch_audio', fake_stitch)
+
+    result = app_module._text_to_speech_segmented(
+        ['One.', 'Two.'], 'One. Two. (primary)', 'alloy', 'tts-1', 'openai', {}, False)
+
+    assert result is not None
+    assert app_module.is_cache_filename(result)
+
+
+def test_unknown_local_voice_does_not_trip_breaker(app_module, monkeypatch):
+    from local_tts_models import local_voice_cloner
+    monkeypatch.setattr(local_voice_cloner, 'get_voice_info', lambda voice_id: None)
+    monkeypatch.setattr(app_module, '_tts_gtts', lambda text, filepath: open(filepath, 'wb').close())
+
+    breaker = app_module.provider_router.breaker('local')
+    for _ in range(breaker.failure_threshold + 1):
+        filename, source = app_module._text_to_speech_uncached(
+            'Hello.', 'local_missing', 'tts-1', 'gtts', {}, False)
+        assert source == 'gtts'
+    assert breaker.state == 'closed'
+    assert breaker.consecutive_failures == 0
+
+
+def test_streaming_skips_local_for_non_xtts_voices(app_module, monkeypatch):
+    from local_tts_models import local_voice_cloner
+    monkeypatch.setattr(local_voice_cloner, 'get_voice_info',
+                        lambda voice_id: {'id': voice_id, 'backend': 'coqui'})
+    monkeypatch.setattr(app_module, '_gtts_stream', lambda text: iter([b'mp3']))
+
+    source, chunks, _, extension = app_module.open_tts_stream('Hello.', 'local_coqui', 'tts-1', 'gtts')
+    assert (source, extension) == ('gtts', 'mp3')
+    assert list(chunks) == [b'mp3']
+    assert app_module.provider_router.breaker('local').consecutive_failures == 0
+
+
+def test_voice_clone_validation_leaves_breaker_untouched(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'ELEVENLABS_API_KEY', 'key')
+    monkeypatch.setattr(app_module, 'validate_voice_samples', lambda *args: (False, 'Audio too short'))
+    breaker = app_module.provider_router.breaker('elevenlabs')
+    monkeypatch.setattr(breaker, 'recovery_seconds', 0)
+    breaker.record_failure('down')
+    breaker.state = 'open'
+
+    result = app_module.create_voice_clone('Voice', '', ['sample.wav'], provider='elevenlabs')
+    assert result == (None, 'Audio too short')
+    # The half-open trial is still available for the next real request
+    assert breaker.allow_request()
+    breaker.record_success()
+
+
+def test_fallback_output_is_not_served_for_the_local_clone(app_module, monkeypatch):
+    from local_tts_models import local_voice_cloner
+    monkeypatch.setattr(local_voice_cloner, 'get_voice_info',
+                        lambda voice_id: {'id': voice_id, 'backend': 'xtts'})
+    local_calls = []
+
+    def fake_local(text, voice, filepath):
+        local_calls.append(text)
+        with open(filepath, 'wb') as f:
+            f.write(b'local')
+
+    def fake_gtts(text, filepath):
+        with open(filepath, 'wb') as f:
+            f.write(b'gtts')
+
+    monkeypatch.setattr(app_module, '_tts_local', fake_local)
+    monkeypatch.setattr(app_module, '_tts_gtts', fake_gtts)
+    upload = app_module.app.config['UPLOAD_FOLDER']
+
+    # A job or batch retry that skips the clone caches gTTS output...
+    skipped = app_module.text_to_speech_enhanced('Cache me.', 'local_clone', 'tts-1', 'gtts', {}, skip_local=True)
+    assert open(os.path.join(upload, skipped), 'rb').read() == b'gtts'
+
+    # ...which must not answer a normal request for the clone
+    filename = app_module.text_to_speech_enhanced('Cache me.', 'local_clone', 'tts-1', 'gtts', {})
+    assert local_calls == ['Cache me.']
+    assert filename != skipped
+    assert open(os.path.join(upload, filename), 'rb').read() == b'local'
+
+
+def test_mid_stream_failure_counts_against_the_provider(app_module, monkeypatch):
+    def dropping(text):
+        yield b'mp3'
+        raise ConnectionError('stream dropped')
+
+    monkeypatch.setattr(app_module, '_gtts_stream', dropping)
+    breaker = app_module.provider_router.breaker('gtts')
+    breaker.record_success()
+
+    response = app_module.app.test_client().post(
+        '/api/tts/stream', json={'text': 'Dropped stream.', 'voice': 'alloy', 'provider': 'gtts'})
+    assert response.status_code == 200
+    assert response.get_data() == b'mp3'
+    assert breaker.consecutive_failures == 1
+    assert breaker.last_error == 'stream dropped'
+    breaker.record_success()
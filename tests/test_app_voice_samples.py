@@ -0,0 +1,29 @@
+import numpy as np
+import soundfile as sf
+
+
+def write_sample(tmp_path, name, seconds, sample_rate=22050):
+    path = str(tmp_path / name)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    sf.write(path, 0.3 * np.sin(2 * np.pi * 220 * t), sample_rate)
+    return path
+
+
+def test_short_clips_pass_when_long_enough_together(app_module, tmp_path):
+    paths = [write_sample(tmp_path, f"clip{i}.wav", 4) for i in range(3)]
+    is_valid, message = app_module.validate_voice_samples(paths)
+    assert is_valid, message
+
+
+def test_short_clips_fail_when_too_short_together(app_module, tmp_path):
+    paths = [write_sample(tmp_path, f"clip{i}.wav", 3) for i in range(2)]
+    is_valid, message = app_module.validate_voice_samples(paths)
+    assert not is_valid
+    assert 'Minimum 10 seconds' in message
+
+
+def test_low_sample_rate_fails_per_file(app_module, tmp_path):
+    paths = [write_sample(tmp_path, 'good.wav', 12), write_sample(tmp_path, 'bad.wav', 12, 8000)]
+    is_valid, message = app_module.validate_voice_samples(paths)
+    assert not is_valid
+    assert '16kHz' in message
@@ -0,0 +1,73 @@
+import numpy as np
+import soundfile as sf
+
+from audio_ingest import StreamingResampler, decode_audio, detect_speech_chunks, resample
+
+SR = 16000
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def assert_no_overlap(ranges):
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end <= start
+
+
+def test_hard_splits_are_not_padded():
+    samples = np.concatenate([silence(1), tone(70), silence(1)])
+    ranges = detect_speech_chunks(samples, SR, max_chunk_seconds=30)
+    assert len(ranges) == 3
+    assert_no_overlap(ranges)
+    # Hard cuts leave contiguous ranges
+    assert ranges[0][1] == ranges[1][0]
+    assert ranges[1][1] == ranges[2][0]
+
+
+def test_silence_boundaries_are_padded_without_overlap():
+    samples = np.concatenate([silence(1), tone(20), silence(0.35), tone(20), silence(1)])
+    ranges = detect_speech_chunks(samples, SR, max_chunk_seconds=30)
+    assert len(ranges) == 2
+    assert_no_overlap(ranges)
+    # Padding reaches into the leading silence
+    assert ranges[0][0] < 1 * SR
+
+
+def run_streaming(samples, orig_rate, target_rate, block=4096):
+    resampler = StreamingResampler(orig_rate, target_rate)
+    parts = [resampler.process(samples[i:i + block]) for i in range(0, len(samples), block)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+def test_streaming_resampler_passes_equal_rates_through():
+    samples = np.random.default_rng(0).standard_normal(22050).astype(np.float32)
+    output = run_streaming(samples, 22050, 22050)
+    assert np.array_equal(output, samples)
+
+
+def test_streaming_resampler_matches_resample():
+    samples = np.random.default_rng(1).standard_normal(44100).astype(np.float32)
+    expected = resample(samples, 44100, 22050)
+    output = run_streaming(samples, 44100, 22050, block=1000)
+    assert len(output) == len(expected)
+    assert np.allclose(output, expected, atol=1e-5)
+
+
+def test_decode_audio_mixes_down_and_resamples(tmp_path):
+    rng = np.random.default_rng(2)
+    stereo = rng.uniform(-0.5, 0.5, (44100 * 3 + 17, 2)).astype(np.float32)
+    path = str(tmp_path / 'stereo.wav')
+    sf.write(path, stereo, 44100, subtype='FLOAT')
+
+    samples = decode_audio(path, 16000)
+    expected = resample(stereo.mean(axis=1), 44100, 16000)
+    assert samples.dtype == np.float32
+    assert len(samples) == len(expected)
+    assert np.allclose(samples, expected, atol=1e-5)
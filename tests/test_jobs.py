@@ -0,0 +1,45 @@
+import time
+
+from jobs import FAILED, SUCCEEDED, JobManager
+from storage import Storage
+
+
+def wait_for(manager, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_result_is_visible_to_another_process(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    manager = JobManager(max_threads=1, store=Storage(path))
+    job_id = manager.submit('tts', lambda text: {'filename': f"{text}.mp3"}, 'hello')
+    wait_for(manager, job_id)
+    manager.shutdown()
+
+    # A manager in another worker shares only the database
+    other = JobManager(store=Storage(path))
+    job = other.get(job_id)
+    assert job['status'] == SUCCEEDED
+    assert job['result'] == {'filename': 'hello.mp3'}
+    assert [j['id'] for j in other.list()] == [job_id]
+
+
+def test_failed_job_records_error():
+    manager = JobManager(max_threads=1)
+
+    def broken():
+        raise RuntimeError('provider down')
+
+    job = wait_for(manager, manager.submit('tts', broken))
+    manager.shutdown()
+    assert job['status'] == FAILED
+    assert job['error'] == 'provider down'
+
+
+def test_without_store_unknown_jobs_are_missing():
+    assert JobManager().get('missing') is None
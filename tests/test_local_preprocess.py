@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+import local_tts_models
+from local_tts_models import PREPROCESS_SAMPLE_RATE, local_voice_cloner
+
+
+@pytest.fixture
+def recording(tmp_path):
+    rng = np.random.default_rng(3)
+    t = np.arange(44100 * 3) / 44100
+    tone = 0.4 * np.sin(2 * np.pi * 180 * t)
+    stereo = np.stack([tone, tone * 0.5], axis=1) + 0.05 * rng.standard_normal((len(t), 2))
+    path = str(tmp_path / 'recording.wav')
+    sf.write(path, stereo.astype(np.float32), 44100, subtype='FLOAT')
+    return path
+
+
+def test_streamed_preprocessing_matches_whole_file(recording, tmp_path, monkeypatch):
+    # Several blocks per file, with a partial last block
+    monkeypatch.setattr(local_tts_models, 'PREPROCESS_BLOCK_SECONDS', 0.7)
+    whole = str(tmp_path / 'whole.wav')
+    streamed = str(tmp_path / 'streamed.wav')
+
+    assert local_voice_cloner.preprocess_audio(recording, whole)
+    assert local_voice_cloner.preprocess_audio(recording, streamed, streaming=True)
+
+    expected, expected_rate = sf.read(whole, dtype='float32')
+    output, output_rate = sf.read(streamed, dtype='float32')
+    assert expected_rate == output_rate == PREPROCESS_SAMPLE_RATE
+    assert len(output) == len(expected)
+    assert np.allclose(output, expected, atol=1e-4)
+
+
+def test_preprocess_batch_across_processes(recording, tmp_path):
+    outputs = [str(tmp_path / f'clean_{i}.wav') for i in range(2)]
+    results = local_voice_cloner.preprocess_batch([(recording, path) for path in outputs], max_workers=2)
+    assert results == [True, True]
+    first, _ = sf.read(outputs[0], dtype='float32')
+    second, _ = sf.read(outputs[1], dtype='float32')
+    assert np.array_equal(first, second)
+
+
+def test_preprocess_batch_reports_unreadable_files(tmp_path):
+    broken = tmp_path / 'broken.wav'
+    broken.write_bytes(b'not audio')
+    assert local_voice_cloner.preprocess_batch([(str(broken), str(tmp_path / 'out.wav'))]) == [False]
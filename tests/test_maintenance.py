@@ -0,0 +1,129 @@
+import os
+import time
+
+import pytest
+
+from maintenance import MaintenanceSweeper
+
+
+def make_dirs(tmp_path):
+    uploads = tmp_path / 'uploads'
+    models = tmp_path / 'voice_models'
+    uploads.mkdir()
+    models.mkdir()
+    return uploads, models
+
+
+def age(path, days):
+    stamp = time.time() - days * 86400
+    os.utime(path, (stamp, stamp))
+
+
+def make_voice(models, name, days_old=2):
+    voice = models / name
+    voice.mkdir()
+    (voice / 'voice_info.json').write_text('{}')
+    age(voice, days_old)
+    return voice
+
+
+def failing_read():
+    raise RuntimeError('database is locked')
+
+
+def test_prefs_read_failure_keeps_every_voice(tmp_path):
+    uploads, models = make_dirs(tmp_path)
+    voices = [make_voice(models, f"xtts_{i}") for i in range(3)]
+    forgotten = []
+    sweeper = MaintenanceSweeper(str(uploads), str(models), known_voices=failing_read,
+                                 forget_voices=forgotten.extend, prune_voices=True, interval=0)
+
+    report = sweeper.sweep()
+    assert all(voice.exists() for voice in voices)
+    assert report['orphaned_voices'] == 0
+    assert forgotten == []
+
+
+def test_orphans_are_pruned_unless_disabled(tmp_path):
+    uploads, models = make_dirs(tmp_path)
+    known = make_voice(models, 'xtts_known')
+    orphan = make_voice(models, 'xtts_orphan')
+    young = make_voice(models, 'xtts_young', days_old=0)
+
+    MaintenanceSweeper(str(uploads), str(models), known_voices=lambda: {'xtts_known'},
+                       prune_voices=False, interval=0).sweep()
+    assert orphan.exists()
+
+    report = MaintenanceSweeper(str(uploads), str(models), known_voices=lambda: {'xtts_known'},
+                                interval=0).sweep()
+    assert report['orphaned_voices'] == 1
+    assert known.exists() and young.exists() and not orphan.exists()
+
+
+def test_missing_voice_directories_are_forgotten(tmp_path):
+    uploads, models = make_dirs(tmp_path)
+    make_voice(models, 'xtts_present')
+    forgotten = set()
+    MaintenanceSweeper(str(uploads), str(models), known_voices=lambda: {'xtts_present', 'xtts_gone'},
+                       forget_voices=forgotten.update, interval=0).sweep()
+    assert forgotten == {'xtts_gone'}
+
+
+def test_retention_and_sample_retention(tmp_path):
+    uploads, models = make_dirs(tmp_path)
+    old_output = uploads / 'old.mp3'
+    old_sample = uploads / 'voice_sample_old.wav'
+    for path in (old_output, old_sample):
+        path.write_bytes(b'audio')
+        age(path, 10)
+
+    report = MaintenanceSweeper(str(uploads), str(models), retention_days=5,
+                                sample_retention_days=lambda: 30, interval=0).sweep()
+    assert report['expired_files'] == 1
+    assert not old_output.exists() and old_sample.exists()
+
+
+def test_retention_read_failure_keeps_samples(tmp_path):
+    uploads, models = make_dirs(tmp_path)
+    sample = uploads / 'voice_sample_old.wav'
+    sample.write_bytes(b'audio')
+    age(sample, 400)
+
+    MaintenanceSweeper(str(uploads), str(models), retention_days=5,
+                       sample_retention_days=failing_read, interval=0).sweep()
+    assert sample.exists()
+
+
+def test_quota_evicts_least_recently_used(tmp_path):
+    uploads, models = make_dirs(tmp_path)
+    for index, name in enumerate(['a.mp3', 'b.mp3', 'c.mp3']):
+        path = uploads / name
+        path.write_bytes(b'x' * 1000)
+        age(path, 3 - index)
+
+    report = MaintenanceSweeper(str(uploads), str(models), retention_days=0,
+                                quota_bytes=2000, interval=0).sweep()
+    assert report['evicted_files'] == 1
+    assert sorted(os.listdir(uploads)) == ['.maintenance.lock', 'b.mp3', 'c.mp3']
+
+
+def test_app_voice_registry_read_raises_when_storage_fails(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.storage, 'load_user_data', failing_read)
+    with pytest.raises(RuntimeError):
+        app_module.local_voice_ids()
+    with pytest.raises(RuntimeError):
+        app_module.voice_sample_retention_days()
+
+
+def test_sweep_expires_stored_records(tmp_path):
+    uploads, models = make_dirs(tmp_path)
+    calls = []
+
+    def expire(days):
+        calls.append(days)
+        return 3
+
+    report = MaintenanceSweeper(str(uploads), str(models), retention_days=7,
+                                expire_records=expire, interval=0).sweep()
+    assert calls == [7]
+    assert report['expired_records'] == 3
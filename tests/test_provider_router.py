@@ -0,0 +1,55 @@
+import pytest
+
+from provider_router import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ProviderRequestError, ProviderRouter
+)
+
+
+def fail():
+    raise RuntimeError('provider down')
+
+
+def reject():
+    raise ProviderRequestError('unknown voice')
+
+
+def test_circuit_opens_after_threshold_and_fails_fast():
+    router = ProviderRouter(probe_interval=3600)
+    router.register('remote', failure_threshold=2, recovery_seconds=3600)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            router.call('remote', fail)
+    assert router.breaker('remote').state == OPEN
+    with pytest.raises(CircuitOpenError):
+        router.call('remote', lambda: 'audio')
+
+
+def test_request_errors_do_not_count_as_failures():
+    router = ProviderRouter(probe_interval=3600)
+    router.register('remote', failure_threshold=1)
+    for _ in range(3):
+        with pytest.raises(ProviderRequestError):
+            router.call('remote', reject)
+    breaker = router.breaker('remote')
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_request_error_releases_half_open_trial():
+    breaker = CircuitBreaker('remote', failure_threshold=1, recovery_seconds=0)
+    breaker.record_failure('down')
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # Only one trial at a time
+    assert not breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+
+
+def test_success_closes_half_open_circuit():
+    router = ProviderRouter(probe_interval=3600)
+    router.register('remote', failure_threshold=1, recovery_seconds=0)
+    with pytest.raises(RuntimeError):
+        router.call('remote', fail)
+    assert router.call('remote', lambda: 'audio') == 'audio'
+    assert router.breaker('remote').state == CLOSED
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_app_import_defers_heavy_modules(tmp_path):
+    code = (
+        "import sys; sys.path.insert(0, {root!r}); import app; "
+        "print(','.join(name for name in ('requests', 'numpy', 'torch') if name in sys.modules))"
+    ).format(root=ROOT)
+    result = subprocess.run([sys.executable, '-c', code], cwd=str(tmp_path), capture_output=True,
+                            text=True, check=True, env=dict(os.environ, AUDIOALCHEMY_FAST_START='1'))
+    assert result.stdout.strip() == ''
+
+
+def test_openai_client_builds_its_session_on_first_use():
+    from openai_tts_client import OpenAITTSClient
+    client = OpenAITTSClient('http://127.0.0.1:9/v1/audio/speech', 'key')
+    assert client._session is None
+    assert client.session is client.session
+
+
+def test_startup_report_includes_the_local_model_pool(app_module, monkeypatch):
+    import local_tts_models
+    pool = local_tts_models.ModelPool(memory_budget_mb=0)
+    monkeypatch.setattr(local_tts_models, 'model_pool', pool)
+    monkeypatch.setattr(local_tts_models, '_estimate_model_bytes', lambda model: 1024)
+    pool.warm('xtts', object)
+
+    report = app_module.app.test_client().get('/api/startup').get_json()
+    assert report['model_pool']['resident_bytes'] == 1024
+    assert report['model_pool']['models'] == [{'key': 'xtts', 'size_bytes': 1024, 'in_use': 0}]
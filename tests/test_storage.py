@@ -0,0 +1,70 @@
+import threading
+
+from storage import Storage
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    storage = Storage(str(tmp_path / 'test.db'))
+    default = {'custom_voices': [], 'theme': 'light'}
+
+    def add_voice(index):
+        storage.update_user_data(default, lambda data: data['custom_voices'].append({'id': f'v{index}'}))
+
+    threads = [threading.Thread(target=add_voice, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    storage.update_user_data(default, lambda data: data.update(theme='dark'))
+    for thread in threads:
+        thread.join()
+
+    data = storage.load_user_data()
+    assert len(data['custom_voices']) == 20
+    assert data['theme'] == 'dark'
+
+
+def test_history_is_newest_first(tmp_path):
+    storage = Storage(str(tmp_path / 'test.db'))
+    for i in range(3):
+        storage.append_history({'id': str(i), 'timestamp': str(i), 'type': 'tts', 'content': f'text {i}'})
+    assert [entry['id'] for entry in storage.load_history(limit=2)] == ['2', '1']
+
+
+def test_job_states_are_shared_between_stores(tmp_path):
+    writer = Storage(str(tmp_path / 'test.db'))
+    reader = Storage(str(tmp_path / 'test.db'))
+    job = {'id': 'job1', 'kind': 'tts', 'status': 'queued', 'result': None}
+    writer.put_job(job)
+    writer.put_job({'id': 'job2', 'kind': 'tts', 'status': 'queued', 'result': None})
+    writer.put_job(dict(job, status='succeeded', result={'filename': 'a.mp3'}))
+
+    assert reader.get_job('job1')['result'] == {'filename': 'a.mp3'}
+    # Updating a job keeps its place in the listing
+    assert [j['id'] for j in reader.list_jobs()] == ['job2', 'job1']
+    assert reader.get_job('missing') is None
+
+
+def test_prune_removes_only_old_rows(tmp_path):
+    storage = Storage(str(tmp_path / 'test.db'))
+    old_id = storage.put_result('session', 'speech', {'filename': 'old.mp3'})
+    new_id = storage.put_result('session', 'speech', {'filename': 'new.mp3'})
+    storage.put_job({'id': 'old', 'kind': 'tts', 'status': 'succeeded'})
+    with storage.transaction() as conn:
+        conn.execute("UPDATE results SET created_at = datetime('now', '-40 days') WHERE id = ?", (old_id,))
+        conn.execute("UPDATE jobs SET updated_at = datetime('now', '-40 days')")
+    storage.put_job({'id': 'new', 'kind': 'tts', 'status': 'running'})
+
+    assert storage.prune_results(30) == 1
+    assert storage.prune_jobs(30) == 1
+    assert storage.get_result(old_id) is None
+    assert storage.get_result(new_id) is not None
+    assert [job['id'] for job in storage.list_jobs()] == ['new']
+
+
+def test_prune_removes_old_translations(tmp_path):
+    storage = Storage(str(tmp_path / 'test.db'))
+    storage.put_translations([('old', 'auto', 'fr', 'vieux'), ('new', 'auto', 'fr', 'neuf')])
+    with storage.transaction() as conn:
+        conn.execute("UPDATE translations SET created_at = datetime('now', '-40 days') WHERE key = 'old'")
+
+    assert storage.prune_translations(30) == 1
+    assert storage.get_translations(['old', 'new']) == {'new': 'neuf'}
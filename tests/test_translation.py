@@ -0,0 +1,54 @@
+from storage import Storage
+from translation import TranslationService, create_translator
+
+
+class CountingBackend:
+    """Passthrough backend that records every batch it is sent"""
+
+    name = 'passthrough'
+
+    def __init__(self):
+        self.batches = []
+
+    def translate_batch(self, texts, source, target):
+        self.batches.append(list(texts))
+        return create_translator('passthrough').translate_batch(texts, source, target)
+
+
+def test_passthrough_returns_text_unchanged():
+    service = TranslationService(create_translator('passthrough'))
+    assert service.translate('Hello', 'fr') == 'Hello'
+    assert service.stats()['provider'] == 'passthrough'
+
+
+def test_distinct_uncached_texts_go_to_the_backend_in_one_batch():
+    backend = CountingBackend()
+    service = TranslationService(backend)
+
+    assert service.translate_many(['one', 'two', 'one'], 'de') == ['one', 'two', 'one']
+    assert backend.batches == [['one', 'two']]
+
+
+def test_cached_translations_skip_the_backend(tmp_path):
+    storage = Storage(str(tmp_path / 'test.db'))
+    backend = CountingBackend()
+    TranslationService(backend, storage).translate_many(['one', 'two'], 'de')
+
+    service = TranslationService(backend, storage)
+    assert service.translate_many(['two', 'three', 'one'], 'de') == ['two', 'three', 'one']
+    assert backend.batches[-1] == ['three']
+    assert service.stats()['hits'] == 2
+    assert service.stats()['misses'] == 1
+
+    # The target language is part of the cache key
+    service.translate('one', 'fr')
+    assert backend.batches[-1] == ['one']
+
+
+def test_translate_endpoint_uses_the_configured_provider(app_module):
+    response = app_module.app.test_client().post(
+        '/api/translate', json={'texts': ['Good morning', 'Good night'], 'target_language': 'es'})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['translations'] == ['Good morning', 'Good night']
+    assert data['stats']['provider'] == 'passthrough'
@@ -0,0 +1,50 @@
+import json
+import os
+import zipfile
+
+from tts_batch import run_batch, write_zip
+
+
+def test_results_keep_input_order_across_groups():
+    items = [{'id': f'item{i}', 'text': f'text {i}', 'voice': 'a' if i % 2 else 'b'} for i in range(6)]
+    calls = []
+
+    def run_group(voice, group):
+        calls.append((voice, [item['id'] for item in group]))
+        return [{'status': 'ok', 'voice': voice, 'text': item['text']} for item in group]
+
+    results = run_batch(items, lambda item: item['voice'], run_group)
+    assert sorted(calls) == [('a', ['item1', 'item3', 'item5']), ('b', ['item0', 'item2', 'item4'])]
+    assert [result['id'] for result in results] == [item['id'] for item in items]
+    assert [result['index'] for result in results] == list(range(6))
+    assert all(result['text'] == item['text'] for result, item in zip(results, items))
+
+
+def test_failing_group_only_fails_its_items():
+    items = [{'voice': 'good'}, {'voice': 'bad'}, {'voice': 'good'}]
+
+    def run_group(voice, group):
+        if voice == 'bad':
+            raise RuntimeError('model missing')
+        return [{'status': 'ok'} for _ in group]
+
+    results = run_batch(items, lambda item: item['voice'], run_group)
+    assert [result['status'] for result in results] == ['ok', 'error', 'ok']
+    assert results[1]['error'] == 'model missing'
+
+
+def test_zip_holds_audio_and_manifest(tmp_path):
+    with open(os.path.join(tmp_path, 'speech.mp3'), 'wb') as f:
+        f.write(b'audio')
+    results = [
+        {'index': 0, 'status': 'ok', 'filename': 'speech.mp3', 'url': '/uploads/speech.mp3'},
+        {'index': 1, 'status': 'error', 'error': 'too long'}
+    ]
+    zip_path = write_zip(results, str(tmp_path), str(tmp_path / 'batch.zip'))
+
+    with zipfile.ZipFile(zip_path) as archive:
+        assert sorted(archive.namelist()) == ['00000.mp3', 'manifest.json']
+        assert archive.read('00000.mp3') == b'audio'
+        manifest = json.loads(archive.read('manifest.json'))
+    assert manifest[0]['file'] == '00000.mp3' and 'url' not in manifest[0]
+    assert manifest[1] == {'index': 1, 'status': 'error', 'error': 'too long'}
@@ -0,0 +1,51 @@
+import os
+
+from tts_cache import TTSCache, is_cache_filename, make_cache_key
+
+
+def write(directory, name, size):
+    with open(os.path.join(directory, name), 'wb') as f:
+        f.write(b'x' * size)
+    return name
+
+
+def test_cache_key_covers_every_input():
+    key = make_cache_key(text='Hello', voice='alloy', speed=1.0)
+    assert key == make_cache_key(speed=1.0, voice='alloy', text='Hello')
+    assert key != make_cache_key(text='Hello', voice='alloy', speed=1.25)
+
+
+def test_put_then_get_hits(tmp_path):
+    cache = TTSCache(str(tmp_path))
+    key = make_cache_key(text='Hello')
+    assert cache.get(key) is None
+
+    name = cache.put(key, write(str(tmp_path), 'generated.mp3', 10))
+    assert is_cache_filename(name)
+    assert cache.get(key) == name
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=25)
+    keys = [make_cache_key(text=str(i)) for i in range(3)]
+    cache.put(keys[0], write(str(tmp_path), 'a.mp3', 10))
+    cache.put(keys[1], write(str(tmp_path), 'b.mp3', 10))
+    cache.get(keys[0])
+    cache.put(keys[2], write(str(tmp_path), 'c.mp3', 10))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) and cache.get(keys[2])
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_are_shared_through_the_directory(tmp_path):
+    key = make_cache_key(text='Hello')
+    name = TTSCache(str(tmp_path)).put(key, write(str(tmp_path), 'generated.mp3', 10))
+
+    other = TTSCache(str(tmp_path))
+    assert other.stats()['entries'] == 1
+    assert other.get(key) == name
+    assert other.discard(name)
+    assert not other.discard(name)
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from tts_segments import split_text, synthesize_segments
+
+
+def test_segments_respect_limit_and_keep_all_words():
+    text = ' '.join(f"Sentence number {i} is here." for i in range(40))
+    segments = split_text(text, max_chars=100)
+    assert len(segments) > 1
+    assert all(len(segment) <= 100 for segment in segments)
+    assert ' '.join(segments).split() == text.split()
+
+
+def test_short_sentences_are_merged():
+    assert split_text('One. Two. Three.', max_chars=100) == ['One. Two. Three.']
+
+
+def test_overlong_sentence_splits_at_clauses_then_words():
+    sentence = 'first clause, ' + ' '.join(['word'] * 60) + '.'
+    segments = split_text(sentence, max_chars=50)
+    assert segments[0].startswith('first clause')
+    assert all(len(segment) <= 50 for segment in segments)
+
+
+def test_synthesis_preserves_order_and_bounds_concurrency():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def synthesize(segment):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return f"{segment}.mp3", 'local'
+
+    results = synthesize_segments([str(i) for i in range(6)], synthesize, 'local')
+    assert results == [(f"{i}.mp3", 'local') for i in range(6)]
+    assert peak == 1
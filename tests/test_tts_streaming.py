@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from tts_streaming import StreamTee, prime_stream
+
+
+def locked_producer(lock, chunks):
+    # Mirrors synthesize_speech_stream: a thread-owned lock held across yield
+    with lock:
+        for chunk in chunks:
+            yield chunk
+
+
+def test_lock_held_across_yield_survives_thread_handoff(tmp_path):
+    lock = threading.RLock()
+    completed = threading.Event()
+    target = tmp_path / 'out.wav'
+
+    chunks, _ = prime_stream(locked_producer(lock, [b'a', b'b', b'c']))
+    tee = StreamTee(chunks, str(target), on_complete=lambda path: completed.set())
+
+    assert b''.join(tee) == b'abc'
+    assert completed.wait(5)
+    assert target.read_bytes() == b'abc'
+    # Another thread can take the lock, so the producer released it
+    acquired = []
+    worker = threading.Thread(target=lambda: acquired.append(lock.acquire(timeout=1)))
+    worker.start()
+    worker.join()
+    assert acquired == [True]
+
+
+def test_first_chunk_error_is_raised_on_the_caller():
+    def failing():
+        raise ValueError("Voice not found")
+        yield b''
+
+    with pytest.raises(ValueError, match="Voice not found"):
+        prime_stream(failing())
+
+
+def test_empty_stream_raises_stop_iteration():
+    with pytest.raises(StopIteration):
+        prime_stream(iter([]))
+
+
+def test_keep_alive_chunks_are_skipped():
+    chunks, first_chunk_ms = prime_stream(iter([b'', b'', b'x', b'y']))
+    assert list(chunks) == [b'x', b'y']
+    assert first_chunk_ms >= 0
+
+
+def test_mid_stream_failure_reaches_on_error(tmp_path):
+    def dropping():
+        yield b'a'
+        raise ConnectionError('stream dropped')
+
+    errors = []
+    completed = []
+    target = tmp_path / 'out.mp3'
+    chunks, _ = prime_stream(dropping())
+    tee = StreamTee(chunks, str(target), on_complete=completed.append, on_error=errors.append)
+
+    assert b''.join(tee) == b'a'
+    assert [str(e) for e in errors] == ['stream dropped']
+    assert completed == []
+    assert not target.exists()
+
+
+def test_on_complete_failure_is_not_a_producer_error(tmp_path):
+    def broken_history(path):
+        raise RuntimeError('database is locked')
+
+    errors = []
+    tee = StreamTee(iter([b'a']), str(tmp_path / 'out.mp3'), on_complete=broken_history,
+                    on_error=errors.append)
+    assert b''.join(tee) == b'a'
+    assert errors == []
@@ -0,0 +1,56 @@
+import io
+import os
+import struct
+
+import pytest
+
+from upload_stream import UploadRejected, check_upload_headers, sniff_audio_format, stream_upload
+
+
+def wav_bytes(seconds=1, sample_rate=22050):
+    frames = b'\x00\x00' * int(seconds * sample_rate)
+    header = b'RIFF' + struct.pack('<I', 36 + len(frames)) + b'WAVE'
+    header += b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    header += b'data' + struct.pack('<I', len(frames))
+    return header + frames
+
+
+def test_upload_is_named_by_hash(tmp_path):
+    body = wav_bytes()
+    info = stream_upload(io.BytesIO(body), str(tmp_path), prefix='voice_sample_')
+    assert info['format'] == 'wav'
+    assert info['size'] == len(body)
+    assert info['filename'] == f"voice_sample_{info['sha256'][:32]}.wav"
+    assert os.listdir(tmp_path) == [info['filename']]
+
+
+def test_repeat_upload_reuses_file_and_refreshes_mtime(tmp_path):
+    body = wav_bytes()
+    first = stream_upload(io.BytesIO(body), str(tmp_path))
+    os.utime(first['path'], (1000, 1000))
+
+    second = stream_upload(io.BytesIO(body), str(tmp_path))
+    assert second['path'] == first['path']
+    assert os.listdir(tmp_path) == [first['filename']]
+    assert os.path.getmtime(second['path']) > 1000
+
+
+def test_non_audio_is_rejected_and_cleaned_up(tmp_path):
+    with pytest.raises(UploadRejected) as excinfo:
+        stream_upload(io.BytesIO(b'<html>not audio</html>'), str(tmp_path))
+    assert excinfo.value.status == 415
+    assert os.listdir(tmp_path) == []
+
+
+def test_oversize_upload_is_rejected(tmp_path):
+    with pytest.raises(UploadRejected) as excinfo:
+        stream_upload(io.BytesIO(wav_bytes()), str(tmp_path), max_bytes=1024)
+    assert excinfo.value.status == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_headers_and_magic_bytes():
+    assert sniff_audio_format(b'fLaC' + b'\x00' * 12) == 'flac'
+    assert sniff_audio_format(b'\x00' * 16) is None
+    with pytest.raises(UploadRejected):
+        check_upload_headers('text/html', 10)
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from voice_catalog import VoiceCatalog
+
+
+def test_get_returns_immediately_and_fills_in_background():
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        return ['Rachel', 'Adam']
+
+    catalog = VoiceCatalog(fetch, ttl=3600)
+    # Nothing fetched yet: served empty without waiting on the remote call
+    assert catalog.get() == []
+    release.set()
+    deadline = time.monotonic() + 5
+    while catalog.stats()['voices'] is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert catalog.get() == ['Rachel', 'Adam']
+    assert catalog.stats()['stale'] is False
+
+
+def test_failed_refresh_keeps_previous_listing():
+    responses = [['Rachel'], RuntimeError('API down')]
+
+    def fetch():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    catalog = VoiceCatalog(fetch, ttl=3600)
+    assert catalog.refresh()
+    assert not catalog.refresh()
+    assert catalog.get() == ['Rachel']
+    assert catalog.stats()['last_error'] == 'API down'
+
+
+def test_only_one_refresh_runs_at_a_time():
+    release = threading.Event()
+    catalog = VoiceCatalog(lambda: release.wait(5) and [], ttl=0)
+    assert catalog.refresh_async()
+    assert not catalog.refresh_async()
+    release.set()
+
+
+def test_catalog_filled_before_fork_is_served_by_a_fresh_worker():
+    import multiprocessing
+
+    catalog = VoiceCatalog(lambda: ['Rachel'], ttl=3600)
+    catalog.refresh()
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    # Like a Gunicorn worker forked after the master warmed the catalog
+    worker = context.Process(target=lambda: results.put(catalog.get()))
+    worker.start()
+    worker.join(5)
+    assert results.get(timeout=5) == ['Rachel']
+
+
+def test_serve_warms_the_catalog_before_forking(app_module, monkeypatch):
+    import serve
+
+    calls = []
+    monkeypatch.setattr(app_module, 'warm_voice_catalog', lambda wait=False: calls.append(wait))
+    monkeypatch.setattr(serve, 'preload', lambda: None)
+    assert serve.AudioAlchemyServer(app_module.app).load() is app_module.app
+    assert calls == [True]
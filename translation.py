@@ -0,0 +1,171 @@
+"""
+Translation Service for AudioAlchemy
+Cached, batched translation with pluggable online and offline backends
+"""
+
+import os
+import hashlib
+import logging
+from typing import List, Dict, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Backend used by the global service: google, argos or passthrough
+TRANSLATION_PROVIDER = os.getenv('TRANSLATION_PROVIDER', 'google')
+
+# Google Translate rejects requests over 5000 characters
+MAX_BATCH_CHARS = 4500
+
+
+class GoogleTranslatorBackend:
+    """Google Translate through deep_translator, packing segments into few requests"""
+
+    name = 'google'
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        from deep_translator import GoogleTranslator
+
+        translator = GoogleTranslator(source=source, target=target)
+        results: List[Optional[str]] = [None] * len(texts)
+
+        # Segments joined by newlines come back line for line; anything that
+        # contains its own newlines is sent on its own
+        batch: List[int] = []
+        batch_chars = 0
+        for index, text in enumerate(texts):
+            if '\n' in text or len(text) > MAX_BATCH_CHARS:
+                results[index] = translator.translate(text)
+                continue
+            if batch and batch_chars + len(text) + 1 > MAX_BATCH_CHARS:
+                self._translate_joined(translator, texts, batch, results)
+                batch, batch_chars = [], 0
+            batch.append(index)
+            batch_chars += len(text) + 1
+        if batch:
+            self._translate_joined(translator, texts, batch, results)
+
+        return results
+
+    @staticmethod
+    def _translate_joined(translator, texts: List[str], indexes: List[int], results: List[Optional[str]]):
+        if len(indexes) == 1:
+            results[indexes[0]] = translator.translate(texts[indexes[0]])
+            return
+
+        translated = translator.translate('\n'.join(texts[i] for i in indexes))
+        lines = translated.split('\n') if translated else []
+        if len(lines) == len(indexes):
+            for i, line in zip(indexes, lines):
+                results[i] = line.strip()
+        else:
+            # The provider merged or split lines; fall back to one call per segment
+            for i in indexes:
+                results[i] = translator.translate(texts[i])
+
+
+class ArgosTranslatorBackend:
+    """Offline translation with argos-translate models installed on this machine"""
+
+    name = 'argos'
+
+    def __init__(self, default_source: str = 'en'):
+        self.default_source = default_source
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        import argostranslate.translate
+
+        # Argos needs an explicit source language
+        source = self.default_source if source == 'auto' else source
+        return [argostranslate.translate.translate(text, source, target) for text in texts]
+
+
+class PassthroughTranslatorBackend:
+    """Returns text unchanged; a stand-in for tests and air-gapped deployments"""
+
+    name = 'passthrough'
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        return list(texts)
+
+
+_BACKENDS: Dict[str, Callable[[], object]] = {
+    'google': GoogleTranslatorBackend,
+    'argos': ArgosTranslatorBackend,
+    'passthrough': PassthroughTranslatorBackend,
+}
+
+
+def register_translator(name: str, factory: Callable[[], object]):
+    """Make a translator backend available under ``name``
+
+    A backend is any object with a ``name`` attribute and a
+    ``translate_batch(texts, source, target)`` method returning one
+    translation per input text.
+    """
+    _BACKENDS[name] = factory
+
+
+def create_translator(name: str):
+    if name not in _BACKENDS:
+        raise ValueError(f"Unsupported translation provider: {name}")
+    return _BACKENDS[name]()
+
+
+class TranslationService:
+    """Translates through a backend with a persistent cache in front of it"""
+
+    def __init__(self, backend, storage=None):
+        self.backend = backend
+        self.storage = storage
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_key(self, text: str, source: str, target: str) -> str:
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{self.backend.name}:{source}:{target}:{digest}"
+
+    def translate(self, text: str, target: str, source: str = 'auto') -> str:
+        """Translate a single text"""
+        return self.translate_many([text], target, source)[0]
+
+    def translate_many(self, texts: List[str], target: str, source: str = 'auto') -> List[str]:
+        """Translate several texts, sending only uncached ones to the backend in one batch"""
+        keys = [self._cache_key(text, source, target) for text in texts]
+        cached: Dict[str, str] = {}
+        if self.storage is not None:
+            try:
+                cached = self.storage.get_translations(list(set(keys)))
+            except Exception as e:
+                logger.warning(f"Translation cache lookup failed: {e}")
+
+        # Translate each distinct missing text once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        self.hits += len(texts) - sum(1 for key in keys if key in missing)
+        self.misses += len(missing)
+
+        if missing:
+            translated = self.backend.translate_batch(list(missing.values()), source, target)
+            fresh = dict(zip(missing.keys(), translated))
+            cached.update(fresh)
+            if self.storage is not None:
+                try:
+                    self.storage.put_translations([
+                        (key, source, target, value) for key, value in fresh.items() if value is not None
+                    ])
+                except Exception as e:
+                    logger.warning(f"Translation cache write failed: {e}")
+
+        return [cached[key] for key in keys]
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            'provider': self.backend.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,130 @@
+"""
+TTS Output Cache for AudioAlchemy
+Content-addressed store of synthesized audio with size-bounded LRU eviction
+"""
+
+import os
+import json
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Total size of cached audio kept on disk
+TTS_CACHE_MAX_MB = float(os.getenv('TTS_CACHE_MAX_MB', '1024'))
+
+CACHE_PREFIX = 'tts_'
+
+
+def make_cache_key(**inputs) -> str:
+    """Hash everything that influences the synthesized audio"""
+    payload = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def is_cache_filename(filename: str) -> bool:
+    """Check whether a file name belongs to the content-addressed cache"""
+    stem = filename.split('.', 1)[0]
+    return stem.startswith(CACHE_PREFIX) and len(stem) == len(CACHE_PREFIX) + 32
+
+
+class TTSCache:
+    """Size-bounded cache of TTS artifacts keyed by a hash of the request
+
+    File names are derived from the key, so every worker process sharing the
+    directory sees the same entries. Recency is tracked with file mtimes,
+    which hits refresh, and the least recently used files are evicted once
+    the total size exceeds the budget.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = int(TTS_CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Rebuild the LRU order from the files already on disk"""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and is_cache_filename(entry.name):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+
+    def filename_for(self, key: str, extension: str = 'mp3') -> str:
+        """The content-addressed file name used for a key"""
+        return f"{CACHE_PREFIX}{key[:32]}.{extension}"
+
+    def get(self, key: str, extension: str = 'mp3') -> Optional[str]:
+        """Return the cached file name for a key, or None on a miss"""
+        filename = self.filename_for(key, extension)
+        path = os.path.join(self.directory, filename)
+        with self._lock:
+            if not os.path.exists(path):
+                self._entries.pop(filename, None)
+                self.misses += 1
+                return None
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            # Another worker may have written this entry
+            self._entries[filename] = os.path.getsize(path)
+            self._entries.move_to_end(filename)
+            self.hits += 1
+            return filename
+
+    def put(self, key: str, filename: str) -> str:
+        """Move a freshly generated file into the cache and return its cached name"""
+        extension = filename.rsplit('.', 1)[-1]
+        cached_name = self.filename_for(key, extension)
+        source = os.path.join(self.directory, filename)
+        target = os.path.join(self.directory, cached_name)
+        with self._lock:
+            os.replace(source, target)
+            self._entries[cached_name] = os.path.getsize(target)
+            self._entries.move_to_end(cached_name)
+            self._evict_locked()
+        return cached_name
+
+    def _evict_locked(self):
+        if self.max_bytes <= 0:
+            return
+        total = sum(self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            total -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+                self.evictions += 1
+            except OSError as e:
+                logger.warning(f"Could not evict cached TTS file {name}: {e}")
+
+    def discard(self, filename: str) -> bool:
+        """Forget a cached file that was removed by someone else"""
+        with self._lock:
+            return self._entries.pop(filename, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': sum(self._entries.values()),
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,112 @@
+"""
+Long-Text Segmentation for AudioAlchemy TTS
+Splits text into sentences, synthesizes them concurrently and stitches the audio
+"""
+
+import os
+import re
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Texts longer than this are synthesized sentence by sentence
+LONG_TEXT_CHARS = int(os.getenv('TTS_LONG_TEXT_CHARS', '400'))
+
+# Upper bound on the length of one synthesized segment
+MAX_SEGMENT_CHARS = int(os.getenv('TTS_MAX_SEGMENT_CHARS', '250'))
+
+# Overlap between consecutive segments to hide the seams
+CROSSFADE_MS = int(os.getenv('TTS_CROSSFADE_MS', '30'))
+
+# Concurrent segment requests per provider, shared by all requests in the
+# process. Local models run one inference at a time on the shared pool.
+PROVIDER_CONCURRENCY = {
+    'local': 1,
+    'elevenlabs': int(os.getenv('TTS_ELEVENLABS_CONCURRENCY', '3')),
+    'openai': int(os.getenv('TTS_OPENAI_CONCURRENCY', '4')),
+    'gtts': int(os.getenv('TTS_GTTS_CONCURRENCY', '2')),
+}
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…。！？])["\')\]]*\s+')
+_CLAUSE_END = re.compile(r'(?<=[,;:])\s+')
+
+_provider_slots = {name: threading.BoundedSemaphore(limit) for name, limit in PROVIDER_CONCURRENCY.items()}
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Break an overlong sentence at clause boundaries, then at word boundaries"""
+    pieces = []
+    for clause in _CLAUSE_END.split(sentence):
+        while len(clause) > max_chars:
+            cut = clause.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(clause[:cut].strip())
+            clause = clause[cut:].strip()
+        if clause:
+            pieces.append(clause)
+    return pieces
+
+
+def split_text(text: str, max_chars: int = MAX_SEGMENT_CHARS) -> List[str]:
+    """Split text into sentence-aligned segments of at most ``max_chars``
+
+    Short neighbouring sentences are merged so that segments stay close to
+    the limit, which keeps prosody natural and the number of calls low.
+    """
+    pieces = []
+    for paragraph in text.split('\n'):
+        for sentence in _SENTENCE_END.split(paragraph.strip()):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if len(sentence) > max_chars:
+                pieces.extend(_split_long(sentence, max_chars))
+            else:
+                pieces.append(sentence)
+
+    segments: List[str] = []
+    for piece in pieces:
+        if segments and len(segments[-1]) + 1 + len(piece) <= max_chars:
+            segments[-1] = f"{segments[-1]} {piece}"
+        else:
+            segments.append(piece)
+    return segments
+
+
+def synthesize_segments(segments: List[str], synthesize: Callable[[str], Tuple[Optional[str], Optional[str]]],
+                        provider: str) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Run ``synthesize`` over the segments concurrently, preserving order
+
+    ``synthesize`` returns ``(path, source)`` for one segment. Fan-out is
+    bounded per provider across all requests in the process.
+    """
+    slots = _provider_slots.get(provider, _provider_slots['gtts'])
+    workers = max(1, min(len(segments), PROVIDER_CONCURRENCY.get(provider, 1)))
+
+    def run(segment):
+        with slots:
+            return synthesize(segment)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'tts-{provider}') as executor:
+        return list(executor.map(run, segments))
+
+
+def stitch_audio(paths: List[str], output_path: str, crossfade_ms: int = CROSSFADE_MS,
+                 output_format: str = 'mp3') -> None:
+    """Concatenate audio files in order with short crossfades"""
+    from pydub import AudioSegment
+
+    combined = None
+    for path in paths:
+        segment = AudioSegment.from_file(path)
+        if combined is None:
+            combined = segment
+        else:
+            fade = min(crossfade_ms, len(combined), len(segment))
+            combined = combined.append(segment, crossfade=fade)
+
+    combined.export(output_path, format=output_format)
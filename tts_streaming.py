@@ -0,0 +1,178 @@
+"""
+Streaming TTS Helpers for AudioAlchemy
+Tees audio chunks to the HTTP response and to disk as providers produce them
+"""
+
+import os
+import time
+import uuid
+import queue
+import struct
+import threading
+import logging
+from typing import Iterable, Iterator, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Time-to-first-audio target; slower streams are logged as warnings
+TTS_FIRST_CHUNK_TARGET_MS = float(os.getenv('TTS_FIRST_CHUNK_TARGET_MS', '1500'))
+
+_DONE = object()
+
+
+class _ChunkError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def threaded_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Run a chunk producer to completion on its own thread and hand the chunks over a queue
+
+    Producers may hold thread-owned locks across ``yield`` (the local model
+    pool does), so the generator must be started, resumed and closed on one
+    thread even when its consumers change threads. The queue is unbounded so
+    the producer always finishes and releases its locks, whoever reads it.
+    """
+    handoff: "queue.Queue" = queue.Queue()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                handoff.put(chunk)
+        except BaseException as e:
+            handoff.put(_ChunkError(e))
+        finally:
+            handoff.put(_DONE)
+
+    threading.Thread(target=produce, name='tts-stream-producer', daemon=True).start()
+
+    def consume():
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _ChunkError):
+                raise item.error
+            yield item
+
+    return consume()
+
+
+def prime_stream(chunks: Iterable[bytes]) -> Tuple[Iterator[bytes], float]:
+    """Pull the first chunk so provider failures surface before a response starts
+
+    The producer runs on its own thread (see ``threaded_chunks``). Returns an
+    iterator that replays the first chunk followed by the rest, and the time
+    in milliseconds it took to get the first chunk.
+    """
+    started = time.monotonic()
+    iterator = threaded_chunks(chunks)
+    first = b''
+    # Skip empty keep-alive chunks some providers send before audio
+    while not first:
+        first = next(iterator)
+    first_chunk_ms = (time.monotonic() - started) * 1000
+
+    if first_chunk_ms > TTS_FIRST_CHUNK_TARGET_MS:
+        logger.warning(f"TTS first chunk took {first_chunk_ms:.0f}ms "
+                       f"(target {TTS_FIRST_CHUNK_TARGET_MS:.0f}ms)")
+
+    def replay():
+        yield first
+        yield from iterator
+
+    return replay(), first_chunk_ms
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """WAV header with placeholder sizes for a stream of unknown length"""
+    byte_rate = sample_rate * channels * bits_per_sample // 8
+    block_align = channels * bits_per_sample // 8
+    unknown = 0xFFFFFFFF
+    return (
+        b'RIFF' + struct.pack('<I', unknown) + b'WAVE'
+        + b'fmt ' + struct.pack('<IHHIIHH', 16, 1, channels, sample_rate,
+                                byte_rate, block_align, bits_per_sample)
+        + b'data' + struct.pack('<I', unknown)
+    )
+
+
+def finalize_wav_header(path: str) -> None:
+    """Replace the placeholder sizes of a streamed WAV file with real ones"""
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.seek(4)
+        f.write(struct.pack('<I', size - 8))
+        f.seek(40)
+        f.write(struct.pack('<I', size - 44))
+
+
+class StreamTee:
+    """Drive a chunk producer on a background thread, writing every chunk to disk
+
+    The HTTP response iterates the same chunks through a queue. The file is
+    completed even if the client disconnects part way through, so history and
+    downloads keep working for streamed output. ``on_error`` receives an
+    error raised by the producer itself, e.g. a provider dropping the stream.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], filepath: str,
+                 on_complete: Optional[Callable[[str], None]] = None,
+                 finalize: Optional[Callable[[str], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.filepath = filepath
+        self.on_complete = on_complete
+        self.finalize = finalize
+        self.on_error = on_error
+        self._chunks = chunks
+        self._queue: "queue.Queue" = queue.Queue()
+        self._client_gone = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _produce(self):
+        # Unique per stream so concurrent requests for one cached name don't collide
+        partial_path = f"{self.filepath}.{uuid.uuid4().hex[:8]}.part"
+        producer_error = None
+        try:
+            with open(partial_path, 'wb') as f:
+                chunks = iter(self._chunks)
+                while True:
+                    try:
+                        chunk = next(chunks)
+                    except StopIteration:
+                        break
+                    except Exception as e:
+                        producer_error = e
+                        raise
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    if not self._client_gone.is_set():
+                        self._queue.put(chunk)
+            if self.finalize:
+                self.finalize(partial_path)
+            os.replace(partial_path, self.filepath)
+            if self.on_complete:
+                self.on_complete(self.filepath)
+        except Exception as e:
+            logger.error(f"Streaming TTS failed for {self.filepath}: {str(e)}")
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            if producer_error is not None and self.on_error:
+                self.on_error(producer_error)
+        finally:
+            self._queue.put(_DONE)
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is _DONE:
+                    return
+                yield chunk
+        finally:
+            # Stop buffering for a client that went away; the file still completes
+            self._client_gone.set()
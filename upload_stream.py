@@ -0,0 +1,150 @@
+"""
+Streamed Uploads for AudioAlchemy
+Writes request bodies to disk in chunks while hashing, size-limiting and sniffing the audio format
+"""
+
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Optional, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# Largest voice sample accepted, in megabytes
+VOICE_UPLOAD_MAX_MB = float(os.getenv('VOICE_UPLOAD_MAX_MB', '50'))
+VOICE_UPLOAD_MAX_BYTES = int(VOICE_UPLOAD_MAX_MB * 1024 * 1024)
+
+# Bytes received before the header probe starts, while the rest is still uploading
+UPLOAD_PROBE_BYTES = int(os.getenv('UPLOAD_PROBE_BYTES', str(256 * 1024)))
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# Content types accepted for a raw sample body; the magic bytes decide the format
+AUDIO_CONTENT_TYPES = {
+    'audio/wav', 'audio/x-wav', 'audio/wave', 'audio/mpeg', 'audio/mp3', 'audio/flac',
+    'audio/x-flac', 'audio/ogg', 'audio/mp4', 'audio/x-m4a', 'audio/m4a', 'application/octet-stream'
+}
+
+# Probes of partial uploads run here so the request thread keeps reading
+_probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='upload-probe')
+
+
+class UploadRejected(Exception):
+    """The upload was refused; ``status`` is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def sniff_audio_format(head: bytes) -> Optional[str]:
+    """File extension for an audio format recognized from its first bytes, else None"""
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    if head[:4] == b'fLaC':
+        return 'flac'
+    if head[:4] == b'OggS':
+        return 'ogg'
+    if head[4:8] == b'ftyp':
+        return 'm4a'
+    if head[:3] == b'ID3' or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return 'mp3'
+    return None
+
+
+def check_upload_headers(content_type: Optional[str], content_length: Optional[int],
+                         max_bytes: int = VOICE_UPLOAD_MAX_BYTES) -> None:
+    """Reject a request from its headers alone, before any of the body is read"""
+    if content_type not in AUDIO_CONTENT_TYPES:
+        raise UploadRejected(f"Unsupported content type: {content_type or 'none'}", 415)
+    if content_length is not None and content_length > max_bytes:
+        raise UploadRejected(f"Upload too large: maximum {max_bytes // (1024 * 1024)} MB", 413)
+
+
+def _check_probe(future: Future) -> Optional[Dict[str, Any]]:
+    try:
+        info = future.result()
+    except ValueError as e:
+        # A partial file may not be parseable yet (e.g. m4a indexes at the end);
+        # the complete file is validated again after the upload
+        logger.debug(f"Early header probe inconclusive: {e}")
+        return None
+    if info['sample_rate'] and info['sample_rate'] < 16000:
+        raise UploadRejected("Audio quality too low. Minimum 16kHz sample rate required.")
+    return info
+
+
+def stream_upload(stream: BinaryIO, directory: str, prefix: str = '',
+                  max_bytes: int = VOICE_UPLOAD_MAX_BYTES, content_length: Optional[int] = None) -> Dict[str, Any]:
+    """Copy an upload body to ``directory`` in chunks and return its path, sha256, size and format
+
+    The body goes to a ``.part`` file that is renamed only once it is
+    complete, named after its hash so a repeated upload reuses the existing
+    file. Non-audio bodies are rejected on their first bytes, oversize ones
+    as soon as the limit is passed, and low sample rates as soon as the
+    header probe on the partial file finishes.
+    """
+    if content_length is not None and content_length > max_bytes:
+        raise UploadRejected(f"Upload too large: maximum {max_bytes // (1024 * 1024)} MB", 413)
+
+    digest = hashlib.sha256()
+    part_path = os.path.join(directory, f"{prefix}{os.urandom(8).hex()}.part")
+    size = 0
+    head = b''
+    extension = None
+    probe: Optional[Future] = None
+    probe_info = None
+    try:
+        with open(part_path, 'wb') as f:
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejected(f"Upload too large: maximum {max_bytes // (1024 * 1024)} MB", 413)
+                if extension is None:
+                    head += chunk[:16 - len(head)]
+                    if len(head) >= 12:
+                        extension = sniff_audio_format(head)
+                        if extension is None:
+                            raise UploadRejected("Unsupported audio format", 415)
+                digest.update(chunk)
+                f.write(chunk)
+
+                if probe is None and size >= UPLOAD_PROBE_BYTES:
+                    # Imported here so the app starts without numpy
+                    from audio_ingest import probe_audio
+                    f.flush()
+                    probe = _probe_executor.submit(probe_audio, part_path)
+                elif probe is not None and probe_info is None and probe.done():
+                    probe_info = _check_probe(probe) or {}
+
+        if size == 0:
+            raise UploadRejected("Empty upload")
+        if extension is None:
+            extension = sniff_audio_format(head)
+            if extension is None:
+                raise UploadRejected("Unsupported audio format", 415)
+        if probe is not None and probe_info is None:
+            _check_probe(probe)
+    except BaseException:
+        if probe is not None:
+            probe.cancel()
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+
+    sha256 = digest.hexdigest()
+    filename = f"{prefix}{sha256[:32]}.{extension}"
+    path = os.path.join(directory, filename)
+    if os.path.exists(path):
+        os.remove(part_path)
+        # A repeat upload counts as fresh, so retention and LRU eviction keep it
+        os.utime(path, None)
+    else:
+        os.replace(part_path, path)
+    return {'path': path, 'filename': filename, 'sha256': sha256, 'size': size, 'format': extension}
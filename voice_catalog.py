@@ -0,0 +1,106 @@
+"""
+Voice Catalog Cache for AudioAlchemy
+Stale-while-revalidate cache for remote voice listings, refreshed in the background
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Callable, List, Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched voice listing is served before a background refresh
+VOICE_CATALOG_TTL = float(os.getenv('VOICE_CATALOG_TTL', '300'))
+
+
+class VoiceCatalog:
+    """Serves the last fetched listing immediately and refreshes it in the background
+
+    ``get`` never waits on the remote call: a stale or missing listing
+    starts a refresh thread and the current value (empty before the first
+    fetch completes) is returned straight away. A failed refresh keeps the
+    previous listing.
+    """
+
+    def __init__(self, fetch: Callable[[], List[Any]], ttl: float = VOICE_CATALOG_TTL, name: str = 'voices'):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.name = name
+        self._voices: Optional[List[Any]] = None
+        self._fetched_at = 0.0
+        self._stale = True
+        self._generation = 0
+        self._refresh_pid = None
+        self._last_error = None
+        self._lock = threading.Lock()
+
+    def _is_refreshing(self) -> bool:
+        # A refresh thread does not survive a fork, so only trust our own process's flag
+        return self._refresh_pid == os.getpid()
+
+    def get(self) -> List[Any]:
+        """Current listing, scheduling a refresh if it is stale"""
+        with self._lock:
+            voices = self._voices
+            expired = self._stale or time.monotonic() - self._fetched_at >= self.ttl
+        if expired:
+            self.refresh_async()
+        return list(voices) if voices is not None else []
+
+    def refresh_async(self) -> bool:
+        """Start a background refresh unless one is already running"""
+        with self._lock:
+            if self._is_refreshing():
+                return False
+            self._refresh_pid = os.getpid()
+        threading.Thread(target=self.refresh, name=f'{self.name}-catalog-refresh', daemon=True).start()
+        return True
+
+    def refresh(self) -> bool:
+        """Fetch the listing now; returns False and keeps the old listing on failure"""
+        with self._lock:
+            generation = self._generation
+        try:
+            voices = list(self.fetch())
+        except Exception as e:
+            with self._lock:
+                self._last_error = str(e)
+                # Retry after another TTL rather than on every page view
+                self._fetched_at = time.monotonic()
+                self._stale = self._generation != generation
+                self._refresh_pid = None
+            logger.warning(f"Refreshing {self.name} catalog failed: {e}")
+            return False
+
+        with self._lock:
+            self._voices = voices
+            self._fetched_at = time.monotonic()
+            # Invalidated while fetching: the result may predate the change
+            self._stale = self._generation != generation
+            self._refresh_pid = None
+            self._last_error = None
+            refetch = self._stale
+        logger.info(f"Refreshed {self.name} catalog: {len(voices)} voices")
+        if refetch:
+            self.refresh_async()
+        return True
+
+    def invalidate(self):
+        """Mark the listing stale, e.g. after a voice was created or deleted, and refresh it"""
+        with self._lock:
+            self._stale = True
+            self._generation += 1
+        self.refresh_async()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'voices': len(self._voices) if self._voices is not None else None,
+                'age_seconds': round(time.monotonic() - self._fetched_at, 1) if self._voices is not None else None,
+                'ttl_seconds': self.ttl,
+                'stale': self._stale,
+                'refreshing': self._is_refreshing(),
+                'last_error': self._last_error
+            }